@@ -5,11 +5,15 @@ from shard_lite.core.connection_pool import ConnectionPool
 from shard_lite.core.query_router import QueryRouter
 from shard_lite.core.metadata_manager import MetadataManager
 from shard_lite.core.transaction_manager import TransactionManager
+from shard_lite.core.executor import ShardExecutor
+from shard_lite.core.write_buffer import WriteBuffer
 
 __all__ = [
     'ShardManager',
     'ConnectionPool',
     'QueryRouter',
     'MetadataManager',
-    'TransactionManager'
+    'TransactionManager',
+    'ShardExecutor',
+    'WriteBuffer'
 ]
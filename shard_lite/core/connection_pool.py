@@ -1,19 +1,110 @@
 import sqlite3
 import threading
 import os
-from queue import Queue, Empty
+import pathlib
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
 from shard_lite.utils.config import Config
 from shard_lite.utils.logger import Logger
-from shard_lite.exceptions.shard_exceptions import ConnectionError, ConnectionTimeoutError
+from shard_lite.exceptions.shard_exceptions import ConnectionError, ConnectionTimeoutError, ConfigurationError
+
+# When pooled connections are checked with SELECT 1 before being handed out.
+VALIDATION_POLICIES = ("always", "idle", "never")
+
+# Named PRAGMA presets applied to every new shard connection, in order.
+PRAGMA_PROFILES = {
+    # Every commit is fsynced; WAL still lets readers run alongside the writer.
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+    },
+    # Commits are durable across process crashes; the WAL is fsynced at checkpoints.
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    # For initial loads that can be replayed: no fsyncs and a large page cache.
+    "bulk_load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "busy_timeout": 30000,
+        "cache_size": -262144,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+    },
+}
+
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+class _ShardPool:
+    """
+    Connections for a single shard.
+
+    Idle connections are kept in a deque as (connection, created_at, released_at)
+    tuples: checkouts take the most recently released connection from the right,
+    so the least recently used ones collect on the left where they are reaped.
+
+    Attributes:
+        max_size (int): Maximum number of open connections.
+        idle (deque): Idle connections with their creation and release times.
+        size (int): Open connections, idle or checked out, including reserved slots.
+        created (dict): Creation time of every open connection.
+        condition (threading.Condition): Guards the pool and signals released connections.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.idle = deque()
+        self.size = 0
+        self.created = {}
+        self.condition = threading.Condition()
+
 
 class ConnectionPool:
     """
     Thread-safe connection pool for managing SQLite database shard connections.
 
+    Shard pools grow on demand up to ``pool_size`` connections. Connections are
+    opened outside every lock, idle connections beyond ``min_pool_size`` are
+    closed after ``idle_timeout`` seconds, and connections older than
+    ``max_lifetime`` seconds are recycled instead of being handed out again.
+
+    Checkouts of an already-initialized shard never touch the global lock.
+    Connections are validated according to ``validation_policy``: ``"always"``
+    on every checkout, ``"idle"`` (default) only after sitting idle for
+    ``validation_idle_time`` seconds, or ``"never"``. Connections released
+    after a failure are always validated, and a background sweep every
+    ``sweep_interval`` seconds reaps and validates idle connections, so
+    shards that stop receiving traffic still release theirs. The sweep runs
+    every ``idle_timeout / 2`` seconds by default; set ``sweep_interval`` to
+    0 or None to disable it.
+
+    New connections run the PRAGMAs of the profile named by
+    ``shard_pragma_profiles[shard_id]`` or ``pragma_profile`` (see
+    ``PRAGMA_PROFILES``), followed by any explicit ``pragmas`` overrides.
+    Without either setting connections keep SQLite's defaults. Each
+    connection caches up to ``statement_cache_size`` prepared statements.
+
+    With ``read_write_split`` enabled each shard gets a single writer
+    connection, which writers queue for, and up to ``pool_size`` read-only
+    connections opened with a ``mode=ro`` URI and ``query_only``. Pair it with
+    a WAL profile so readers are not blocked by the writer.
+
     Attributes:
         config (Config): Configuration instance for pool settings.
         logger (Logger): Logger instance for connection events.
-        pool (dict): Dictionary of connection queues for each shard.
+        pool (dict): Dictionary of per-shard pools (the writer pools when split).
+        read_pool (dict): Dictionary of per-shard read-only pools when split.
     """
 
     def __init__(self, config, logger=None):
@@ -27,16 +118,37 @@ class ConnectionPool:
         self.config = config
         self.logger = logger or Logger()
         self.pool = {}
-        self.lock = threading.Lock()
+        self.read_pool = {}
+        self.lock = threading.RLock()
         self.connection_timeout = self.config.get("connection_timeout", 30)
         self.pool_size = self.config.get("pool_size", 5)
+        self.min_pool_size = min(self.config.get("min_pool_size", 0), self.pool_size)
+        self.idle_timeout = self.config.get("idle_timeout", 300)
+        self.max_lifetime = self.config.get("max_lifetime", 3600)
+        self.validation_policy = self.config.get("validation_policy", "idle")
+        if self.validation_policy not in VALIDATION_POLICIES:
+            raise ConfigurationError("Unknown validation policy", context={"validation_policy": self.validation_policy})
+        self.validation_idle_time = self.config.get("validation_idle_time", 30)
+        self.sweep_interval = self.config.get("sweep_interval", self.idle_timeout / 2 if self.idle_timeout else None)
+        self.read_write_split = self.config.get("read_write_split", False)
+        self._pragmas = {}
+        self._sweep_stop = threading.Event()
+        self._sweeper = None
+        if self.sweep_interval:
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="shard_lite_pool_sweeper", daemon=True)
+            self._sweeper.start()
 
-    def get_connection(self, shard_id):
+    def get_connection(self, shard_id, readonly=False):
         """
         Get a connection to a specific shard.
 
+        Reuses the most recently released idle connection, opens a new one
+        while the shard is below its pool size, and otherwise waits for a release.
+
         Args:
             shard_id (str): The shard ID.
+            readonly (bool): Whether the caller only reads; selects the
+                read-only pool when ``read_write_split`` is enabled.
 
         Returns:
             sqlite3.Connection: SQLite connection object.
@@ -44,69 +156,239 @@ class ConnectionPool:
         Raises:
             ConnectionTimeoutError: If no connection is available within the timeout.
         """
-        with self.lock:
-            if shard_id not in self.pool:
-                self._initialize_shard_pool(shard_id)
+        readonly = readonly and self.read_write_split
+        shard_pool = self._get_shard_pool(shard_id, readonly)
+        deadline = time.monotonic() + self.connection_timeout
+        expired = []
+        connection = None
+        released_at = None
+        with shard_pool.condition:
+            while True:
+                now = time.monotonic()
+                self._collect_idle(shard_pool, now, expired)
+                if shard_pool.idle:
+                    connection, created_at, released_at = shard_pool.idle.pop()
+                    if not self._is_expired(created_at, now):
+                        break
+                    self._forget(shard_pool, connection, expired)
+                    connection = None
+                    continue
+                if shard_pool.size < shard_pool.max_size:
+                    shard_pool.size += 1
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._close_connections(expired)
+                    raise ConnectionTimeoutError("No available connections for shard", context={"shard_id": shard_id})
+                shard_pool.condition.wait(remaining)
+        self._close_connections(expired)
 
-        try:
-            connection = self.pool[shard_id].get(timeout=self.connection_timeout)
-            if not self._validate_connection(connection):
-                self.logger.warning("Invalid connection detected, creating a new one", shard_id=shard_id)
-                connection = self.create_shard_connection(shard_id)
-            return connection
-        except Empty:
-            raise ConnectionTimeoutError("No available connections for shard", context={"shard_id": shard_id})
+        if connection is None:
+            return self._open_reserved(shard_pool, shard_id, readonly)
+        if self._needs_validation(released_at) and not self._validate_connection(connection):
+            self.logger.warning("Invalid connection detected, creating a new one", shard_id=shard_id)
+            with shard_pool.condition:
+                self._forget(shard_pool, connection, expired)
+                shard_pool.size += 1
+            self._close_connections(expired)
+            return self._open_reserved(shard_pool, shard_id, readonly)
+        return connection
 
-    def release_connection(self, connection, shard_id):
+    def release_connection(self, connection, shard_id, failed=False):
         """
         Return a connection to the pool.
 
+        Connections past ``max_lifetime``, whose shard pool has been closed, or
+        that fail validation after being released with ``failed=True`` are
+        closed instead of being returned.
+
         Args:
             connection (sqlite3.Connection): The connection to release.
             shard_id (str): The shard ID.
+            failed (bool): Whether the connection was in use when an error occurred.
         """
-        with self.lock:
-            if shard_id in self.pool:
-                self.pool[shard_id].put(connection)
+        shard_pool = self._owning_pool(connection, shard_id)
+        if shard_pool is None:
+            connection.close()
+            return
+        broken = failed and not self._recover_connection(connection)
+        if broken:
+            self.logger.warning("Discarding broken connection", shard_id=shard_id)
+        expired = []
+        with shard_pool.condition:
+            created_at = shard_pool.created.get(connection)
+            now = time.monotonic()
+            if broken or created_at is None or self._is_expired(created_at, now):
+                self._forget(shard_pool, connection, expired)
+            else:
+                shard_pool.idle.append((connection, created_at, now))
+            self._collect_idle(shard_pool, now, expired)
+            shard_pool.condition.notify()
+        self._close_connections(expired)
+
+    @contextmanager
+    def connection(self, shard_id, readonly=False):
+        """
+        Check out a connection for the duration of a ``with`` block.
+
+        The connection is released with ``failed=True`` if the block raises,
+        so a broken connection is validated and discarded rather than reused.
+
+        Args:
+            shard_id (str): The shard ID.
+            readonly (bool): Whether the block only reads.
+
+        Yields:
+            sqlite3.Connection: SQLite connection object.
+        """
+        connection = self.get_connection(shard_id, readonly)
+        try:
+            yield connection
+        except Exception:
+            self.release_connection(connection, shard_id, failed=True)
+            raise
+        self.release_connection(connection, shard_id)
 
-    def create_shard_connection(self, shard_id, db_path=None):
+    def create_shard_connection(self, shard_id, db_path=None, readonly=False):
         """
         Create a new connection to a shard.
 
         Args:
             shard_id (str): The shard ID.
             db_path (str, optional): Path to the shard database file.
+            readonly (bool): Open the database read-only with ``query_only`` set.
 
         Returns:
             sqlite3.Connection: SQLite connection object.
         """
         db_path = db_path or self.config.get("shard_base_path", "./shards") + f"/{shard_id}.db"
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        connection = sqlite3.connect(db_path, check_same_thread=False)
-        self.logger.info("Created new connection", shard_id=shard_id, db_path=db_path)
+        cached_statements = self.config.get("statement_cache_size", 256)
+        if not readonly:
+            connection = sqlite3.connect(db_path, check_same_thread=False, cached_statements=cached_statements)
+        else:
+            if not os.path.exists(db_path):
+                sqlite3.connect(db_path).close()
+            uri = f"{pathlib.Path(db_path).resolve().as_uri()}?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=cached_statements)
+        for name, value in self.get_shard_pragmas(shard_id).items():
+            # The journal mode is a property of the database file, set by writers.
+            if readonly and name == "journal_mode":
+                continue
+            connection.execute(f"PRAGMA {name}={value}")
+        if readonly:
+            connection.execute("PRAGMA query_only=ON")
+        self.logger.info("Created new connection", shard_id=shard_id, db_path=db_path, readonly=readonly)
         return connection
 
+    def get_shard_pragmas(self, shard_id):
+        """
+        Resolve the PRAGMAs applied to new connections for a shard.
+
+        Args:
+            shard_id (str): The shard ID.
+
+        Returns:
+            dict: Ordered mapping of PRAGMA names to values.
+
+        Raises:
+            ConfigurationError: If the profile is unknown or a PRAGMA is malformed.
+        """
+        pragmas = self._pragmas.get(shard_id)
+        if pragmas is not None:
+            return pragmas
+        profile = (self.config.get("shard_pragma_profiles") or {}).get(shard_id, self.config.get("pragma_profile"))
+        if profile is not None and profile not in PRAGMA_PROFILES:
+            raise ConfigurationError("Unknown PRAGMA profile", context={"profile": profile, "shard_id": shard_id})
+        pragmas = dict(PRAGMA_PROFILES.get(profile, {}))
+        pragmas.update(self.config.get("pragmas") or {})
+        for name, value in pragmas.items():
+            if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+                raise ConfigurationError("Invalid PRAGMA", context={"pragma": name, "value": value})
+        self._pragmas[shard_id] = pragmas
+        return pragmas
+
+    def validate_idle_connections(self):
+        """
+        Reap idle connections, then validate the remaining ones.
+
+        This is the background sweep; it can also be called directly.
+
+        Returns:
+            int: Number of connections closed.
+        """
+        closed = self.reap_idle_connections()
+        broken = []
+        for shard_pool in self._shard_pools():
+            with shard_pool.condition:
+                for entry in list(shard_pool.idle):
+                    if not self._validate_connection(entry[0]):
+                        shard_pool.idle.remove(entry)
+                        self._forget(shard_pool, entry[0], broken)
+                shard_pool.condition.notify_all()
+        self._close_connections(broken)
+        if broken:
+            self.logger.warning("Closed broken idle connections", closed=len(broken))
+        return closed + len(broken)
+
+    def reap_idle_connections(self):
+        """
+        Close idle and expired connections across every shard.
+
+        Idle connections are kept while a shard has no more than
+        ``min_pool_size`` open connections.
+
+        Returns:
+            int: Number of connections closed.
+        """
+        expired = []
+        now = time.monotonic()
+        for shard_pool in self._shard_pools():
+            with shard_pool.condition:
+                self._collect_idle(shard_pool, now, expired)
+                for entry in list(shard_pool.idle):
+                    if self._is_expired(entry[1], now):
+                        shard_pool.idle.remove(entry)
+                        self._forget(shard_pool, entry[0], expired)
+                shard_pool.condition.notify_all()
+        self._close_connections(expired)
+        if expired:
+            self.logger.info("Reaped idle connections", closed=len(expired))
+        return len(expired)
+
     def close_shard_connections(self, shard_id):
         """
         Close all connections to a specific shard.
 
+        Idle connections are closed immediately; checked-out connections are
+        closed when they are released.
+
         Args:
             shard_id (str): The shard ID.
         """
         with self.lock:
-            if shard_id in self.pool:
-                while not self.pool[shard_id].empty():
-                    connection = self.pool[shard_id].get()
-                    connection.close()
-                del self.pool[shard_id]
-                self.logger.info("Closed all connections for shard", shard_id=shard_id)
+            shard_pools = [self.pool.pop(shard_id, None), self.read_pool.pop(shard_id, None)]
+        shard_pools = [shard_pool for shard_pool in shard_pools if shard_pool is not None]
+        if not shard_pools:
+            return
+        connections = []
+        for shard_pool in shard_pools:
+            with shard_pool.condition:
+                connections.extend(entry[0] for entry in shard_pool.idle)
+                shard_pool.idle.clear()
+                shard_pool.condition.notify_all()
+        self._close_connections(connections)
+        self.logger.info("Closed all connections for shard", shard_id=shard_id)
 
     def close_all(self):
         """
-        Close all connections in the pool.
+        Close all connections in the pool and stop the background sweep.
         """
+        self._sweep_stop.set()
+        if self._sweeper is not None and self._sweeper is not threading.current_thread():
+            self._sweeper.join()
         with self.lock:
-            for shard_id in list(self.pool.keys()):
+            for shard_id in set(self.pool) | set(self.read_pool):
                 self.close_shard_connections(shard_id)
 
     def get_pool_status(self):
@@ -114,23 +396,191 @@ class ConnectionPool:
         Return statistics about pool usage.
 
         Returns:
-            dict: Dictionary with shard IDs and their connection counts.
+            dict: Dictionary with shard IDs and their idle connection counts.
         """
         with self.lock:
-            return {shard_id: self.pool[shard_id].qsize() for shard_id in self.pool}
+            status = {shard_id: len(shard_pool.idle) for shard_id, shard_pool in self.pool.items()}
+            for shard_id, shard_pool in self.read_pool.items():
+                status[shard_id] = status.get(shard_id, 0) + len(shard_pool.idle)
+            return status
 
-    def _initialize_shard_pool(self, shard_id):
+    def get_pool_stats(self):
         """
-        Initialize the connection pool for a shard.
+        Return detailed per-shard pool statistics.
+
+        Returns:
+            dict: Mapping of shard IDs to their open, idle and in-use
+            connection counts and the configured bounds. With
+            ``read_write_split`` the counts describe the writer and a nested
+            ``readers`` entry describes the read-only pool.
+        """
+        with self.lock:
+            pools = list(self.pool.items())
+            read_pools = list(self.read_pool.items())
+        stats = {shard_id: self._shard_pool_stats(shard_pool) for shard_id, shard_pool in pools}
+        for shard_id, shard_pool in read_pools:
+            shard_stats = stats.setdefault(shard_id, self._shard_pool_stats(_ShardPool(1)))
+            shard_stats["readers"] = self._shard_pool_stats(shard_pool)
+        return stats
+
+    def _get_shard_pool(self, shard_id, readonly=False):
+        """
+        Return the pool for a shard, registering an empty one on first use.
 
         Args:
             shard_id (str): The shard ID.
+            readonly (bool): Return the shard's read-only pool.
+
+        Returns:
+            _ShardPool: The shard's pool.
         """
-        self.pool[shard_id] = Queue(maxsize=self.pool_size)
-        for _ in range(self.pool_size):
-            connection = self.create_shard_connection(shard_id)
-            self.pool[shard_id].put(connection)
-        self.logger.info("Initialized connection pool for shard", shard_id=shard_id)
+        pools = self.read_pool if readonly else self.pool
+        shard_pool = pools.get(shard_id)
+        if shard_pool is None:
+            with self.lock:
+                shard_pool = pools.get(shard_id)
+                if shard_pool is None:
+                    max_size = 1 if self.read_write_split and not readonly else self.pool_size
+                    shard_pool = pools[shard_id] = _ShardPool(max_size)
+                    self.logger.info("Initialized connection pool for shard", shard_id=shard_id, readonly=readonly)
+        return shard_pool
+
+    def _owning_pool(self, connection, shard_id):
+        """
+        Find the pool a checked-out connection belongs to.
+
+        Args:
+            connection (sqlite3.Connection): The connection.
+            shard_id (str): The shard ID.
+
+        Returns:
+            _ShardPool or None: The owning pool, or None if the shard is closed.
+        """
+        read_pool = self.read_pool.get(shard_id)
+        if read_pool is not None and connection in read_pool.created:
+            return read_pool
+        return self.pool.get(shard_id)
+
+    def _shard_pools(self):
+        """Return every writer and reader pool."""
+        with self.lock:
+            return list(self.pool.values()) + list(self.read_pool.values())
+
+    def _shard_pool_stats(self, shard_pool):
+        """Return the open, idle and in-use counts of one pool."""
+        with shard_pool.condition:
+            idle = len(shard_pool.idle)
+            return {
+                "open": shard_pool.size,
+                "idle": idle,
+                "in_use": shard_pool.size - idle,
+                "min_size": self.min_pool_size,
+                "max_size": shard_pool.max_size,
+            }
+
+    def _open_reserved(self, shard_pool, shard_id, readonly=False):
+        """
+        Open a connection for a slot already reserved in the shard's size.
+
+        Args:
+            shard_pool (_ShardPool): The shard's pool.
+            shard_id (str): The shard ID.
+            readonly (bool): Open a read-only connection.
+
+        Returns:
+            sqlite3.Connection: The new connection.
+        """
+        try:
+            connection = self.create_shard_connection(shard_id, readonly=readonly)
+        except Exception:
+            with shard_pool.condition:
+                shard_pool.size -= 1
+                shard_pool.condition.notify()
+            raise
+        with shard_pool.condition:
+            shard_pool.created[connection] = time.monotonic()
+        return connection
+
+    def _collect_idle(self, shard_pool, now, expired):
+        """
+        Move connections idle for longer than ``idle_timeout`` into ``expired``.
+
+        Must be called with the shard's condition held.
+
+        Args:
+            shard_pool (_ShardPool): The shard's pool.
+            now (float): Current monotonic time.
+            expired (list): Receives the connections to close.
+        """
+        if self.idle_timeout is None:
+            return
+        idle = shard_pool.idle
+        while idle and shard_pool.size > self.min_pool_size and now - idle[0][2] >= self.idle_timeout:
+            self._forget(shard_pool, idle.popleft()[0], expired)
+
+    def _forget(self, shard_pool, connection, expired):
+        """
+        Drop a connection from the shard's bookkeeping and queue it for closing.
+
+        Must be called with the shard's condition held.
+        """
+        if shard_pool.created.pop(connection, None) is not None:
+            shard_pool.size -= 1
+        expired.append(connection)
+
+    def _needs_validation(self, released_at):
+        """
+        Decide whether a connection taken from the idle list must be validated.
+
+        Args:
+            released_at (float or None): When the connection was released, or
+                None for a freshly opened connection.
+
+        Returns:
+            bool: True if the connection should be checked with SELECT 1.
+        """
+        if released_at is None or self.validation_policy == "never":
+            return False
+        if self.validation_policy == "always":
+            return True
+        return time.monotonic() - released_at >= self.validation_idle_time
+
+    def _sweep_loop(self):
+        """Run the background sweep every ``sweep_interval`` seconds until closed."""
+        while not self._sweep_stop.wait(self.sweep_interval):
+            try:
+                self.validate_idle_connections()
+            except Exception as e:
+                self.logger.error("Connection sweep failed", error=str(e))
+
+    def _is_expired(self, created_at, now):
+        """Return True if a connection has outlived ``max_lifetime``."""
+        return self.max_lifetime is not None and now - created_at >= self.max_lifetime
+
+    def _close_connections(self, connections):
+        """Close connections outside of any pool lock."""
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+
+    def _recover_connection(self, connection):
+        """
+        Roll back any open transaction on a failed connection and validate it.
+
+        Args:
+            connection (sqlite3.Connection): The connection that saw an error.
+
+        Returns:
+            bool: True if the connection can be reused.
+        """
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            return False
+        return self._validate_connection(connection)
 
     def _validate_connection(self, connection):
         """
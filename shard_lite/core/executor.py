@@ -0,0 +1,129 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from shard_lite.utils.logger import Logger
+
+class ShardExecutor:
+    """
+    Long-lived thread pool shared by the query router and handlers.
+
+    Wraps a ThreadPoolExecutor so scatter-gather calls reuse warm worker
+    threads, and keeps counters that expose queue depth and active workers.
+
+    Attributes:
+        max_workers (int): Upper bound on worker threads.
+        logger (Logger): Logger instance for executor events.
+    """
+
+    def __init__(self, max_workers: int, logger: Optional[Logger] = None, thread_name_prefix: str = "shard_lite"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers (int): Maximum number of worker threads.
+            logger (Logger, optional): Logger instance for logging events.
+            thread_name_prefix (str): Prefix for worker thread names.
+        """
+        self.max_workers = max_workers
+        self.logger = logger or Logger()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix, initializer=self._start_worker
+        )
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._closed = False
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedule a callable on the shared pool.
+
+        Args:
+            fn (Callable): Callable to run.
+            *args: Positional arguments for fn.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            Future: Future resolving to fn's result.
+        """
+        with self._lock:
+            self._queued += 1
+        try:
+            return self._executor.submit(self._run, fn, args, kwargs)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    def run_all(self, operations: Iterable[Callable[[], Any]]) -> List[Any]:
+        """
+        Run zero-argument callables in parallel and wait for all of them.
+
+        When called from one of this executor's own workers the operations run
+        inline, so nested fan-out can never deadlock a saturated pool.
+
+        Args:
+            operations (Iterable[Callable[[], Any]]): Callables to run.
+
+        Returns:
+            List[Any]: Results in the order of operations.
+
+        Raises:
+            Exception: The first exception raised by an operation.
+        """
+        operations = list(operations)
+        if getattr(self._local, "is_worker", False) or len(operations) <= 1:
+            return [operation() for operation in operations]
+        futures = [self.submit(operation) for operation in operations]
+        return [future.result() for future in futures]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return counters useful for sizing the pool.
+
+        Returns:
+            Dict[str, int]: Maximum and live worker threads, active workers,
+            queue depth and completed task count.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "threads": self._threads,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "completed": self._completed,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting work and release the worker threads.
+
+        Args:
+            wait (bool): Whether to wait for running tasks to finish.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self.logger.info("Shard executor shut down", completed=self._completed)
+
+    def _start_worker(self) -> None:
+        """Worker thread initializer: count the thread and mark it as a worker."""
+        with self._lock:
+            self._threads += 1
+        self._local.is_worker = True
+
+    def _run(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        """Run a task while keeping the queue/active counters current."""
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
@@ -1,72 +1,174 @@
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
 from shard_lite.utils.logger import Logger
+from shard_lite.exceptions.shard_exceptions import ConfigurationError
+
+# Schema version stored in the catalog's user_version pragma.
+SCHEMA_VERSION = 1
+
+# DDL applied to bring a catalog from version n - 1 to version n.
+MIGRATIONS = {
+    1: [
+        "CREATE TABLE shards (shard_id TEXT PRIMARY KEY, location TEXT NOT NULL, registered_at REAL NOT NULL)",
+        "CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        "CREATE TABLE shard_stats ("
+        "shard_id TEXT PRIMARY KEY, row_count INTEGER, file_size INTEGER, page_count INTEGER, "
+        "page_size INTEGER, freelist_count INTEGER, refreshed_at REAL NOT NULL)",
+        "CREATE TABLE strategy_state (strategy TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)",
+    ],
+}
+
+STATS_COLUMNS = ("row_count", "file_size", "page_count", "page_size", "freelist_count", "refreshed_at")
 
 class MetadataManager:
     """
-    Placeholder implementation of MetadataManager.
+    Shard catalog persisted in a small SQLite database.
+
+    The catalog records shard locations, arbitrary metadata, strategy state
+    (hash ring tokens, ranges) and per-shard stats. Everything is loaded
+    into memory at startup and every write goes to both the cache and the
+    database, so lookups never touch disk. The schema version is kept in
+    ``PRAGMA user_version`` and older catalogs are migrated on open.
 
-    Responsibilities in the future full implementation:
-    - Manage metadata about shards (e.g., locations, ranges, hash mappings).
-    - Provide shard discovery and registration mechanisms.
-    - Store and retrieve arbitrary metadata for the sharding system.
+    Stats (row count, file size, page counts) are collected by
+    ``refresh_stats``, which also runs every ``stats_refresh_interval``
+    seconds (300 by default) on a background thread; set it to 0 or None
+    to refresh only on demand.
+
+    Attributes:
+        path (str): Path to the catalog database.
+        stats_table (str): Table whose rows are counted for stats.
+        stats_refresh_interval (float): Seconds between background stats refreshes, or None when disabled.
     """
 
     def __init__(self, config, logger=None):
         """
-        Initialize the MetadataManager.
+        Initialize the MetadataManager and load the catalog.
+
+        The catalog is stored at ``metadata_path``, by default
+        ``metadata.db`` under ``shard_base_path``.
 
         Args:
             config (Config): Configuration instance.
             logger (Logger, optional): Logger instance for logging operations.
+
+        Raises:
+            ConfigurationError: If the catalog was written by a newer schema version.
         """
         self.config = config
         self.logger = logger or Logger()
+        self.path = config.get("metadata_path") or os.path.join(config.get("shard_base_path", "./shards"), "metadata.db")
+        self.stats_table = config.get("stats_table", "records")
+        self.stats_refresh_interval = config.get("stats_refresh_interval", 300)
+        self.lock = threading.RLock()
         self.shards = {}
         self.metadata = {}
+        self.stats = {}
+        self.strategy_state = {}
+
+        directory_name = os.path.dirname(self.path)
+        if directory_name:
+            os.makedirs(directory_name, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self._load()
+
+        self._refresh_stop = threading.Event()
+        self._refresher = None
+        if self.stats_refresh_interval:
+            self._refresher = threading.Thread(target=self._refresh_loop, name="shard_lite_stats_refresher", daemon=True)
+            self._refresher.start()
 
     def register_shard(self, shard_id, location):
         """
-        Register basic shard information.
+        Register a shard, or update its location if already registered.
 
         Args:
             shard_id (str): Unique identifier for the shard.
             location (str): Location of the shard (e.g., file path).
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: register_shard")
-        self.shards[shard_id] = {"location": location}
+        with self.lock:
+            registered_at = self.shards.get(shard_id, {}).get("registered_at", time.time())
+            self._write(
+                "INSERT INTO shards (shard_id, location, registered_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(shard_id) DO UPDATE SET location = excluded.location",
+                [(shard_id, location, registered_at)]
+            )
+            self.shards[shard_id] = {"location": location, "registered_at": registered_at}
+        self.logger.info("Registered shard", shard_id=shard_id, location=location)
+
+    def unregister_shard(self, shard_id):
+        """
+        Remove a shard and its stats from the catalog.
+
+        Args:
+            shard_id (str): Unique identifier for the shard.
+
+        Returns:
+            bool: Whether the shard was registered.
+        """
+        with self.lock:
+            if shard_id not in self.shards:
+                return False
+            with self.connection:
+                self.connection.execute("DELETE FROM shards WHERE shard_id = ?", (shard_id,))
+                self.connection.execute("DELETE FROM shard_stats WHERE shard_id = ?", (shard_id,))
+            del self.shards[shard_id]
+            self.stats.pop(shard_id, None)
+        self.logger.info("Unregistered shard", shard_id=shard_id)
+        return True
 
     def get_shard_info(self, shard_id):
         """
-        Return basic info about a shard.
+        Return cached information about a shard.
 
         Args:
             shard_id (str): Unique identifier for the shard.
 
         Returns:
-            dict: Basic shard information.
+            dict: Location, registration time and latest stats (under
+            ``stats``, None before the first refresh), or None if the shard
+            is not registered.
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: get_shard_info")
-        return self.shards.get(shard_id, None)
+        with self.lock:
+            info = self.shards.get(shard_id)
+            if info is None:
+                return None
+            stats = self.stats.get(shard_id)
+            return {**info, "stats": dict(stats) if stats else None}
 
     def list_shards(self):
         """
         Return a list of all registered shards.
 
         Returns:
-            list: List of shard IDs.
+            list: List of shard IDs in registration order.
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: list_shards")
-        return list(self.shards.keys())
+        with self.lock:
+            return list(self.shards)
 
     def store_metadata(self, key, value):
         """
-        Store arbitrary metadata.
+        Store arbitrary JSON-serializable metadata.
 
         Args:
             key (str): Metadata key.
             value (any): Metadata value.
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: store_metadata")
-        self.metadata[key] = value
+        encoded = json.dumps(value)
+        with self.lock:
+            self._write(
+                "INSERT INTO metadata (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                [(key, encoded)]
+            )
+            self.metadata[key] = json.loads(encoded)
 
     def get_metadata(self, key):
         """
@@ -76,7 +178,187 @@ class MetadataManager:
             key (str): Metadata key.
 
         Returns:
-            any: Metadata value.
+            any: Metadata value, or None if unset.
+        """
+        with self.lock:
+            return self.metadata.get(key, None)
+
+    def save_strategy_state(self, strategy, state):
+        """
+        Persist a sharding strategy's routing state.
+
+        Args:
+            strategy (str): Strategy type, e.g. "hash" or "range".
+            state (dict): JSON-serializable state from the strategy's get_state.
+        """
+        encoded = json.dumps(state)
+        with self.lock:
+            self._write(
+                "INSERT INTO strategy_state (strategy, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(strategy) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                [(strategy, encoded, time.time())]
+            )
+            self.strategy_state[strategy] = json.loads(encoded)
+
+    def get_strategy_state(self, strategy):
+        """
+        Return a strategy's persisted routing state.
+
+        Args:
+            strategy (str): Strategy type.
+
+        Returns:
+            dict: The saved state, or None if none was saved.
+        """
+        with self.lock:
+            return self.strategy_state.get(strategy)
+
+    def get_stats(self, shard_id=None):
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: get_metadata")
-        return self.metadata.get(key, None)
+        Return cached shard stats from the last refresh.
+
+        Args:
+            shard_id (str, optional): Shard to return stats for; all shards when omitted.
+
+        Returns:
+            dict: The shard's stats (None if never refreshed), or a mapping of shard IDs to stats.
+        """
+        with self.lock:
+            if shard_id is not None:
+                stats = self.stats.get(shard_id)
+                return dict(stats) if stats else None
+            return {shard_id: dict(stats) for shard_id, stats in self.stats.items()}
+
+    def refresh_stats(self, shard_ids=None):
+        """
+        Collect row counts, file size and page counts for registered shards.
+
+        Shard files are opened read-only and outside the catalog lock;
+        shards whose file does not exist yet are skipped.
+
+        Args:
+            shard_ids (list, optional): Shards to refresh; all registered shards when omitted.
+
+        Returns:
+            dict: Mapping of refreshed shard IDs to their new stats.
+        """
+        with self.lock:
+            targets = {
+                shard_id: info["location"] for shard_id, info in self.shards.items()
+                if shard_ids is None or shard_id in shard_ids
+            }
+        refreshed = {}
+        for shard_id, location in targets.items():
+            try:
+                stats = self._collect_stats(location)
+            except sqlite3.Error as e:
+                self.logger.warning("Stats refresh failed", shard_id=shard_id, error=str(e))
+                continue
+            if stats is not None:
+                refreshed[shard_id] = stats
+        with self.lock:
+            self._write(
+                f"INSERT OR REPLACE INTO shard_stats (shard_id, {', '.join(STATS_COLUMNS)}) "
+                f"VALUES (?, {', '.join(['?'] * len(STATS_COLUMNS))})",
+                [(shard_id, *(stats[column] for column in STATS_COLUMNS)) for shard_id, stats in refreshed.items()]
+            )
+            self.stats.update(refreshed)
+        self.logger.info("Refreshed shard stats", shards=len(refreshed))
+        return refreshed
+
+    def close(self):
+        """Stop the stats refresher and close the catalog database."""
+        self._refresh_stop.set()
+        if self._refresher is not None and self._refresher is not threading.current_thread():
+            self._refresher.join()
+        with self.lock:
+            self.connection.close()
+
+    def _migrate(self):
+        """
+        Create or upgrade the catalog schema to SCHEMA_VERSION.
+
+        Raises:
+            ConfigurationError: If the catalog's schema is newer than this library.
+        """
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ConfigurationError("Metadata catalog schema is newer than supported", context={
+                "path": self.path, "version": version, "supported": SCHEMA_VERSION
+            })
+        if version == SCHEMA_VERSION:
+            return
+        with self.connection:
+            self.connection.execute("BEGIN")
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                for statement in MIGRATIONS[target]:
+                    self.connection.execute(statement)
+                self.connection.execute(f"PRAGMA user_version = {target}")
+        self.logger.info("Migrated metadata catalog", path=self.path, version=SCHEMA_VERSION)
+
+    def _load(self):
+        """Fill the in-memory cache from the catalog database."""
+        with self.lock:
+            for shard_id, location, registered_at in self.connection.execute(
+                "SELECT shard_id, location, registered_at FROM shards ORDER BY registered_at, shard_id"
+            ):
+                self.shards[shard_id] = {"location": location, "registered_at": registered_at}
+            for key, value in self.connection.execute("SELECT key, value FROM metadata"):
+                self.metadata[key] = json.loads(value)
+            for row in self.connection.execute(f"SELECT shard_id, {', '.join(STATS_COLUMNS)} FROM shard_stats"):
+                self.stats[row[0]] = dict(zip(STATS_COLUMNS, row[1:]))
+            for strategy, state in self.connection.execute("SELECT strategy, state FROM strategy_state"):
+                self.strategy_state[strategy] = json.loads(state)
+
+    def _write(self, query, rows):
+        """
+        Run a write statement for each row in one catalog transaction.
+
+        Args:
+            query (str): SQL statement.
+            rows (list): Parameter tuples.
+        """
+        with self.connection:
+            self.connection.executemany(query, rows)
+
+    def _collect_stats(self, location):
+        """
+        Read stats from a shard database file.
+
+        Args:
+            location (str): Path to the shard database.
+
+        Returns:
+            dict: Stats keyed by STATS_COLUMNS, or None if the file does not exist.
+        """
+        if not os.path.exists(location):
+            return None
+        connection = sqlite3.connect(f"{pathlib.Path(location).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+            freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            has_table = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.stats_table,)
+            ).fetchone()
+            row_count = (
+                connection.execute(f"SELECT COUNT(*) FROM {self.stats_table}").fetchone()[0] if has_table else None
+            )
+        finally:
+            connection.close()
+        return {
+            "row_count": row_count,
+            "file_size": os.path.getsize(location),
+            "page_count": page_count,
+            "page_size": page_size,
+            "freelist_count": freelist_count,
+            "refreshed_at": time.time(),
+        }
+
+    def _refresh_loop(self):
+        """Refresh stats every ``stats_refresh_interval`` seconds until closed."""
+        while not self._refresh_stop.wait(self.stats_refresh_interval):
+            try:
+                self.refresh_stats()
+            except Exception as e:
+                self.logger.error("Background stats refresh failed", error=str(e))
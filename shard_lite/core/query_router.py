@@ -1,16 +1,49 @@
 from shard_lite.core.connection_pool import ConnectionPool
+from shard_lite.core.executor import ShardExecutor
 from shard_lite.strategies.base_strategy import BaseStrategy
 from shard_lite.utils.logger import Logger
-from shard_lite.exceptions.shard_exceptions import ShardingError
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Any, Optional
+from shard_lite.utils.sql import criteria_shape, where_template
+from shard_lite.exceptions.shard_exceptions import ShardingError, QueryError
+from typing import List, Dict, Any, Optional, Iterator, Callable, Sequence, Union
+from itertools import islice
+import heapq
+
+SortKey = Union[int, str, Sequence[Union[int, str]], Callable[[Any], Any]]
+
+# Partial aggregates pushed to each shard, and how the router folds them together.
+AGGREGATE_FUNCTIONS = {
+    "count": (["COUNT({column})"], lambda values: sum(v or 0 for v in values)),
+    "sum": (["SUM({column})"], lambda values: _fold(sum, values)),
+    "min": (["MIN({column})"], lambda values: _fold(min, values)),
+    "max": (["MAX({column})"], lambda values: _fold(max, values)),
+    "avg": (["SUM({column})", "COUNT({column})"], lambda sums, counts: _average(sums, counts)),
+}
+
+
+def _fold(function, values):
+    """Apply function to the non-NULL partials, or return None if there are none."""
+    values = [value for value in values if value is not None]
+    return function(values) if values else None
+
+
+def _average(sums, counts):
+    """Combine per-shard SUM/COUNT partials into a global average."""
+    count = sum(c or 0 for c in counts)
+    return sum(s or 0 for s in sums) / count if count else None
+
 
 class QueryRouter:
     """
     Routes queries to appropriate shards based on the sharding strategy.
     """
 
-    def __init__(self, connection_pool: ConnectionPool, strategy: BaseStrategy, logger: Optional[Logger] = None):
+    def __init__(
+        self,
+        connection_pool: ConnectionPool,
+        strategy: BaseStrategy,
+        logger: Optional[Logger] = None,
+        executor: Optional[ShardExecutor] = None
+    ):
         """
         Initialize the QueryRouter.
 
@@ -18,10 +51,20 @@ class QueryRouter:
             connection_pool (ConnectionPool): Connection pool for managing connections.
             strategy (BaseStrategy): Sharding strategy for determining target shards.
             logger (Logger, optional): Logger instance for logging operations.
+            executor (ShardExecutor, optional): Shared executor for scatter-gather work.
+                A private one sized to the pool is created if omitted and
+                shut down by close().
         """
         self.connection_pool = connection_pool
         self.strategy = strategy
         self.logger = logger or Logger()
+        self._owns_executor = executor is None
+        self.executor = executor or ShardExecutor(connection_pool.pool_size, self.logger)
+
+    def close(self) -> None:
+        """Shut down the router's private executor; a shared one is left to its owner."""
+        if self._owns_executor:
+            self.executor.shutdown()
 
     def execute_query(self, query: str, params: List[Any], shard_ids: Optional[List[str]] = None) -> List[Any]:
         """
@@ -35,22 +78,234 @@ class QueryRouter:
         Returns:
             List[Any]: Aggregated results from all shards.
         """
-        shard_ids = shard_ids or self.strategy.get_all_shards()
         results = []
-
-        with ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(self._execute_on_shard, query, params, shard_id): shard_id for shard_id in shard_ids
-            }
-            for future in futures:
-                try:
-                    results.extend(future.result())
-                except Exception as e:
-                    self.logger.error("Query execution failed on shard", shard_id=futures[future], error=str(e))
-                    raise ShardingError("Query execution failed", context={"shard_id": futures[future], "error": str(e)})
+        for rows in self._gather(query, params, shard_ids):
+            results.extend(rows)
 
         return self._aggregate_results(results)
 
+    def execute_aggregate(
+        self,
+        aggregates: Dict[str, tuple],
+        criteria: Optional[Dict[str, Any]] = None,
+        group_by: Optional[List[str]] = None,
+        table: str = "records",
+        shard_ids: Optional[List[str]] = None
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Compute aggregates across shards by pushing partial aggregates down.
+
+        Each shard returns one row per group (COUNT, SUM, MIN, MAX, and SUM plus
+        COUNT for AVG) over the same scatter path as execute_query, and the
+        router merges the partials per group.
+
+        Args:
+            aggregates (Dict[str, tuple]): Output name mapped to (function, column),
+                e.g. ``{"orders": ("count", "*"), "avg_total": ("avg", "total")}``.
+            criteria (Dict[str, Any], optional): Equality or IN-list filters applied on every shard.
+            group_by (List[str], optional): Columns to group by.
+            table (str): Table to aggregate.
+            shard_ids (List[str], optional): Shards to query; derived from criteria if omitted.
+
+        Returns:
+            Union[Dict[str, Any], List[Dict[str, Any]]]: A single dict of results
+            without group_by, otherwise one dict per group (group columns included).
+
+        Raises:
+            QueryError: If an aggregate function is not supported.
+        """
+        criteria = criteria or {}
+        group_by = list(group_by or [])
+        query, params, plan = self._build_aggregate_query(aggregates, criteria, group_by, table)
+        if shard_ids is None:
+            shard_ids = self._determine_target_shards(criteria) if criteria else self.strategy.get_all_shards()
+
+        partials = {}
+        for rows in self._gather(query, params, shard_ids):
+            for row in rows:
+                partials.setdefault(tuple(row[:len(group_by)]), []).append(row)
+
+        results = []
+        for group_key, rows in self._sorted_groups(partials):
+            result = dict(zip(group_by, group_key))
+            for name, combine, indexes in plan:
+                result[name] = combine(*[[row[index] for row in rows] for index in indexes])
+            results.append(result)
+
+        if group_by:
+            return results
+        if results:
+            return results[0]
+        return {name: combine(*[[] for _ in indexes]) for name, combine, indexes in plan}
+
+    def _build_aggregate_query(self, aggregates: Dict[str, tuple], criteria: Dict[str, Any], group_by: List[str], table: str):
+        """
+        Build the per-shard partial aggregate query.
+
+        Args:
+            aggregates (Dict[str, tuple]): Output name mapped to (function, column).
+            criteria (Dict[str, Any]): Equality or IN-list filters.
+            group_by (List[str]): Grouping columns.
+            table (str): Table to aggregate.
+
+        Returns:
+            tuple: Query string, parameters, and a merge plan of
+            (name, combine function, partial column indexes).
+
+        Raises:
+            QueryError: If an aggregate function is not supported.
+        """
+        select_list = list(group_by)
+        plan = []
+        for name, (function, column) in aggregates.items():
+            spec = AGGREGATE_FUNCTIONS.get(function.lower())
+            if spec is None:
+                raise QueryError("Unsupported aggregate function", context={"function": function})
+            expressions, combine = spec
+            indexes = []
+            for expression in expressions:
+                indexes.append(len(select_list))
+                select_list.append(expression.format(column=column))
+            plan.append((name, combine, indexes))
+
+        query = f"SELECT {', '.join(select_list)} FROM {table}"
+        shape, params = criteria_shape(criteria)
+        if shape:
+            query += f" WHERE {where_template(shape)}"
+        if group_by:
+            query += f" GROUP BY {', '.join(group_by)}"
+        return query, params, plan
+
+    @staticmethod
+    def _sorted_groups(partials: Dict[tuple, List[Any]]) -> List[tuple]:
+        """Order merged groups by key (NULLs first), falling back to arrival order."""
+        try:
+            return sorted(partials.items(), key=lambda item: [(value is not None, value) for value in item[0]])
+        except TypeError:
+            return list(partials.items())
+
+    def _gather(self, query: str, params: List[Any], shard_ids: Optional[List[str]] = None) -> List[List[Any]]:
+        """
+        Run a query on every target shard in parallel.
+
+        Args:
+            query (str): SQL query to execute.
+            params (List[Any]): Query parameters.
+            shard_ids (List[str], optional): Shards to query. Defaults to all shards.
+
+        Returns:
+            List[List[Any]]: Each shard's rows, in shard order.
+        """
+        shard_ids = shard_ids or self.strategy.get_all_shards()
+        operations = [self._guarded(self._execute_on_shard, query, params, shard_id) for shard_id in shard_ids]
+        return self.executor.run_all(operations)
+
+    def _guarded(self, operation, query: str, params: List[Any], shard_id: str):
+        """
+        Wrap a per-shard operation so failures are logged and tagged with the shard.
+
+        Args:
+            operation (callable): Callable taking (query, params, shard_id).
+            query (str): SQL query to execute.
+            params (List[Any]): Query parameters.
+            shard_id (str): Shard ID.
+
+        Returns:
+            callable: Zero-argument callable suitable for the executor.
+        """
+        def run():
+            try:
+                return operation(query, params, shard_id)
+            except Exception as e:
+                self.logger.error("Query execution failed on shard", shard_id=shard_id, error=str(e))
+                raise ShardingError("Query execution failed", context={"shard_id": shard_id, "error": str(e)})
+        return run
+
+    def execute_merged(
+        self,
+        query: str,
+        params: List[Any],
+        shard_ids: Optional[List[str]] = None,
+        sort_key: SortKey = 0,
+        reverse: bool = False,
+        dedup: bool = False,
+        batch_size: Optional[int] = None
+    ) -> Iterator[Any]:
+        """
+        Execute a query on specific shards and stream the rows in merged order.
+
+        Every shard must already return its rows ordered by sort_key (for
+        example through the query's ORDER BY); the per-shard cursors are then
+        k-way merged with a heap, reading ``batch_size`` rows at a time from
+        each. Memory stays bounded by shards x batch_size. Connections are held
+        until the iterator is exhausted or closed.
+
+        Args:
+            query (str): SQL query to execute.
+            params (List[Any]): Query parameters.
+            shard_ids (List[str], optional): List of shard IDs to execute the query on.
+            sort_key (SortKey): Column index, column name, a sequence of those, or
+                a callable extracting the key from a row.
+            reverse (bool): Merge descending (shards must return descending rows).
+            dedup (bool): Drop duplicate rows; duplicates are only looked for
+                among rows sharing the same sort key.
+            batch_size (int, optional): Rows fetched per shard round trip
+                (``fetch_size`` config, default 500).
+
+        Returns:
+            Iterator[Any]: Merged rows.
+        """
+        shard_ids = shard_ids or self.strategy.get_all_shards()
+        batch_size = batch_size or self.connection_pool.config.get("fetch_size", 500)
+        return self._merge_shard_rows(query, params, shard_ids, sort_key, reverse, dedup, batch_size)
+
+    def execute_top_n(
+        self,
+        query: str,
+        params: List[Any],
+        order_by: Union[str, List[str]],
+        limit: int,
+        descending: bool = False,
+        shard_ids: Optional[List[str]] = None
+    ) -> List[Any]:
+        """
+        Execute an ORDER BY ... LIMIT query across shards, fetching only the top n.
+
+        ``ORDER BY order_by LIMIT n`` is appended to the query and pushed to
+        every shard, the sorted shard cursors are merged with a heap of one
+        entry per shard, and reading stops (releasing the connections) as soon
+        as n rows have been produced. The order_by columns must be part of the
+        selected columns.
+
+        Args:
+            query (str): SQL query without ORDER BY/LIMIT.
+            params (List[Any]): Query parameters.
+            order_by (Union[str, List[str]]): Column name or names to sort by.
+            limit (int): Number of rows to return.
+            descending (bool): Sort descending.
+            shard_ids (List[str], optional): List of shard IDs to execute the query on.
+
+        Returns:
+            List[Any]: The global top-n rows in order.
+
+        Raises:
+            QueryError: If limit is not a positive integer.
+        """
+        if not isinstance(limit, int) or limit <= 0:
+            raise QueryError("Top-N limit must be a positive integer", context={"limit": limit})
+        columns = [order_by] if isinstance(order_by, str) else list(order_by)
+        direction = " DESC" if descending else ""
+        shard_query = f"{query} ORDER BY {', '.join(column + direction for column in columns)} LIMIT ?"
+        batch_size = min(limit, self.connection_pool.config.get("fetch_size", 500))
+
+        rows = self.execute_merged(
+            shard_query, list(params) + [limit], shard_ids, sort_key=columns, reverse=descending, batch_size=batch_size
+        )
+        try:
+            return list(islice(rows, limit))
+        finally:
+            rows.close()
+
     def execute_read(self, query: str, params: List[Any], criteria: Dict[str, Any]) -> List[Any]:
         """
         Execute a read operation based on criteria.
@@ -78,6 +333,51 @@ class QueryRouter:
         shard_id = self.strategy.get_shard_for_key(data["id"])
         self._execute_on_shard(query, params, shard_id)
 
+    def get_shard_for_key(self, key: Any) -> str:
+        """
+        Determine which shard owns a key.
+
+        Args:
+            key (Any): The key to locate.
+
+        Returns:
+            str: The shard ID containing the key.
+        """
+        return self.strategy.get_shard_for_key(key)
+
+    def get_shards_for_keys(self, keys: List[Any]) -> Dict[str, List[int]]:
+        """
+        Route many keys at once, grouping them by owning shard.
+
+        Args:
+            keys (List[Any]): Keys to locate.
+
+        Returns:
+            Dict[str, List[int]]: Mapping of shard IDs to positions in keys.
+        """
+        return self.strategy.get_shards_for_keys(keys)
+
+    def get_shards_for_query(self, criteria: Dict[str, Any]) -> List[str]:
+        """
+        Find all shards needed for a query.
+
+        Args:
+            criteria (Dict[str, Any]): Query criteria.
+
+        Returns:
+            List[str]: List of target shard IDs.
+        """
+        return self._determine_target_shards(criteria)
+
+    def get_all_shards(self) -> List[str]:
+        """
+        Return all shards known to the strategy.
+
+        Returns:
+            List[str]: List of shard IDs.
+        """
+        return self.strategy.get_all_shards()
+
     def _determine_target_shards(self, criteria: Dict[str, Any]) -> List[str]:
         """
         Identify target shards using the sharding strategy.
@@ -120,6 +420,119 @@ class QueryRouter:
         
         return results
 
+    def _merge_shard_rows(
+        self,
+        query: str,
+        params: List[Any],
+        shard_ids: List[str],
+        sort_key: SortKey,
+        reverse: bool,
+        dedup: bool,
+        batch_size: int
+    ) -> Iterator[Any]:
+        """
+        Open one cursor per shard and lazily k-way merge their rows.
+
+        Args:
+            query (str): SQL query to execute.
+            params (List[Any]): Query parameters.
+            shard_ids (List[str]): Shards to read from.
+            sort_key (SortKey): Merge key specification.
+            reverse (bool): Merge descending.
+            dedup (bool): Drop duplicate rows within runs of equal keys.
+            batch_size (int): Rows fetched per shard round trip.
+
+        Returns:
+            Iterator[Any]: Merged rows.
+        """
+        connections = []
+        cursors = []
+        failed = False
+        try:
+            for shard_id in shard_ids:
+                connection = self.connection_pool.get_connection(shard_id, readonly=True)
+                connections.append((shard_id, connection))
+                try:
+                    cursors.append(connection.execute(query, params))
+                except Exception as e:
+                    self.logger.error("Query execution failed on shard", shard_id=shard_id, error=str(e))
+                    raise ShardingError("Query execution failed", context={"shard_id": shard_id, "error": str(e)})
+            if not cursors:
+                return
+
+            key = self._resolve_sort_key(sort_key, cursors[0].description)
+            streams = [self._fetch_rows(cursor, batch_size) for cursor in cursors]
+            merged = heapq.merge(*streams, key=key, reverse=reverse)
+            if not dedup:
+                yield from merged
+                return
+
+            current_key = None
+            seen = set()
+            for row in merged:
+                row_key = key(row)
+                if not seen or row_key != current_key:
+                    current_key = row_key
+                    seen.clear()
+                marker = tuple(row)
+                if marker not in seen:
+                    seen.add(marker)
+                    yield row
+        except Exception:
+            failed = True
+            raise
+        finally:
+            for cursor in cursors:
+                cursor.close()
+            for shard_id, connection in connections:
+                self.connection_pool.release_connection(connection, shard_id, failed=failed)
+
+    def _resolve_sort_key(self, sort_key: SortKey, description: Optional[tuple]) -> Callable[[Any], Any]:
+        """
+        Turn a sort key specification into a row key function.
+
+        Args:
+            sort_key (SortKey): Column index, column name, a sequence of those, or a callable.
+            description (tuple, optional): Cursor description used to resolve column names.
+
+        Returns:
+            Callable[[Any], Any]: Function extracting the NULL-safe merge key from a row.
+
+        Raises:
+            ShardingError: If a named column is not part of the result.
+        """
+        if callable(sort_key):
+            return sort_key
+        columns = list(sort_key) if isinstance(sort_key, (list, tuple)) else [sort_key]
+        names = [column[0] for column in description or ()]
+        indexes = []
+        for column in columns:
+            if isinstance(column, str):
+                if column not in names:
+                    raise ShardingError("Unknown sort column", context={"column": column, "columns": names})
+                column = names.index(column)
+            indexes.append(column)
+        # NULLs sort first, as in SQLite, and never get compared with other values.
+        return lambda row: [(row[index] is not None, row[index]) for index in indexes]
+
+    @staticmethod
+    def _fetch_rows(cursor, batch_size: int) -> Iterator[Any]:
+        """
+        Stream a cursor's rows in fetchmany batches.
+
+        Args:
+            cursor (sqlite3.Cursor): Executed cursor.
+            batch_size (int): Rows per fetch.
+
+        Returns:
+            Iterator[Any]: Rows from the cursor.
+        """
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
     def _execute_on_shard(self, query: str, params: List[Any], shard_id: str) -> List[Any]:
         """
         Execute a query on a specific shard.
@@ -132,13 +545,11 @@ class QueryRouter:
         Returns:
             List[Any]: Query results.
         """
-        connection = self.connection_pool.get_connection(shard_id)
-        try:
+        readonly = query.lstrip().upper().startswith("SELECT")
+        with self.connection_pool.connection(shard_id, readonly=readonly) as connection:
             self.logger.info("Executing query on shard", shard_id=shard_id, query=query)
             cursor = connection.execute(query, params)
             return cursor.fetchall()
-        finally:
-            self.connection_pool.release_connection(connection, shard_id)
 
     def _optimize_query(self, query: str, shard_id: str) -> str:
         """
@@ -1,16 +1,19 @@
-from typing import Any, Dict, List, Optional, Type, Union
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Type, Union
 from shard_lite.utils.config import Config
 from shard_lite.utils.logger import Logger
 from shard_lite.core.connection_pool import ConnectionPool
 from shard_lite.core.query_router import QueryRouter
 from shard_lite.core.metadata_manager import MetadataManager
 from shard_lite.core.transaction_manager import TransactionManager
+from shard_lite.core.executor import ShardExecutor
+from shard_lite.core.write_buffer import WriteBuffer
 from shard_lite.strategies.hash_strategy import HashStrategy
 from shard_lite.strategies.range_strategy import RangeStrategy
 from shard_lite.strategies.directory_strategy import DirectoryStrategy
 from shard_lite.handlers.default_handler import DefaultHandler
 from shard_lite.handlers.batch_handler import BatchHandler
-from shard_lite.exceptions.shard_exceptions import ShardingError
+from shard_lite.exceptions.shard_exceptions import ShardingError, TransactionError, QueryError
 
 class ShardManager:
     """
@@ -42,26 +45,36 @@ class ShardManager:
 
         # Initialize components
         self.connection_pool = ConnectionPool(self.config, self.logger)
+        self.strategy_type = strategy_type
         self.strategy = self._create_strategy(strategy_type)
-        self.query_router = QueryRouter(self.connection_pool, self.strategy, self.logger)
+        self.executor = ShardExecutor(self._executor_size(), self.logger)
+        self.query_router = QueryRouter(self.connection_pool, self.strategy, self.logger, self.executor)
         self.metadata_manager = MetadataManager(self.config, self.logger)
+        self._restore_catalog()
         self.transaction_manager = TransactionManager(self.connection_pool, self.logger)
+        self.transaction_manager.recover()
+        self.write_buffer = None
         
         # Initialize handlers
         self._handlers = {}
         self._default_handler = self.get_handler('default')
 
     def create_shard(self, shard_id: Optional[str] = None) -> str:
-        """Create a new shard."""
+        """Create a new shard and record it and the new routing state in the catalog."""
         shard_id = shard_id or f"shard_{len(self.list_shards()) + 1}"
         self.strategy.create_shard(shard_id)
         self.metadata_manager.register_shard(shard_id, self.strategy.get_shard_file_path(shard_id))
+        self._save_strategy_state()
         return shard_id
 
     def get_shard(self, shard_id: str) -> Dict[str, Any]:
-        """Get information about a specific shard."""
+        """Get cached catalog information and stats about a specific shard."""
         return self.metadata_manager.get_shard_info(shard_id)
 
+    def refresh_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Refresh row counts, file sizes and page counts in the metadata catalog."""
+        return self.metadata_manager.refresh_stats()
+
     def list_shards(self) -> List[str]:
         """List all available shards."""
         return self.metadata_manager.list_shards()
@@ -71,33 +84,174 @@ class ShardManager:
         handler = self.get_handler(kwargs.get('handler_type', 'default'))
         handler.insert(data)
 
+    def insert_buffered(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Union[Future, List[Future]]:
+        """
+        Queue inserts in the write-behind buffer for group commit.
+
+        The buffer is created on first use and sized by ``write_buffer_size``
+        and ``write_buffer_delay`` (seconds).
+
+        Returns:
+            Future or List[Future]: One future per record, resolved once its batch commits.
+        """
+        records = [data] if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ShardingError("Data must be a dictionary or a list of dictionaries", context={"data": data})
+        statements = [self._default_handler.plan_insert(record) for record in records]
+        buffer = self._get_write_buffer()
+        futures = [buffer.submit(shard_id, query, params) for shard_id, query, params in statements]
+        return futures[0] if isinstance(data, dict) else futures
+
+    def flush_writes(self) -> None:
+        """Commit everything queued in the write-behind buffer."""
+        if self.write_buffer is not None:
+            self.write_buffer.flush()
+
     def select(self, criteria: Dict[str, Any], **kwargs) -> List[Dict[str, Any]]:
-        """Query data using the appropriate handler."""
+        """
+        Query data using the appropriate handler.
+
+        Passing ``order_by`` and ``limit`` (optionally ``descending``) runs a
+        top-N query that pushes ORDER BY/LIMIT down to every shard.
+
+        Raises:
+            QueryError: If ``limit`` is passed without ``order_by``.
+        """
+        if kwargs.get('limit') is not None:
+            if not kwargs.get('order_by'):
+                raise QueryError("A limited select needs order_by", context={"limit": kwargs['limit']})
+            return self._default_handler.select_top_n(
+                criteria, kwargs['order_by'], kwargs['limit'], kwargs.get('descending', False)
+            )
         handler = self.get_handler(kwargs.get('handler_type', 'default'))
         return handler.select(criteria)
 
-    def update(self, criteria: Dict[str, Any], data: Dict[str, Any], **kwargs) -> None:
-        """Update data using the appropriate handler."""
+    def iter_select(self, criteria: Optional[Dict[str, Any]] = None, chunk_size: int = 500, chunks: bool = False) -> Iterator[Any]:
+        """Stream matching rows (or row chunks) shard by shard with flat memory."""
+        return self._default_handler.iter_select(criteria or {}, chunk_size=chunk_size, chunks=chunks)
+
+    def aggregate(
+        self,
+        aggregates: Dict[str, tuple],
+        criteria: Optional[Dict[str, Any]] = None,
+        group_by: Optional[List[str]] = None,
+        table: str = "records"
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Compute COUNT/SUM/MIN/MAX/AVG across shards with partial aggregates pushed down."""
+        return self.query_router.execute_aggregate(aggregates, criteria, group_by, table)
+
+    def update(self, criteria: Dict[str, Any], data: Dict[str, Any], **kwargs) -> Optional[int]:
+        """
+        Update data using the appropriate handler.
+
+        Passing ``expected_version`` makes the update conditional on the
+        row's version column and raises VersionConflictError when it changed.
+        """
+        if kwargs.get('expected_version') is not None:
+            return self._default_handler.update(criteria, data, kwargs['expected_version'])
         handler = self.get_handler(kwargs.get('handler_type', 'default'))
-        handler.update(criteria, data)
+        return handler.update(criteria, data)
+
+    def delete(self, criteria: Dict[str, Any], **kwargs) -> Optional[int]:
+        """
+        Delete data using the appropriate handler.
 
-    def delete(self, criteria: Dict[str, Any], **kwargs) -> None:
-        """Delete data using the appropriate handler."""
+        Passing ``expected_version`` makes the delete conditional on the
+        row's version column and raises VersionConflictError when it changed.
+        """
+        if kwargs.get('expected_version') is not None:
+            return self._default_handler.delete(criteria, kwargs['expected_version'])
         handler = self.get_handler(kwargs.get('handler_type', 'default'))
-        handler.delete(criteria)
+        return handler.delete(criteria)
+
+    def execute_transaction(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute insert/update/delete operations atomically across shards.
 
-    def execute_transaction(self, operations: List[Dict[str, Any]]) -> None:
-        """Execute operations as a transaction."""
-        transaction_id = self.transaction_manager.begin_transaction()
+        Every operation is planned into per-shard statements first and the
+        touched shards are enlisted in a fixed order. Statements run grouped
+        per shard on the pinned connections, with consecutive same-shape
+        statements coalesced into executemany, so each shard commits once.
+        One shard commits directly; several shards commit with two-phase commit.
+
+        An operation ``{"type": "savepoint", "operations": [...]}`` runs its
+        nested operations under a savepoint: if one fails, only the nested
+        group is rolled back and the transaction continues.
+
+        Returns:
+            List[Dict[str, Any]]: Rolled-back savepoint groups, as their
+            ``operation`` index and ``error`` message.
+        """
         try:
-            for operation in operations:
-                self.transaction_manager.add_operation(transaction_id, operation)
-                getattr(self, operation['type'])(**operation['params'])
-            self.transaction_manager.commit_transaction(transaction_id)
+            plan = [self._plan_entry(operation) for operation in operations]
+            with self.transaction_manager.transaction() as transaction_id:
+                self.transaction_manager.enlist_shards(transaction_id, sorted(self._plan_shards(plan)))
+                return self._run_plan(transaction_id, plan)
         except Exception as e:
-            self.transaction_manager.rollback_transaction(transaction_id)
             raise ShardingError("Transaction failed", context={"error": str(e)})
 
+    def _plan_entry(self, operation: Dict[str, Any]) -> tuple:
+        """Plan one operation as ("statements", [...]) or a nested ("savepoint", [...]) entry."""
+        if operation.get('type') == 'savepoint':
+            return ('savepoint', [self._plan_entry(nested) for nested in operation.get('operations', [])])
+        return ('statements', self._plan_operation(operation))
+
+    def _plan_shards(self, plan: List[tuple]) -> set:
+        """Collect the shards a plan touches."""
+        shard_ids = set()
+        for kind, entries in plan:
+            if kind == 'savepoint':
+                shard_ids |= self._plan_shards(entries)
+            else:
+                shard_ids.update(shard_id for shard_id, _, _ in entries)
+        return shard_ids
+
+    def _run_plan(self, transaction_id: str, plan: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Execute a plan inside a transaction.
+
+        Consecutive statement entries are batched together; savepoint entries
+        act as barriers and run their nested plan under a savepoint.
+        """
+        failures = []
+        pending = []
+        for index, (kind, entries) in enumerate(plan):
+            if kind == 'statements':
+                pending.extend(entries)
+                continue
+            self.transaction_manager.execute_batch(transaction_id, pending)
+            pending = []
+            try:
+                with self.transaction_manager.savepoint(transaction_id, sorted(self._plan_shards(entries))):
+                    failures.extend(self._run_plan(transaction_id, entries))
+            except TransactionError as e:
+                self.logger.warning("Rolled back savepoint", operation=index, error=str(e))
+                failures.append({"operation": index, "error": str(e)})
+        self.transaction_manager.execute_batch(transaction_id, pending)
+        return failures
+
+    def _plan_operation(self, operation: Dict[str, Any]) -> List[tuple]:
+        """
+        Turn a transaction operation into (shard_id, query, params) statements.
+
+        Args:
+            operation (Dict[str, Any]): ``type`` (insert, update or delete) and ``params``.
+
+        Returns:
+            List[tuple]: Statements in execution order.
+        """
+        handler = self._default_handler
+        operation_type = operation.get('type')
+        params = operation.get('params', {})
+        if operation_type == 'insert':
+            records = params['data'] if isinstance(params['data'], list) else [params['data']]
+            return [handler.plan_insert(record) for record in records]
+        if operation_type == 'update':
+            return handler.plan_update(params['criteria'], params['data'])
+        if operation_type == 'delete':
+            return handler.plan_delete(params['criteria'])
+        raise ShardingError(f"Unsupported transaction operation: {operation_type}")
+
     def get_handler(self, handler_type: str = 'default'):
         """Get a specific CRUD handler."""
         if handler_type not in self._handlers:
@@ -111,11 +265,73 @@ class ShardManager:
             )
         return self._handlers[handler_type]
 
+    def get_executor_stats(self) -> Dict[str, int]:
+        """Return worker, active and queue-depth counters of the shared executor."""
+        return self.executor.get_stats()
+
     def close(self) -> None:
         """Clean up resources."""
+        if self.write_buffer is not None:
+            self.write_buffer.close()
+        self.query_router.close()
+        self.executor.shutdown()
+        self.transaction_manager.close()
+        self.metadata_manager.close()
         self.connection_pool.close_all()
         self.logger.info("ShardManager closed")
 
+    def _get_write_buffer(self) -> WriteBuffer:
+        """Create the write-behind buffer on first use."""
+        if self.write_buffer is None:
+            self.write_buffer = WriteBuffer(
+                self.connection_pool,
+                self.logger,
+                self.executor,
+                max_batch=self.config.get("write_buffer_size", 100),
+                max_delay=self.config.get("write_buffer_delay", 0.005)
+            )
+        return self.write_buffer
+
+    def _executor_size(self) -> int:
+        """
+        Size the shared executor from config.
+
+        Uses ``executor_workers`` when set, otherwise one worker per pooled
+        connection across the known shards.
+        """
+        workers = self.config.get("executor_workers")
+        if workers:
+            return workers
+        shard_count = len(self.config.get("active_shards", [])) or len(self.strategy.get_all_shards())
+        return max(shard_count, 1) * self.connection_pool.pool_size
+
+    def _restore_catalog(self) -> None:
+        """
+        Sync the strategy and the metadata catalog at startup.
+
+        Persisted routing state is loaded into the strategy. Shards the
+        strategy drops while reconciling it with the configuration are
+        unregistered, and shards the strategy knows about but the catalog
+        does not are registered.
+        """
+        state = self.metadata_manager.get_strategy_state(self.strategy_type)
+        if state is not None:
+            dropped = self.strategy.load_state(state)
+            if dropped:
+                for shard_id in dropped:
+                    self.metadata_manager.unregister_shard(shard_id)
+                self._save_strategy_state()
+        registered = set(self.metadata_manager.list_shards())
+        for shard_id in self.strategy.get_all_shards():
+            if shard_id not in registered:
+                self.metadata_manager.register_shard(shard_id, self.strategy.get_shard_file_path(shard_id))
+
+    def _save_strategy_state(self) -> None:
+        """Persist the strategy's routing state when it has any."""
+        state = self.strategy.get_state()
+        if state is not None:
+            self.metadata_manager.save_strategy_state(self.strategy_type, state)
+
     def _create_strategy(self, strategy_type: str):
         """Create a sharding strategy instance."""
         strategy_class = self.STRATEGY_TYPES.get(strategy_type)
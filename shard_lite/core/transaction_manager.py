@@ -1,19 +1,285 @@
+import base64
+import datetime
+import decimal
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from itertools import groupby
 from shard_lite.utils.logger import Logger
+from shard_lite.exceptions.shard_exceptions import (
+    ConnectionError,
+    TransactionError,
+    TransactionAbortedError,
+    CrossShardTransactionError
+)
+
+# Table written inside every prepared shard transaction of a multi-shard commit.
+MARKER_TABLE = "_shard_lite_txn"
+
+# Key marking a tagged redo parameter that JSON cannot represent directly.
+PARAM_TAG = "$type"
+
+
+def encode_param(value):
+    """
+    Encode a statement parameter for the JSON coordinator log without loss.
+
+    BLOBs, datetimes and decimals become tagged objects; JSON-native values
+    are returned unchanged.
+
+    Args:
+        value: Parameter bound to a redo statement.
+
+    Returns:
+        JSON-serializable form of the parameter.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {PARAM_TAG: "bytes", "value": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, datetime.datetime):
+        return {PARAM_TAG: "datetime", "value": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {PARAM_TAG: "date", "value": value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {PARAM_TAG: "decimal", "value": str(value)}
+    return value
+
+
+def decode_param(value):
+    """
+    Reverse encode_param.
+
+    Args:
+        value: Parameter as read from the coordinator log.
+
+    Returns:
+        The original parameter value.
+    """
+    if not isinstance(value, dict):
+        return value
+    kind, encoded = value[PARAM_TAG], value["value"]
+    if kind == "bytes":
+        return base64.b64decode(encoded)
+    if kind == "datetime":
+        return datetime.datetime.fromisoformat(encoded)
+    if kind == "date":
+        return datetime.date.fromisoformat(encoded)
+    return decimal.Decimal(encoded)
+
+
+class CoordinatorLog:
+    """
+    Compact append-only JSON-lines log of multi-shard commit decisions.
+
+    Records are ``prepare`` (participants and their redo statements),
+    ``commit``, ``abort`` and ``end``. Appending with ``sync=True`` waits until
+    the record is fsynced; concurrent callers share fsyncs, so one fsync makes
+    a whole group of decisions durable.
+
+    Records of finished transactions are dropped at checkpoints: every
+    ``checkpoint_interval`` appends the log is atomically rewritten with only
+    the records of unfinished transactions, so its size, and recovery time,
+    follow the in-flight tail rather than the total history.
+
+    Attributes:
+        path (str): Path to the log file.
+        checkpoint_interval (int): Appends between checkpoints.
+    """
+
+    def __init__(self, path, checkpoint_interval=1000):
+        """
+        Open the log, loading the records of unfinished transactions.
+
+        A torn final record, left by a crash mid-append, is dropped; any
+        other unreadable record means the log is corrupt.
+
+        Args:
+            path (str): Path to the log file.
+            checkpoint_interval (int): Appends between checkpoints.
+
+        Raises:
+            TransactionError: If a record before the final line cannot be parsed.
+        """
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        directory_name = os.path.dirname(path)
+        if directory_name:
+            os.makedirs(directory_name, exist_ok=True)
+        self.lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._open = {}
+        self._appended = 0
+        self._written = 0
+        self._synced = 0
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                lines = file.readlines()
+            for number, line in enumerate(lines, 1):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Record is not newline-terminated")
+                    record = json.loads(line)
+                except ValueError as e:
+                    if number < len(lines):
+                        raise TransactionError("Coordinator log is corrupt", context={
+                            "path": path, "line": number, "error": str(e)
+                        })
+                    # A torn final record was never acknowledged.
+                    break
+                self._track(record)
+        self._checkpoint()
+
+    def append(self, record, sync=False):
+        """
+        Append a record.
+
+        Args:
+            record (dict): JSON-serializable record with ``type`` and ``txn`` keys.
+            sync (bool): Return only once the record is fsynced.
+        """
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.lock:
+            self._file.write(line)
+            self._file.flush()
+            self._written += 1
+            sequence = self._written
+            self._track(record)
+            self._appended += 1
+            due = self._appended >= self.checkpoint_interval
+        if due:
+            self.checkpoint()
+        if sync:
+            self._sync_to(sequence)
+
+    def unfinished(self):
+        """
+        Return the records of transactions without an ``end`` record.
+
+        Returns:
+            dict: Transaction IDs mapped to their records, in log order.
+        """
+        with self.lock:
+            return {transaction_id: list(records) for transaction_id, records in self._open.items()}
+
+    def checkpoint(self):
+        """Rewrite the log with only the records of unfinished transactions."""
+        with self._sync_lock, self.lock:
+            self._checkpoint()
+
+    def close(self):
+        """Fsync and close the log."""
+        with self._sync_lock, self.lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def _track(self, record):
+        """Update the in-memory set of unfinished transactions with a record."""
+        if record["type"] == "end":
+            self._open.pop(record["txn"], None)
+        else:
+            self._open.setdefault(record["txn"], []).append(record)
+
+    def _sync_to(self, sequence):
+        """
+        Fsync the log until it covers a record.
+
+        The first waiter fsyncs everything written so far; waiters whose
+        record that fsync covered return without another one. The fsync runs
+        outside the append lock, so appends continue meanwhile; holding
+        ``_sync_lock`` keeps a checkpoint from swapping the file under it.
+        """
+        with self._sync_lock:
+            if self._synced >= sequence:
+                return
+            with self.lock:
+                written = self._written
+                descriptor = self._file.fileno()
+            os.fsync(descriptor)
+            self._synced = written
+
+    def _checkpoint(self):
+        """
+        Atomically replace the log with the unfinished records.
+
+        Call with ``_sync_lock`` and then the lock held, the order every
+        caller takes them in.
+        """
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            for records in self._open.values():
+                for record in records:
+                    file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a")
+        self._appended = 0
+        self._synced = self._written
+
+
+class _Transaction:
+    """
+    State of one open transaction.
+
+    Attributes:
+        transaction_id (str): Transaction ID.
+        connections (dict): Pinned connection per enlisted shard, in enlistment order.
+        statements (dict): Executed (query, params) pairs per shard, used as redo records.
+        state (str): "active", "committed" or "rolled_back".
+        savepoints (int): Savepoints opened so far, used to name the next one.
+    """
+
+    def __init__(self, transaction_id):
+        self.transaction_id = transaction_id
+        self.connections = {}
+        self.statements = {}
+        self.state = "active"
+        self.savepoints = 0
+
 
 class TransactionManager:
     """
-    Placeholder implementation of TransactionManager.
+    Transaction engine for single- and multi-shard transactions.
+
+    Each shard a transaction touches is enlisted once: one connection is
+    pinned for the life of the transaction and ``BEGIN IMMEDIATE`` takes the
+    shard's write lock up front. A transaction on a single shard commits
+    directly. A transaction on several shards uses two-phase commit:
+
+    1. Prepare: every shard records a marker row for the transaction in
+       ``_shard_lite_txn`` inside its still-open transaction, and the
+       participants with their redo statements are logged.
+    2. Decide: a ``commit`` record is appended and fsynced; this is the
+       commit point.
+    3. Commit every shard, then log ``end``.
 
-    Responsibilities in the future full implementation:
-    - Manage cross-shard transactions with ACID compliance.
-    - Coordinate commit/rollback across multiple shards.
-    - Track operations within a transaction.
+    A failure before the commit point rolls every shard back. A failure
+    after it leaves the transaction in doubt with a durable decision, and
+    raises CrossShardTransactionError; ``recover()`` later re-commits it on
+    the shards that are missing their marker.
+
+    Attributes:
+        connection_pool (ConnectionPool): Pool providing shard connections.
+        logger (Logger): Logger instance for logging operations.
+        transactions (dict): Open transactions by ID.
+        log (CoordinatorLog): Coordinator log for multi-shard commits.
     """
 
     def __init__(self, connection_pool, logger=None):
         """
         Initialize the TransactionManager.
 
+        The coordinator log is written to ``coordinator_log_path``, by default
+        ``coordinator.log`` under ``shard_base_path``, and checkpointed every
+        ``coordinator_checkpoint_interval`` records.
+
         Args:
             connection_pool (ConnectionPool): Connection pool for managing shard connections.
             logger (Logger, optional): Logger instance for logging operations.
@@ -21,40 +287,169 @@ class TransactionManager:
         self.connection_pool = connection_pool
         self.logger = logger or Logger()
         self.transactions = {}
+        self.lock = threading.Lock()
+        self._ended_markers = {}
+        config = connection_pool.config
+        log_path = config.get("coordinator_log_path") or os.path.join(
+            config.get("shard_base_path", "./shards"), "coordinator.log"
+        )
+        self.log = CoordinatorLog(log_path, config.get("coordinator_checkpoint_interval", 1000))
 
     def begin_transaction(self):
         """
-        Start a basic transaction.
+        Start a transaction.
 
         Returns:
             str: Transaction ID.
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: begin_transaction")
-        transaction_id = f"txn_{len(self.transactions) + 1}"
-        self.transactions[transaction_id] = []
+        transaction_id = f"txn_{uuid.uuid4().hex}"
+        with self.lock:
+            self.transactions[transaction_id] = _Transaction(transaction_id)
         return transaction_id
 
-    def commit_transaction(self, transaction_id):
+    def enlist_shards(self, transaction_id, shard_ids):
         """
-        Commit a transaction.
+        Pin a connection to each shard and open its write transaction.
+
+        Enlisting every shard up front in a consistent order keeps two
+        transactions from each holding a shard the other is waiting for.
 
         Args:
             transaction_id (str): Transaction ID.
+            shard_ids (iterable): Shards to enlist; already enlisted ones are skipped.
+
+        Raises:
+            TransactionError: If the transaction is not active or a shard cannot be locked.
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: commit_transaction")
-        if transaction_id in self.transactions:
-            del self.transactions[transaction_id]
+        transaction = self._get_active(transaction_id)
+        for shard_id in shard_ids:
+            if shard_id in transaction.connections:
+                continue
+            connection = self.connection_pool.get_connection(shard_id)
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+                connection.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error as e:
+                self.connection_pool.release_connection(connection, shard_id, failed=True)
+                raise TransactionError("Could not begin shard transaction", context={
+                    "transaction_id": transaction_id, "shard_id": shard_id, "error": str(e)
+                })
+            transaction.connections[shard_id] = connection
+            transaction.statements[shard_id] = []
 
-    def rollback_transaction(self, transaction_id):
+    def execute(self, transaction_id, shard_id, query, params=()):
+        """
+        Execute a statement on a shard inside the transaction.
+
+        Args:
+            transaction_id (str): Transaction ID.
+            shard_id (str): Target shard ID; enlisted on first use.
+            query (str): SQL statement.
+            params (sequence): Statement parameters.
+
+        Returns:
+            sqlite3.Cursor: Cursor of the executed statement.
+
+        Raises:
+            TransactionError: If the statement fails; the transaction stays open for rollback.
         """
-        Rollback a transaction.
+        transaction = self._get_active(transaction_id)
+        self.enlist_shards(transaction_id, [shard_id])
+        try:
+            cursor = transaction.connections[shard_id].execute(query, params)
+        except sqlite3.Error as e:
+            raise TransactionError("Statement failed in transaction", context={
+                "transaction_id": transaction_id, "shard_id": shard_id, "query": query, "error": str(e)
+            })
+        transaction.statements[shard_id].append((query, list(params)))
+        return cursor
+
+    def execute_many(self, transaction_id, shard_id, query, params_list):
+        """
+        Execute one statement for many parameter sets on a shard inside the transaction.
+
+        Args:
+            transaction_id (str): Transaction ID.
+            shard_id (str): Target shard ID; enlisted on first use.
+            query (str): SQL statement.
+            params_list (list): Parameter sequences.
+
+        Raises:
+            TransactionError: If the statement fails; the transaction stays open for rollback.
+        """
+        transaction = self._get_active(transaction_id)
+        self.enlist_shards(transaction_id, [shard_id])
+        params_list = [list(params) for params in params_list]
+        try:
+            transaction.connections[shard_id].executemany(query, params_list)
+        except sqlite3.Error as e:
+            raise TransactionError("Statement failed in transaction", context={
+                "transaction_id": transaction_id, "shard_id": shard_id, "query": query, "error": str(e)
+            })
+        transaction.statements[shard_id].extend((query, params) for params in params_list)
+
+    def execute_batch(self, transaction_id, statements):
+        """
+        Execute (shard_id, query, params) statements grouped per shard.
+
+        Statements keep their relative order within each shard, and runs of
+        consecutive statements with the same SQL text on a shard are sent
+        with one executemany.
+
+        Args:
+            transaction_id (str): Transaction ID.
+            statements (list): (shard_id, query, params) statements.
+
+        Raises:
+            TransactionError: If a statement fails; the transaction stays open for rollback.
+        """
+        by_shard = {}
+        for shard_id, query, params in statements:
+            by_shard.setdefault(shard_id, []).append((query, params))
+        for shard_id, shard_statements in by_shard.items():
+            for query, group in groupby(shard_statements, key=lambda statement: statement[0]):
+                params_list = [params for _, params in group]
+                if len(params_list) == 1:
+                    self.execute(transaction_id, shard_id, query, params_list[0])
+                else:
+                    self.execute_many(transaction_id, shard_id, query, params_list)
+
+    @contextmanager
+    def savepoint(self, transaction_id, shard_ids=None):
+        """
+        Run a ``with`` block under a savepoint for partial rollback.
+
+        If the block raises, the listed shards are rolled back to the
+        savepoint, their redo statements are trimmed to match, and the error
+        propagates; the outer transaction stays open. Savepoints may nest.
 
         Args:
             transaction_id (str): Transaction ID.
+            shard_ids (iterable, optional): Shards the savepoint covers;
+                defaults to every enlisted shard. They are enlisted if needed.
+
+        Yields:
+            str: Savepoint name.
+
+        Raises:
+            TransactionError: If the savepoint cannot be opened or rolled back.
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: rollback_transaction")
-        if transaction_id in self.transactions:
-            del self.transactions[transaction_id]
+        transaction = self._get_active(transaction_id)
+        shard_ids = list(transaction.connections if shard_ids is None else shard_ids)
+        self.enlist_shards(transaction_id, shard_ids)
+        transaction.savepoints += 1
+        name = f"sp_{transaction.savepoints}"
+        marks = {shard_id: len(transaction.statements[shard_id]) for shard_id in shard_ids}
+        self._run_on_shards(transaction, shard_ids, f"SAVEPOINT {name}")
+        try:
+            yield name
+        except BaseException:
+            self._run_on_shards(transaction, shard_ids, f"ROLLBACK TO {name}", f"RELEASE {name}")
+            for shard_id, mark in marks.items():
+                del transaction.statements[shard_id][mark:]
+            raise
+        self._run_on_shards(transaction, shard_ids, f"RELEASE {name}")
 
     def add_operation(self, transaction_id, operation):
         """
@@ -62,8 +457,262 @@ class TransactionManager:
 
         Args:
             transaction_id (str): Transaction ID.
-            operation (dict): Operation details.
+            operation (dict): ``shard_id``, ``query`` and optional ``params``.
+
+        Returns:
+            sqlite3.Cursor: Cursor of the executed statement.
+        """
+        return self.execute(transaction_id, operation["shard_id"], operation["query"], operation.get("params", ()))
+
+    def commit_transaction(self, transaction_id):
+        """
+        Commit a transaction, using two-phase commit when several shards are enlisted.
+
+        Args:
+            transaction_id (str): Transaction ID.
+
+        Raises:
+            TransactionAbortedError: If the transaction failed before its commit point and was rolled back.
+            CrossShardTransactionError: If a shard failed to commit after the commit decision was logged.
+        """
+        transaction = self._get_active(transaction_id)
+        try:
+            if len(transaction.connections) <= 1:
+                self._commit_single(transaction)
+            else:
+                self._commit_two_phase(transaction)
+        finally:
+            self._finish(transaction)
+
+    def rollback_transaction(self, transaction_id):
+        """
+        Roll back every enlisted shard and release the pinned connections.
+
+        Args:
+            transaction_id (str): Transaction ID.
+        """
+        with self.lock:
+            transaction = self.transactions.get(transaction_id)
+        if transaction is None:
+            return
+        self._rollback_all(transaction)
+        self._finish(transaction)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a ``with`` block inside a transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+
+        Yields:
+            str: Transaction ID.
+        """
+        transaction_id = self.begin_transaction()
+        try:
+            yield transaction_id
+        except BaseException:
+            self.rollback_transaction(transaction_id)
+            raise
+        self.commit_transaction(transaction_id)
+
+    def recover(self):
+        """
+        Resolve in-doubt multi-shard transactions left in the coordinator log.
+
+        A transaction whose commit decision was logged is re-committed on
+        every participant that has no marker row for it, by replaying its
+        redo statements together with the marker in one shard transaction.
+        A transaction that never reached its commit decision is aborted; its
+        shard transactions were never committed. Only the unfinished tail of
+        the log is read, and the log is checkpointed afterwards.
+
+        A transaction that cannot be re-committed on some participant is
+        logged and left in the log for the next attempt; recovery carries on
+        with the remaining transactions.
+
+        Returns:
+            dict: Numbers of ``recommitted`` and ``aborted`` transactions, and
+            the IDs of ``unresolved`` ones.
+        """
+        with self.lock:
+            active = set(self.transactions)
+        summary = {"recommitted": 0, "aborted": 0, "unresolved": []}
+        for transaction_id, records in self.log.unfinished().items():
+            if transaction_id in active:
+                continue
+            prepare = next((record for record in records if record["type"] == "prepare"), None)
+            committed = any(record["type"] == "commit" for record in records)
+            if committed and prepare is not None:
+                try:
+                    for shard_id, statements in prepare["shards"].items():
+                        self._redo_shard(transaction_id, shard_id, statements)
+                except (TransactionError, ConnectionError) as e:
+                    self.logger.error("Could not recover transaction", transaction_id=transaction_id, error=str(e))
+                    summary["unresolved"].append(transaction_id)
+                    continue
+                for shard_id in prepare["shards"]:
+                    self._ended_markers.setdefault(shard_id, []).append(transaction_id)
+                summary["recommitted"] += 1
+            else:
+                self.log.append({"type": "abort", "txn": transaction_id})
+                summary["aborted"] += 1
+            self.log.append({"type": "end", "txn": transaction_id})
+        self.log.checkpoint()
+        if summary["recommitted"] or summary["aborted"] or summary["unresolved"]:
+            self.logger.warning("Recovered in-doubt transactions", **summary)
+        return summary
+
+    def close(self):
+        """Roll back open transactions and close the coordinator log."""
+        with self.lock:
+            transaction_ids = list(self.transactions)
+        for transaction_id in transaction_ids:
+            self.rollback_transaction(transaction_id)
+        self.log.close()
+
+    def _commit_single(self, transaction):
+        """Commit a transaction that touched at most one shard, without the coordinator."""
+        for shard_id, connection in transaction.connections.items():
+            try:
+                connection.commit()
+            except sqlite3.Error as e:
+                self._rollback_all(transaction)
+                raise TransactionAbortedError("Shard commit failed", context={
+                    "transaction_id": transaction.transaction_id, "shard_id": shard_id, "error": str(e)
+                })
+        transaction.state = "committed"
+
+    def _commit_two_phase(self, transaction):
+        """Prepare, log the decision and commit every enlisted shard."""
+        transaction_id = transaction.transaction_id
+        with self.lock:
+            ended = {shard_id: self._ended_markers.pop(shard_id, []) for shard_id in transaction.connections}
+        try:
+            for shard_id, connection in transaction.connections.items():
+                self._ensure_marker_table(connection)
+                # Markers of transactions that logged ``end`` are no longer needed by recovery.
+                connection.executemany(f"DELETE FROM {MARKER_TABLE} WHERE txn_id = ?", [(txn,) for txn in ended[shard_id]])
+                connection.execute(f"INSERT INTO {MARKER_TABLE} VALUES (?, ?)", (transaction_id, time.time()))
+            self.log.append({"type": "prepare", "txn": transaction_id, "shards": {
+                shard_id: [(query, [encode_param(value) for value in params]) for query, params in statements]
+                for shard_id, statements in transaction.statements.items()
+            }})
+            self.log.append({"type": "commit", "txn": transaction_id}, sync=True)
+        except Exception as e:
+            with self.lock:
+                for shard_id, transaction_ids in ended.items():
+                    self._ended_markers.setdefault(shard_id, []).extend(transaction_ids)
+            self._rollback_all(transaction)
+            self.log.append({"type": "abort", "txn": transaction_id})
+            self.log.append({"type": "end", "txn": transaction_id})
+            raise TransactionAbortedError("Transaction failed to prepare", context={
+                "transaction_id": transaction_id, "error": str(e)
+            })
+
+        failed = {}
+        for shard_id, connection in transaction.connections.items():
+            try:
+                connection.commit()
+            except sqlite3.Error as e:
+                failed[shard_id] = str(e)
+                try:
+                    connection.rollback()
+                except sqlite3.Error:
+                    pass
+        transaction.state = "committed"
+        if failed:
+            self.logger.error("Shards failed to commit after commit decision", transaction_id=transaction_id, shards=failed)
+            raise CrossShardTransactionError("Transaction is in doubt on some shards", context={
+                "transaction_id": transaction_id, "failed_shards": failed
+            })
+        self.log.append({"type": "end", "txn": transaction_id})
+        with self.lock:
+            for shard_id in transaction.connections:
+                self._ended_markers.setdefault(shard_id, []).append(transaction_id)
+
+    def _run_on_shards(self, transaction, shard_ids, *statements):
+        """
+        Run savepoint control statements on each listed shard.
+
+        Raises:
+            TransactionError: If a statement fails.
+        """
+        for shard_id in shard_ids:
+            try:
+                for statement in statements:
+                    transaction.connections[shard_id].execute(statement)
+            except sqlite3.Error as e:
+                raise TransactionError("Savepoint operation failed", context={
+                    "transaction_id": transaction.transaction_id, "shard_id": shard_id,
+                    "statement": statements[0], "error": str(e)
+                })
+
+    def _redo_shard(self, transaction_id, shard_id, statements):
+        """
+        Replay a committed transaction on a shard that is missing its marker.
+
+        The marker is checked after ``BEGIN IMMEDIATE``, so a commit still in
+        flight on the shard finishes first and is not applied twice.
+
+        Args:
+            transaction_id (str): Transaction ID.
+            shard_id (str): Participant shard ID.
+            statements (list): Logged (query, params) redo statements.
+        """
+        connection = self.connection_pool.get_connection(shard_id)
+        failed = False
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+            connection.execute("BEGIN IMMEDIATE")
+            self._ensure_marker_table(connection)
+            found = connection.execute(f"SELECT 1 FROM {MARKER_TABLE} WHERE txn_id = ?", (transaction_id,)).fetchone()
+            if found is None:
+                for query, params in statements:
+                    connection.execute(query, [decode_param(value) for value in params])
+                connection.execute(f"INSERT INTO {MARKER_TABLE} VALUES (?, ?)", (transaction_id, time.time()))
+                self.logger.info("Re-committed transaction on shard", transaction_id=transaction_id, shard_id=shard_id)
+            connection.commit()
+        except sqlite3.Error as e:
+            failed = True
+            raise TransactionError("Could not re-commit transaction on shard", context={
+                "transaction_id": transaction_id, "shard_id": shard_id, "error": str(e)
+            })
+        finally:
+            self.connection_pool.release_connection(connection, shard_id, failed=failed)
+
+    @staticmethod
+    def _ensure_marker_table(connection):
+        """Create the marker table on a shard if it does not exist."""
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {MARKER_TABLE} (txn_id TEXT PRIMARY KEY, prepared_at REAL)")
+
+    def _rollback_all(self, transaction):
+        """Roll back every enlisted shard, logging failures."""
+        for shard_id, connection in transaction.connections.items():
+            try:
+                connection.rollback()
+            except sqlite3.Error as e:
+                self.logger.error("Shard rollback failed", transaction_id=transaction.transaction_id, shard_id=shard_id, error=str(e))
+        transaction.state = "rolled_back"
+
+    def _finish(self, transaction):
+        """Release the pinned connections and forget the transaction."""
+        for shard_id, connection in transaction.connections.items():
+            self.connection_pool.release_connection(connection, shard_id, failed=transaction.state != "committed")
+        transaction.connections = {}
+        with self.lock:
+            self.transactions.pop(transaction.transaction_id, None)
+
+    def _get_active(self, transaction_id):
+        """
+        Look up an active transaction.
+
+        Raises:
+            TransactionError: If the transaction is unknown or already finished.
         """
-        self.logger.warning("NOT FULLY IMPLEMENTED: add_operation")
-        if transaction_id in self.transactions:
-            self.transactions[transaction_id].append(operation)
+        with self.lock:
+            transaction = self.transactions.get(transaction_id)
+        if transaction is None or transaction.state != "active":
+            raise TransactionError("Transaction is not active", context={"transaction_id": transaction_id})
+        return transaction
@@ -0,0 +1,224 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from itertools import groupby
+from typing import Any, Dict, List, Optional
+from shard_lite.core.connection_pool import ConnectionPool
+from shard_lite.core.executor import ShardExecutor
+from shard_lite.utils.logger import Logger
+from shard_lite.exceptions.shard_exceptions import ShardingError, QueryExecutionError
+
+class WriteBuffer:
+    """
+    Write-behind buffer that group-commits writes per shard.
+
+    Writes are queued per shard and a background thread flushes each shard's
+    queue in a single transaction once it holds ``max_batch`` writes or its
+    oldest write has waited ``max_delay`` seconds. Every write gets a Future
+    that resolves after the transaction holding it commits. Consecutive
+    writes with the same SQL text are sent with one executemany.
+
+    If a batch fails, it is rolled back and its writes are retried one
+    transaction each, so a single bad write only fails its own Future.
+
+    Attributes:
+        connection_pool (ConnectionPool): Pool providing shard connections.
+        max_batch (int): Writes that trigger an immediate flush of a shard.
+        max_delay (float): Longest time a write waits before its shard is flushed.
+    """
+
+    def __init__(
+        self,
+        connection_pool: ConnectionPool,
+        logger: Optional[Logger] = None,
+        executor: Optional[ShardExecutor] = None,
+        max_batch: int = 100,
+        max_delay: float = 0.005
+    ):
+        """
+        Initialize the buffer and start its flush thread.
+
+        Args:
+            connection_pool (ConnectionPool): Pool providing shard connections.
+            logger (Logger, optional): Logger instance for logging events.
+            executor (ShardExecutor, optional): Executor used to flush several shards in parallel.
+            max_batch (int): Writes that trigger an immediate flush of a shard.
+            max_delay (float): Longest time in seconds a write waits before its shard is flushed.
+        """
+        self.connection_pool = connection_pool
+        self.logger = logger or Logger()
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._condition = threading.Condition()
+        self._pending: Dict[str, List[tuple]] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._flush_locks: Dict[str, threading.Lock] = {}
+        self._batches = 0
+        self._writes = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="shard_lite_write_buffer", daemon=True)
+        self._thread.start()
+
+    def submit(self, shard_id: str, query: str, params: List[Any]) -> Future:
+        """
+        Queue a write for a shard.
+
+        Args:
+            shard_id (str): Target shard ID.
+            query (str): SQL write statement.
+            params (List[Any]): Statement parameters.
+
+        Returns:
+            Future: Resolves to None once the write is committed, or raises
+            the error that made it fail. Cancelling it before the flush drops the write.
+
+        Raises:
+            ShardingError: If the buffer is closed.
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise ShardingError("Write buffer is closed", context={"shard_id": shard_id})
+            batch = self._pending.setdefault(shard_id, [])
+            if not batch:
+                self._deadlines[shard_id] = time.monotonic() + self.max_delay
+                self._flush_locks.setdefault(shard_id, threading.Lock())
+            batch.append((query, params, future))
+            if len(batch) == 1 or len(batch) >= self.max_batch:
+                self._condition.notify()
+        return future
+
+    def flush(self) -> None:
+        """
+        Flush every shard's queued writes in the calling thread.
+        """
+        with self._condition:
+            shard_ids = list(self._pending)
+        for shard_id in shard_ids:
+            self._flush_shard(shard_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return buffer counters.
+
+        Returns:
+            Dict[str, int]: Queued writes, and batches and writes committed so far.
+        """
+        with self._condition:
+            return {
+                "pending": sum(len(batch) for batch in self._pending.values()),
+                "batches": self._batches,
+                "writes": self._writes,
+            }
+
+    def close(self) -> None:
+        """
+        Stop accepting writes, flush what is queued and stop the flush thread.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.logger.info("Write buffer closed", batches=self._batches, writes=self._writes)
+
+    def _run(self) -> None:
+        """Flush thread: wait for due shards and flush them."""
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed and not self._pending:
+                        return
+                    now = time.monotonic()
+                    due = [
+                        shard_id for shard_id, batch in self._pending.items()
+                        if self._closed or len(batch) >= self.max_batch or self._deadlines[shard_id] <= now
+                    ]
+                    if due:
+                        break
+                    timeout = min(self._deadlines.values()) - now if self._deadlines else None
+                    self._condition.wait(timeout)
+            operations = [partial(self._flush_shard, shard_id) for shard_id in due]
+            try:
+                if self.executor is not None:
+                    self.executor.run_all(operations)
+                else:
+                    for operation in operations:
+                        operation()
+            except Exception as e:
+                self.logger.error("Write buffer flush failed", error=str(e))
+
+    def _flush_shard(self, shard_id: str) -> None:
+        """
+        Take a shard's queued writes and commit them.
+
+        The shard's flush lock is taken before the queue is read, so batches
+        for one shard always commit in submission order.
+
+        Args:
+            shard_id (str): The shard ID.
+        """
+        with self._flush_locks[shard_id]:
+            with self._condition:
+                batch = self._pending.pop(shard_id, [])
+                self._deadlines.pop(shard_id, None)
+            batch = [write for write in batch if write[2].set_running_or_notify_cancel()]
+            if batch:
+                self._commit_batch(shard_id, batch)
+
+    def _commit_batch(self, shard_id: str, batch: List[tuple]) -> None:
+        """
+        Run a batch of writes in one transaction and resolve their futures.
+
+        Args:
+            shard_id (str): The shard ID.
+            batch (List[tuple]): (query, params, future) writes.
+        """
+        try:
+            with self.connection_pool.connection(shard_id) as connection:
+                try:
+                    for query, writes in groupby(batch, key=lambda write: write[0]):
+                        connection.executemany(query, [write[1] for write in writes])
+                    connection.commit()
+                except sqlite3.Error as e:
+                    connection.rollback()
+                    self.logger.warning("Group commit failed, retrying writes singly", shard_id=shard_id, error=str(e))
+                    self._commit_singly(connection, shard_id, batch)
+                    return
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        with self._condition:
+            self._batches += 1
+            self._writes += len(batch)
+        for _, _, future in batch:
+            future.set_result(None)
+
+    def _commit_singly(self, connection, shard_id: str, batch: List[tuple]) -> None:
+        """
+        Commit each write of a failed batch in its own transaction.
+
+        Args:
+            connection (sqlite3.Connection): Connection to the shard.
+            shard_id (str): The shard ID.
+            batch (List[tuple]): (query, params, future) writes.
+        """
+        for query, params, future in batch:
+            try:
+                connection.execute(query, params)
+                connection.commit()
+            except sqlite3.Error as e:
+                connection.rollback()
+                future.set_exception(QueryExecutionError(
+                    "Buffered write failed", context={"shard_id": shard_id, "query": query, "error": str(e)}
+                ))
+                continue
+            with self._condition:
+                self._batches += 1
+                self._writes += 1
+            future.set_result(None)
@@ -14,7 +14,8 @@ from shard_lite.exceptions.shard_exceptions import (
     QueryExecutionError,
     TransactionError,
     TransactionAbortedError,
-    CrossShardTransactionError
+    CrossShardTransactionError,
+    VersionConflictError
 )
 
 __all__ = [
@@ -31,5 +32,6 @@ __all__ = [
     'QueryExecutionError',
     'TransactionError',
     'TransactionAbortedError',
-    'CrossShardTransactionError'
+    'CrossShardTransactionError',
+    'VersionConflictError'
 ]
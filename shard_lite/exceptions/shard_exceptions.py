@@ -28,8 +28,8 @@ class ConfigurationError(ShardingError):
 
 
 class ConnectionError(ShardingError):
-    def __init__(self, message="Database connection issue", **context):
-        super().__init__(message, error_code=1200, **context)
+    def __init__(self, message="Database connection issue", error_code=1200, **context):
+        super().__init__(message, error_code=error_code, **context)
 
 
 class ConnectionTimeoutError(ConnectionError):
@@ -43,8 +43,8 @@ class TooManyConnectionsError(ConnectionError):
 
 
 class StrategyError(ShardingError):
-    def __init__(self, message="Sharding strategy issue", **context):
-        super().__init__(message, error_code=1300, **context)
+    def __init__(self, message="Sharding strategy issue", error_code=1300, **context):
+        super().__init__(message, error_code=error_code, **context)
 
 
 class InvalidKeyError(StrategyError):
@@ -58,8 +58,8 @@ class ShardingRangeError(StrategyError):
 
 
 class QueryError(ShardingError):
-    def __init__(self, message="Query execution issue", **context):
-        super().__init__(message, error_code=1400, **context)
+    def __init__(self, message="Query execution issue", error_code=1400, **context):
+        super().__init__(message, error_code=error_code, **context)
 
 
 class QuerySyntaxError(QueryError):
@@ -73,8 +73,8 @@ class QueryExecutionError(QueryError):
 
 
 class TransactionError(ShardingError):
-    def __init__(self, message="Transaction management issue", **context):
-        super().__init__(message, error_code=1500, **context)
+    def __init__(self, message="Transaction management issue", error_code=1500, **context):
+        super().__init__(message, error_code=error_code, **context)
 
 
 class TransactionAbortedError(TransactionError):
@@ -85,3 +85,8 @@ class TransactionAbortedError(TransactionError):
 class CrossShardTransactionError(TransactionError):
     def __init__(self, message="Issue with multi-shard transaction", **context):
         super().__init__(message, error_code=1520, **context)
+
+
+class VersionConflictError(TransactionError):
+    def __init__(self, message="Row version changed since it was read", **context):
+        super().__init__(message, error_code=1530, **context)
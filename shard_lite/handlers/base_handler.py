@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from shard_lite.utils.logger import Logger
+from shard_lite.utils.sql import criteria_shape, where_template
 from shard_lite.core.connection_pool import ConnectionPool
 from shard_lite.strategies.base_strategy import BaseStrategy
 from shard_lite.exceptions.shard_exceptions import ShardingError
@@ -10,8 +11,18 @@ class BaseHandler(ABC):
     Abstract base class for all CRUD operation handlers.
 
     Defines the interface and utility methods for CRUD operations.
+
+    Generated SQL text is memoized per query shape (operation, columns and
+    criteria layout), so records with a stable schema reuse the same string
+    and hit sqlite3's per-connection statement cache.
     """
 
+    # Upper bound on memoized SQL templates; new shapes past it are built uncached.
+    TEMPLATE_CACHE_SIZE = 1024
+
+    # Column checked and bumped by versioned updates/deletes unless ``version_column`` is configured.
+    DEFAULT_VERSION_COLUMN = "version"
+
     def __init__(self, query_router: BaseStrategy, connection_pool: ConnectionPool, logger: Optional[Logger] = None):
         """
         Initialize the handler with dependencies.
@@ -24,6 +35,13 @@ class BaseHandler(ABC):
         self.query_router = query_router
         self.connection_pool = connection_pool
         self.logger = logger or Logger()
+        self.executor = getattr(query_router, "executor", None)
+        config = getattr(connection_pool, "config", None)
+        self.version_column = (
+            config.get("version_column", self.DEFAULT_VERSION_COLUMN) if config is not None
+            else self.DEFAULT_VERSION_COLUMN
+        )
+        self._templates = {}
 
     @abstractmethod
     def insert(self, data: Dict[str, Any]) -> None:
@@ -82,7 +100,7 @@ class BaseHandler(ABC):
             Any: Operation result.
         """
         shards = shards or self.query_router.get_all_shards()
-        connections = self._acquire_connections(shards)
+        connections = self._acquire_connections(shards, readonly=operation == "select")
         results = []
 
         try:
@@ -122,19 +140,63 @@ class BaseHandler(ABC):
         if not isinstance(criteria, dict):
             raise ShardingError("Criteria must be a dictionary", context={"criteria": criteria})
 
-    def _acquire_connections(self, shard_ids: List[str]) -> Dict[str, Any]:
+    def _criteria_shape(self, criteria: Dict[str, Any]) -> tuple:
+        """
+        Split criteria into a hashable shape and its parameters.
+
+        Args:
+            criteria (Dict[str, Any]): Query criteria.
+
+        Returns:
+            tuple: Shape of (column, IN-list length or None) pairs, and parameters.
+        """
+        return criteria_shape(criteria)
+
+    @staticmethod
+    def _where_template(shape: tuple) -> str:
+        """
+        Render a WHERE clause body for a criteria shape.
+
+        Args:
+            shape (tuple): Shape from _criteria_shape.
+
+        Returns:
+            str: Clause string (without the WHERE keyword).
+        """
+        return where_template(shape)
+
+    def _query_template(self, key: tuple, build: Callable[[], str]) -> str:
+        """
+        Return the memoized SQL text for a query shape, building it on a miss.
+
+        Args:
+            key (tuple): Query shape, starting with the operation name.
+            build (Callable[[], str]): Builds the SQL text.
+
+        Returns:
+            str: SQL text.
+        """
+        template = self._templates.get(key)
+        if template is None:
+            template = build()
+            if len(self._templates) < self.TEMPLATE_CACHE_SIZE:
+                self._templates[key] = template
+        return template
+
+    def _acquire_connections(self, shard_ids: List[str], readonly: bool = False) -> Dict[str, Any]:
         """
         Get connections to specified shards.
 
         Args:
             shard_ids (List[str]): List of shard IDs.
+            readonly (bool): Whether the connections are only used for reads.
 
         Returns:
             Dict[str, Any]: Mapping of shard IDs to connections.
         """
         connections = {}
         for shard_id in shard_ids:
-            connections[shard_id] = self.connection_pool.get_connection(shard_id)
+            connections[shard_id] = self.connection_pool.get_connection(shard_id, readonly)
         return connections
 
     def _release_connections(self, connections: Dict[str, Any]) -> None:
@@ -1,9 +1,10 @@
 from shard_lite.handlers.base_handler import BaseHandler
 from shard_lite.handlers.default_handler import DefaultHandler
-from shard_lite.exceptions.shard_exceptions import ShardingError
+from shard_lite.exceptions.shard_exceptions import ShardingError, QueryExecutionError, VersionConflictError
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Generator
 from functools import partial
+import sqlite3
 
 class BatchHandler(BaseHandler):
     """
@@ -43,15 +44,18 @@ class BatchHandler(BaseHandler):
         """
         return self.select_batch(criteria)
 
-    def update(self, criteria: List[Dict[str, Any]], data: List[Dict[str, Any]]) -> None:
+    def update(self, criteria: List[Dict[str, Any]], data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Optimized bulk update.
 
         Args:
             criteria (List[Dict[str, Any]]): List of query criteria.
             data (List[Dict[str, Any]]): List of data to update.
+
+        Returns:
+            List[Dict[str, Any]]: Per-pair results, see update_batch.
         """
-        self.update_batch(list(zip(criteria, data)))
+        return self.update_batch(list(zip(criteria, data)))
 
     def delete(self, criteria: List[Dict[str, Any]]) -> None:
         """
@@ -66,12 +70,35 @@ class BatchHandler(BaseHandler):
         """
         Insert multiple records efficiently in batches.
 
+        Records are grouped by target shard and each shard's group is written
+        in a single transaction (one commit per shard), with shards processed
+        in parallel.
+
         Args:
             data_list (List[Dict[str, Any]]): List of records to insert.
-            batch_size (int): Number of records per batch.
+            batch_size (int): Number of rows passed to each executemany call.
+        """
+        for record in data_list:
+            self._validate_data(record)
+        groups = self.query_router.get_shards_for_keys([record["id"] for record in data_list])
+        operations = [
+            partial(self._insert_group, shard_id, [data_list[position] for position in positions], batch_size)
+            for shard_id, positions in groups.items()
+        ]
+        self._execute_in_parallel(operations)
+
+    def _insert_group(self, shard_id: str, records: List[Dict[str, Any]], batch_size: int) -> None:
+        """
+        Insert all records routed to one shard over a single pooled connection.
+
+        Args:
+            shard_id (str): Target shard ID.
+            records (List[Dict[str, Any]]): Records owned by the shard.
+            batch_size (int): Number of rows passed to each executemany call.
         """
-        for chunk in self._chunk_data(data_list, batch_size):
-            self._execute_in_parallel([partial(self.default_handler.insert, record) for record in chunk])
+        with self.connection_pool.connection(shard_id) as connection:
+            self._insert_on_shard(connection, records, batch_size)
+            self.logger.info("Inserted batch", shard_id=shard_id, count=len(records))
 
     def select_batch(self, criteria_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -83,20 +110,41 @@ class BatchHandler(BaseHandler):
         Returns:
             List[Dict[str, Any]]: List of query results.
         """
-        results = []
-        operations = [lambda: results.extend(self.default_handler.select(criteria)) for criteria in criteria_list]
-        self._execute_in_parallel(operations)
-        return results
+        operations = [partial(self.default_handler.select, criteria) for criteria in criteria_list]
+        return [row for rows in self._execute_in_parallel(operations) for row in rows]
 
-    def update_batch(self, criteria_data_pairs: List[tuple]) -> None:
+    def update_batch(self, criteria_data_pairs: List[tuple]) -> List[Dict[str, Any]]:
         """
         Update records in batch.
 
+        A pair may carry a third element, the expected version, to make that
+        update conditional. A version conflict is reported in the pair's
+        result instead of failing the whole batch; a pair whose row does not
+        exist reports 0 updated rows and no conflict.
+
         Args:
-            criteria_data_pairs (List[tuple]): List of (criteria, data) pairs.
+            criteria_data_pairs (List[tuple]): List of (criteria, data) or
+                (criteria, data, expected_version) tuples.
+
+        Returns:
+            List[Dict[str, Any]]: One result per pair, in order, with the
+            ``updated`` row count and a ``conflict`` flag.
         """
-        operations = [lambda: self.default_handler.update(criteria, data) for criteria, data in criteria_data_pairs]
-        self._execute_in_parallel(operations)
+        operations = [partial(self._update_versioned, *pair) for pair in criteria_data_pairs]
+        return self._execute_in_parallel(operations)
+
+    def _update_versioned(self, criteria: Dict[str, Any], data: Dict[str, Any], expected_version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run one update of a batch and turn a version conflict into a result.
+
+        Returns:
+            Dict[str, Any]: ``updated`` row count and ``conflict`` flag.
+        """
+        try:
+            updated = self.default_handler.update(criteria, data, expected_version)
+        except VersionConflictError:
+            return {"updated": 0, "conflict": True}
+        return {"updated": updated, "conflict": False}
 
     def delete_batch(self, criteria_list: List[Dict[str, Any]]) -> None:
         """
@@ -105,7 +153,7 @@ class BatchHandler(BaseHandler):
         Args:
             criteria_list (List[Dict[str, Any]]): List of query criteria.
         """
-        operations = [lambda: self.default_handler.delete(criteria) for criteria in criteria_list]
+        operations = [partial(self.default_handler.delete, criteria) for criteria in criteria_list]
         self._execute_in_parallel(operations)
 
     def _chunk_data(self, data_list: List[Any], size: int) -> Generator[List[Any], None, None]:
@@ -122,21 +170,48 @@ class BatchHandler(BaseHandler):
         for i in range(0, len(data_list), size):
             yield data_list[i:i + size]
 
-    def _execute_in_parallel(self, operations: List[callable]) -> None:
+    def _execute_in_parallel(self, operations: List[callable]) -> List[Any]:
         """
         Execute operations in parallel.
 
+        Uses the shared executor when the router provides one, otherwise a
+        short-lived pool.
+
         Args:
             operations (List[callable]): List of operations to execute.
+
+        Returns:
+            List[Any]: Operation results in submission order.
         """
+        if self.executor is not None:
+            return self.executor.run_all(operations)
         with ThreadPoolExecutor() as executor:
-            executor.map(lambda op: op(), operations)
+            return list(executor.map(lambda op: op(), operations))
+
+    def _insert_on_shard(self, connection, data_list, batch_size=100, retries=3):
+        """
+        Execute batch insert operation on a specific shard.
 
-    def _insert_on_shard(self, connection, data_list):
-        """Execute batch insert operation on a specific shard."""
+        Rows are grouped by column set and written with one executemany per
+        group (in chunks of batch_size), all inside a single transaction.
+        """
+        column_groups = {}
         for data in data_list:
-            query, params = self._build_insert_query(data)
-            self._execute_with_retry(query, params, connection)
+            column_groups.setdefault(tuple(data), []).append(data)
+
+        for attempt in range(retries):
+            try:
+                for records in column_groups.values():
+                    query, _ = self._build_insert_query(records[0])
+                    for chunk in self._chunk_data(records, batch_size):
+                        connection.executemany(query, [list(record.values()) for record in chunk])
+                connection.commit()
+                return
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.logger.error("Batch insert failed", rows=len(data_list), error=str(e))
+                if attempt == retries - 1:
+                    raise QueryExecutionError("Batch insert failed after retries", context={"rows": len(data_list), "error": str(e)})
 
     def _select_on_shard(self, connection, criteria_list):
         """Execute batch select operation on a specific shard."""
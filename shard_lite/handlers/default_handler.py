@@ -1,10 +1,16 @@
 from shard_lite.handlers.base_handler import BaseHandler
-from shard_lite.exceptions.shard_exceptions import QueryExecutionError, ShardingError
+from shard_lite.exceptions.shard_exceptions import QueryExecutionError, ShardingError, VersionConflictError
 import sqlite3
 
 class DefaultHandler(BaseHandler):
     """
     Default implementation of CRUD operations for SQLite sharding.
+
+    ``update`` and ``delete`` accept an ``expected_version`` for optimistic
+    concurrency: the statement only matches rows whose version column still
+    holds that value and an update bumps the column by one. If rows match
+    the criteria but none is at the expected version, VersionConflictError
+    is raised; if no row matches the criteria at all, 0 is returned.
     """
 
     def insert(self, data):
@@ -17,18 +23,29 @@ class DefaultHandler(BaseHandler):
         Raises:
             ShardingError: If data is invalid or insertion fails.
         """
-        self._validate_data(data)
         if isinstance(data, dict):
             data = [data]  # Convert single record to a list for uniformity
-
+        elif not isinstance(data, list):
+            self._validate_data(data)
         for record in data:
-            shard_id = self.query_router.get_shard_for_key(record["id"])
-            connection = self.connection_pool.get_connection(shard_id)
-            try:
+            self._validate_data(record)
+
+        groups = self.query_router.get_shards_for_keys([record["id"] for record in data])
+        for shard_id, positions in groups.items():
+            self._insert_records(shard_id, [data[position] for position in positions])
+
+    def _insert_records(self, shard_id, records):
+        """
+        Insert records that all belong to one shard over a single connection.
+
+        Args:
+            shard_id (str): Target shard ID.
+            records (list of dict): Records routed to the shard.
+        """
+        with self.connection_pool.connection(shard_id) as connection:
+            for record in records:
                 self._insert_on_shard(connection, record)
-                self.logger.info("Inserted record", shard_id=shard_id, record=record)
-            finally:
-                self.connection_pool.release_connection(connection, shard_id)
+            self.logger.info("Inserted records", shard_id=shard_id, count=len(records))
 
     def select(self, criteria):
         """
@@ -48,58 +65,228 @@ class DefaultHandler(BaseHandler):
         results = []
 
         for shard_id in shards:
-            connection = self.connection_pool.get_connection(shard_id)
-            try:
+            with self.connection_pool.connection(shard_id, readonly=True) as connection:
                 results.extend(self._select_on_shard(connection, criteria))
                 self.logger.info("Selected records", shard_id=shard_id, criteria=criteria)
-            finally:
-                self.connection_pool.release_connection(connection, shard_id)
 
         return results
 
-    def update(self, criteria, data):
+    def select_top_n(self, criteria, order_by, limit, descending=False):
+        """
+        Select the first n records matching the criteria in a global order.
+
+        Args:
+            criteria (dict): Query criteria.
+            order_by (str or list of str): Column(s) to order by.
+            limit (int): Number of records to return.
+            descending (bool): Order descending.
+
+        Returns:
+            list: Up to limit records in order.
+
+        Raises:
+            ShardingError: If criteria is invalid or query fails.
+        """
+        self._validate_criteria(criteria)
+        shards = self.query_router.get_shards_for_query(criteria)
+        query, params = self._build_select_query(criteria)
+        return self.query_router.execute_top_n(query, params, order_by, limit, descending, shards)
+
+    def iter_select(self, criteria, chunk_size=500, chunks=False):
+        """
+        Stream records matching the criteria, one shard at a time.
+
+        Rows are read with fetchmany so memory stays flat regardless of result
+        size. Each shard's pooled connection is held only while that shard is
+        being read and is released when the generator moves on, is exhausted
+        or is closed.
+
+        Args:
+            criteria (dict): Query criteria; an empty dict selects every row.
+            chunk_size (int): Rows fetched per round trip.
+            chunks (bool): Yield lists of up to chunk_size rows instead of single rows.
+
+        Yields:
+            tuple or list: A row, or a chunk of rows when chunks is True.
+
+        Raises:
+            ShardingError: If criteria is invalid.
+        """
+        self._validate_criteria(criteria)
+        shards = self.query_router.get_shards_for_query(criteria)
+        query, params = self._build_select_query(criteria)
+
+        for shard_id in shards:
+            connection = self.connection_pool.get_connection(shard_id, readonly=True)
+            cursor = None
+            failed = False
+            try:
+                cursor = connection.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    if chunks:
+                        yield rows
+                    else:
+                        yield from rows
+                self.logger.info("Streamed records", shard_id=shard_id, criteria=criteria)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                if cursor is not None:
+                    cursor.close()
+                self.connection_pool.release_connection(connection, shard_id, failed=failed)
+
+    def update(self, criteria, data, expected_version=None):
         """
         Update records matching the criteria in the appropriate shard(s).
 
         Args:
             criteria (dict): Query criteria.
             data (dict): Data to update.
+            expected_version (int, optional): Only update rows still at this
+                version, and increment their version column.
+
+        Returns:
+            int: Number of rows updated; 0 if no row matches the criteria.
 
         Raises:
             ShardingError: If criteria or data is invalid or update fails.
+            VersionConflictError: If expected_version is given and matching
+                rows exist, but none is at that version.
         """
         self._validate_criteria(criteria)
         self._validate_data(data)
+        if expected_version is not None and self.version_column in data:
+            raise ShardingError("Versioned updates manage the version column", context={"column": self.version_column})
         shards = self.query_router.get_shards_for_query(criteria)
 
+        updated = 0
         for shard_id in shards:
-            connection = self.connection_pool.get_connection(shard_id)
-            try:
-                self._update_on_shard(connection, criteria, data)
+            with self.connection_pool.connection(shard_id) as connection:
+                updated += self._update_on_shard(connection, criteria, data, expected_version)
                 self.logger.info("Updated records", shard_id=shard_id, criteria=criteria, data=data)
-            finally:
-                self.connection_pool.release_connection(connection, shard_id)
+        self._check_version(updated, shards, criteria, expected_version)
+        return updated
 
-    def delete(self, criteria):
+    def delete(self, criteria, expected_version=None):
         """
         Delete records matching the criteria from the appropriate shard(s).
 
         Args:
             criteria (dict): Query criteria.
+            expected_version (int, optional): Only delete rows still at this version.
+
+        Returns:
+            int: Number of rows deleted; 0 if no row matches the criteria.
 
         Raises:
             ShardingError: If criteria is invalid or deletion fails.
+            VersionConflictError: If expected_version is given and matching
+                rows exist, but none is at that version.
         """
         self._validate_criteria(criteria)
         shards = self.query_router.get_shards_for_query(criteria)
 
+        deleted = 0
         for shard_id in shards:
-            connection = self.connection_pool.get_connection(shard_id)
-            try:
-                self._delete_on_shard(connection, criteria)
+            with self.connection_pool.connection(shard_id) as connection:
+                deleted += self._delete_on_shard(connection, criteria, expected_version)
                 self.logger.info("Deleted records", shard_id=shard_id, criteria=criteria)
-            finally:
-                self.connection_pool.release_connection(connection, shard_id)
+        self._check_version(deleted, shards, criteria, expected_version)
+        return deleted
+
+    def plan_insert(self, data):
+        """
+        Validate a record and build its insert without executing it.
+
+        Used by callers that run the statement themselves, such as the
+        write-behind buffer and multi-shard transactions.
+
+        Args:
+            data (dict): Record to insert.
+
+        Returns:
+            tuple: (shard_id, query, params) for the record's shard.
+
+        Raises:
+            ShardingError: If the record is invalid or has no ``id`` shard key.
+        """
+        self._validate_data(data)
+        if "id" not in data:
+            raise ShardingError("Record has no shard key", context={"record": data})
+        query, params = self._build_insert_query(data)
+        return self.query_router.get_shard_for_key(data["id"]), query, params
+
+    def plan_update(self, criteria, data):
+        """
+        Validate an update and build it for every target shard without executing it.
+
+        Args:
+            criteria (dict): Query criteria.
+            data (dict): Data to update.
+
+        Returns:
+            list: (shard_id, query, params) per shard the criteria route to.
+
+        Raises:
+            ShardingError: If criteria or data is invalid.
+        """
+        self._validate_criteria(criteria)
+        self._validate_data(data)
+        query, params = self._build_update_query(criteria, data)
+        return [(shard_id, query, params) for shard_id in self.query_router.get_shards_for_query(criteria)]
+
+    def plan_delete(self, criteria):
+        """
+        Validate a delete and build it for every target shard without executing it.
+
+        Args:
+            criteria (dict): Query criteria.
+
+        Returns:
+            list: (shard_id, query, params) per shard the criteria route to.
+
+        Raises:
+            ShardingError: If criteria is invalid.
+        """
+        self._validate_criteria(criteria)
+        query, params = self._build_delete_query(criteria)
+        return [(shard_id, query, params) for shard_id in self.query_router.get_shards_for_query(criteria)]
+
+    def _check_version(self, rows, shards, criteria, expected_version):
+        """
+        Tell a version conflict apart from a missing row after a versioned write.
+
+        When the write changed nothing, the current versions of the rows
+        matching the criteria are read; if there are any, the version moved on.
+
+        Args:
+            rows (int): Rows the write changed.
+            shards (list): Shards the write ran on.
+            criteria (dict): Query criteria.
+            expected_version (int): Version the write required, or None.
+
+        Raises:
+            VersionConflictError: If matching rows exist but none was at expected_version.
+        """
+        if expected_version is None or rows:
+            return
+        shape, params = self._criteria_shape(criteria)
+        query = self._query_template(
+            ("version", shape),
+            lambda: f"SELECT {self.version_column} FROM records WHERE {self._where_template(shape)}"
+        )
+        current_versions = []
+        for shard_id in shards:
+            with self.connection_pool.connection(shard_id, readonly=True) as connection:
+                current_versions.extend(version for (version,) in connection.execute(query, params))
+        if current_versions:
+            raise VersionConflictError("Row version changed since it was read", context={
+                "criteria": criteria, "expected_version": expected_version, "current_versions": current_versions
+            })
 
     def _build_select_query(self, criteria):
         """
@@ -111,14 +298,14 @@ class DefaultHandler(BaseHandler):
         Returns:
             tuple: Query string and parameters.
         """
-        query = "SELECT * FROM records WHERE "
-        conditions = []
-        params = []
-        for key, value in criteria.items():
-            conditions.append(f"{key} = ?")
-            params.append(value)
-        query += " AND ".join(conditions)
-        return query, params
+        shape, params = self._criteria_shape(criteria)
+
+        def build():
+            if not shape:
+                return "SELECT * FROM records"
+            return f"SELECT * FROM records WHERE {self._where_template(shape)}"
+
+        return self._query_template(("select", shape), build), params
 
     def _build_insert_query(self, data):
         """
@@ -130,42 +317,68 @@ class DefaultHandler(BaseHandler):
         Returns:
             tuple: Query string and parameters.
         """
-        keys = ", ".join(data.keys())
-        placeholders = ", ".join(["?"] * len(data))
-        query = f"INSERT INTO records ({keys}) VALUES ({placeholders})"
-        params = list(data.values())
-        return query, params
+        columns = tuple(data)
+
+        def build():
+            placeholders = ", ".join(["?"] * len(columns))
+            return f"INSERT INTO records ({', '.join(columns)}) VALUES ({placeholders})"
+
+        return self._query_template(("insert", columns), build), list(data.values())
 
-    def _build_update_query(self, criteria, data):
+    def _build_update_query(self, criteria, data, expected_version=None):
         """
         Build an UPDATE query.
 
         Args:
             criteria (dict): Query criteria.
             data (dict): Data to update.
+            expected_version (int, optional): Version the rows must still have;
+                the query then also increments the version column.
 
         Returns:
             tuple: Query string and parameters.
         """
-        set_clause = ", ".join([f"{key} = ?" for key in data.keys()])
-        where_clause = " AND ".join([f"{key} = ?" for key in criteria.keys()])
-        query = f"UPDATE records SET {set_clause} WHERE {where_clause}"
-        params = list(data.values()) + list(criteria.values())
+        columns = tuple(data)
+        shape, where_params = self._criteria_shape(criteria)
+        versioned = expected_version is not None
+
+        def build():
+            assignments = [f"{key} = ?" for key in columns]
+            where = self._where_template(shape)
+            if versioned:
+                assignments.append(f"{self.version_column} = {self.version_column} + 1")
+                where = f"{where} AND {self.version_column} = ?"
+            return f"UPDATE records SET {', '.join(assignments)} WHERE {where}"
+
+        query = self._query_template(("update", columns, shape, versioned), build)
+        params = list(data.values()) + where_params
+        if versioned:
+            params.append(expected_version)
         return query, params
 
-    def _build_delete_query(self, criteria):
+    def _build_delete_query(self, criteria, expected_version=None):
         """
         Build a DELETE query.
 
         Args:
             criteria (dict): Query criteria.
+            expected_version (int, optional): Version the rows must still have.
 
         Returns:
             tuple: Query string and parameters.
         """
-        where_clause = " AND ".join([f"{key} = ?" for key in criteria.keys()])
-        query = f"DELETE FROM records WHERE {where_clause}"
-        params = list(criteria.values())
+        shape, params = self._criteria_shape(criteria)
+        versioned = expected_version is not None
+
+        def build():
+            where = self._where_template(shape)
+            if versioned:
+                where = f"{where} AND {self.version_column} = ?"
+            return f"DELETE FROM records WHERE {where}"
+
+        query = self._query_template(("delete", shape, versioned), build)
+        if versioned:
+            params.append(expected_version)
         return query, params
 
     def _execute_with_retry(self, query, params, connection, retries=3):
@@ -178,14 +391,17 @@ class DefaultHandler(BaseHandler):
             connection (sqlite3.Connection): SQLite connection.
             retries (int): Number of retry attempts.
 
+        Returns:
+            int: Number of rows the statement changed.
+
         Raises:
             QueryExecutionError: If the query fails after retries.
         """
         for attempt in range(retries):
             try:
-                connection.execute(query, params)
+                cursor = connection.execute(query, params)
                 connection.commit()
-                return
+                return cursor.rowcount
             except sqlite3.Error as e:
                 self.logger.error("Query execution failed", query=query, params=params, error=str(e))
                 if attempt == retries - 1:
@@ -202,12 +418,12 @@ class DefaultHandler(BaseHandler):
         cursor = connection.execute(query, params)
         return cursor.fetchall()
 
-    def _update_on_shard(self, connection, criteria, data):
-        """Execute update operation on a specific shard."""
-        query, params = self._build_update_query(criteria, data)
-        self._execute_with_retry(query, params, connection)
+    def _update_on_shard(self, connection, criteria, data, expected_version=None):
+        """Execute update operation on a specific shard and return the rows changed."""
+        query, params = self._build_update_query(criteria, data, expected_version)
+        return self._execute_with_retry(query, params, connection)
 
-    def _delete_on_shard(self, connection, criteria):
-        """Execute delete operation on a specific shard."""
-        query, params = self._build_delete_query(criteria)
-        self._execute_with_retry(query, params, connection)
+    def _delete_on_shard(self, connection, criteria, expected_version=None):
+        """Execute delete operation on a specific shard and return the rows deleted."""
+        query, params = self._build_delete_query(criteria, expected_version)
+        return self._execute_with_retry(query, params, connection)
@@ -4,10 +4,20 @@ from shard_lite.strategies.base_strategy import BaseStrategy
 from shard_lite.strategies.hash_strategy import HashStrategy
 from shard_lite.strategies.range_strategy import RangeStrategy
 from shard_lite.strategies.directory_strategy import DirectoryStrategy
+from shard_lite.strategies.directory_store import (
+    BaseDirectoryStore,
+    JsonDirectoryStore,
+    JournalDirectoryStore,
+    SQLiteDirectoryStore
+)
 
 __all__ = [
     'BaseStrategy',
     'HashStrategy',
     'RangeStrategy',
-    'DirectoryStrategy'
+    'DirectoryStrategy',
+    'BaseDirectoryStore',
+    'JsonDirectoryStore',
+    'JournalDirectoryStore',
+    'SQLiteDirectoryStore'
 ]
@@ -79,6 +79,51 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def get_shards_for_keys(self, keys):
+        """
+        Route many keys at once, grouping them by owning shard.
+
+        Strategies override this with a vectorized implementation; the default
+        falls back to get_shard_for_key per key.
+
+        Args:
+            keys (Sequence): Keys to locate.
+
+        Returns:
+            dict: Mapping of shard IDs to the positions (indexes into keys) they own.
+
+        Raises:
+            StrategyError: If any key is invalid or cannot be placed.
+        """
+        groups = {}
+        for index, key in enumerate(keys):
+            groups.setdefault(self.get_shard_for_key(key), []).append(index)
+        return groups
+
+    def get_state(self):
+        """
+        Return the routing state to persist in the metadata catalog.
+
+        Strategies whose routing is fully derived from config (or kept in
+        their own store) return None.
+
+        Returns:
+            dict: JSON-serializable routing state, or None.
+        """
+        return None
+
+    def load_state(self, state):
+        """
+        Restore routing state previously returned by get_state.
+
+        Args:
+            state (dict): Persisted routing state.
+
+        Returns:
+            list: Persisted shards that were not restored.
+        """
+        return []
+
     def validate_key(self, key):
         """
         Validate that the key is valid for sharding.
@@ -0,0 +1,665 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+import threading
+from shard_lite.utils.logger import Logger
+from shard_lite.exceptions.shard_exceptions import StrategyError
+
+
+def _mappings_from_json(data):
+    """
+    Read directory mappings from a JSON snapshot.
+
+    Snapshots are either an object (keys become strings) or, as written by
+    JournalDirectoryStore, a list of [key, shard_id] pairs that keeps key types.
+
+    Args:
+        data (dict or list): Parsed snapshot.
+
+    Returns:
+        dict: Key-to-shard mapping.
+    """
+    return dict(data) if isinstance(data, list) else data
+
+
+class BaseDirectoryStore(ABC):
+    """
+    Abstract persistence backend for DirectoryStrategy key-to-shard mappings.
+    """
+
+    def __init__(self, logger=None):
+        """
+        Initialize the store.
+
+        Args:
+            logger (Logger, optional): Logger instance for logging operations.
+        """
+        self.logger = logger or Logger()
+        self._defer_depth = 0
+        self._dirty = False
+
+    @abstractmethod
+    def get(self, key):
+        """
+        Look up the shard mapped to a key.
+
+        Args:
+            key: The key to look up.
+
+        Returns:
+            str or None: The shard ID, or None if the key is not mapped.
+        """
+        pass
+
+    @abstractmethod
+    def get_many(self, keys):
+        """
+        Look up several keys at once.
+
+        Args:
+            keys (iterable): Keys to look up.
+
+        Returns:
+            dict: Mapping of the found keys to shard IDs.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key, shard_id):
+        """
+        Add or update a single mapping.
+
+        Args:
+            key: The key to map.
+            shard_id (str): The shard ID.
+        """
+        pass
+
+    @abstractmethod
+    def set_many(self, items):
+        """
+        Add or update many mappings in one write.
+
+        Args:
+            items (iterable): (key, shard_id) pairs.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        """
+        Remove a mapping.
+
+        Args:
+            key: The key to remove.
+
+        Returns:
+            bool: True if the key was mapped.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, keys):
+        """
+        Remove many mappings in one write.
+
+        Args:
+            keys (iterable): Keys to remove.
+        """
+        pass
+
+    @abstractmethod
+    def keys_for_shard(self, shard_id):
+        """
+        List the keys mapped to a shard.
+
+        Args:
+            shard_id (str): The shard ID.
+
+        Returns:
+            list: Keys mapped to the shard.
+        """
+        pass
+
+    @abstractmethod
+    def has_shard(self, shard_id):
+        """
+        Check whether any key maps to a shard.
+
+        Args:
+            shard_id (str): The shard ID.
+
+        Returns:
+            bool: True if at least one key maps to the shard.
+        """
+        pass
+
+    @abstractmethod
+    def shard_counts(self):
+        """
+        Count the keys mapped to each shard.
+
+        Returns:
+            dict: Mapping of shard IDs to key counts.
+        """
+        pass
+
+    @abstractmethod
+    def to_dict(self):
+        """
+        Return every mapping as a dictionary.
+
+        Returns:
+            dict: Key-to-shard mapping.
+        """
+        pass
+
+    def load(self):
+        """Load mappings from persistent storage."""
+        pass
+
+    def save(self):
+        """Flush pending mappings to persistent storage."""
+        pass
+
+    def close(self):
+        """Release any resources held by the store."""
+        pass
+
+    @contextmanager
+    def deferred(self):
+        """
+        Defer persistence until the outermost deferred block exits.
+
+        Writes inside the block update the store immediately but are only
+        persisted once, on exit. Blocks may be nested.
+        """
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+            if self._defer_depth == 0 and self._dirty:
+                self._dirty = False
+                self.save()
+
+    def _persist(self):
+        """Persist now, or mark the store dirty while persistence is deferred."""
+        if self._defer_depth:
+            self._dirty = True
+        else:
+            self.save()
+
+
+class JsonDirectoryStore(BaseDirectoryStore):
+    """
+    Directory store kept in memory and persisted as a single JSON file.
+
+    A shard-to-keys reverse index is kept in step with every write, so shard
+    membership, counts and removal cost is proportional to the shard's own keys.
+
+    Attributes:
+        path (str): Path to the JSON file.
+        directory (dict): In-memory key-to-shard mapping (treat as read-only).
+        shard_keys (dict): Reverse index of shard IDs to their key sets.
+    """
+
+    def __init__(self, path, logger=None):
+        """
+        Initialize the JSON store.
+
+        Args:
+            path (str): Path to the JSON file.
+            logger (Logger, optional): Logger instance for logging operations.
+        """
+        super().__init__(logger)
+        self.path = path
+        self.directory = {}
+        self.shard_keys = {}
+        self.load()
+
+    def get(self, key):
+        """Look up a key in memory."""
+        return self.directory.get(key)
+
+    def get_many(self, keys):
+        """Look up several keys in memory."""
+        directory = self.directory
+        return {key: directory[key] for key in keys if key in directory}
+
+    def set(self, key, shard_id):
+        """Add or update a mapping and rewrite the file."""
+        self._index_set(key, shard_id)
+        self._persist()
+
+    def set_many(self, items):
+        """Add or update many mappings and rewrite the file once."""
+        for key, shard_id in items:
+            self._index_set(key, shard_id)
+        self._persist()
+
+    def delete(self, key):
+        """Remove a mapping and rewrite the file."""
+        if not self._index_delete(key):
+            return False
+        self._persist()
+        return True
+
+    def delete_many(self, keys):
+        """Remove many mappings and rewrite the file once."""
+        for key in keys:
+            self._index_delete(key)
+        self._persist()
+
+    def keys_for_shard(self, shard_id):
+        """List a shard's keys from the reverse index."""
+        return list(self.shard_keys.get(shard_id, ()))
+
+    def has_shard(self, shard_id):
+        """Check the reverse index for any key mapped to a shard."""
+        return shard_id in self.shard_keys
+
+    def shard_counts(self):
+        """Return per-shard key counts from the reverse index."""
+        return {shard_id: len(keys) for shard_id, keys in self.shard_keys.items()}
+
+    def to_dict(self):
+        """Return the live in-memory directory."""
+        return self.directory
+
+    def load(self):
+        """Load the whole directory from the JSON file, if it exists."""
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                self.directory = _mappings_from_json(json.load(file))
+        self.shard_keys = {}
+        for key, shard_id in self.directory.items():
+            self.shard_keys.setdefault(shard_id, set()).add(key)
+
+    def save(self):
+        """
+        Rewrite the JSON file with the current directory.
+
+        The file is written to a temporary sibling, fsynced and renamed over
+        the original, so readers never see a partially written directory.
+        """
+        self._write_snapshot(self.directory)
+
+    def _write_snapshot(self, data):
+        """
+        Atomically replace the JSON file with data.
+
+        Args:
+            data (dict or list): JSON-serializable snapshot.
+        """
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+    def _index_set(self, key, shard_id):
+        """Map a key in memory, moving it between reverse-index buckets."""
+        previous = self.directory.get(key)
+        if previous == shard_id:
+            return
+        if previous is not None:
+            self._unindex(key, previous)
+        self.directory[key] = shard_id
+        self.shard_keys.setdefault(shard_id, set()).add(key)
+
+    def _index_delete(self, key):
+        """Unmap a key in memory; return True if it was mapped."""
+        shard_id = self.directory.pop(key, None)
+        if shard_id is None:
+            return False
+        self._unindex(key, shard_id)
+        return True
+
+    def _unindex(self, key, shard_id):
+        """Drop a key from its shard's bucket, removing empty buckets."""
+        keys = self.shard_keys.get(shard_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.shard_keys[shard_id]
+
+
+class JournalDirectoryStore(JsonDirectoryStore):
+    """
+    Directory store that appends every change to a JSON-lines journal.
+
+    Each mapping change writes one record to the journal instead of rewriting
+    the whole directory. The journal is fsynced in groups of
+    ``fsync_interval`` records and compacted into the JSON snapshot once it
+    holds ``compact_threshold`` records. Loading reads the snapshot and
+    replays the journal on top of it.
+
+    Attributes:
+        journal_path (str): Path to the journal file.
+        fsync_interval (int): Records appended between fsyncs.
+        compact_threshold (int): Journal records that trigger a compaction.
+    """
+
+    def __init__(self, path, logger=None, journal_path=None, fsync_interval=64, compact_threshold=10000):
+        """
+        Initialize the journal store and replay any existing journal.
+
+        Args:
+            path (str): Path to the JSON snapshot.
+            logger (Logger, optional): Logger instance for logging operations.
+            journal_path (str, optional): Path to the journal; defaults to the snapshot path plus ".journal".
+            fsync_interval (int): Records appended between fsyncs; 1 fsyncs every write.
+            compact_threshold (int): Journal records that trigger a compaction.
+        """
+        self.journal_path = journal_path or f"{path}.journal"
+        self.fsync_interval = max(1, fsync_interval)
+        self.compact_threshold = compact_threshold
+        self.journal_lock = threading.RLock()
+        self._journal = None
+        self._journal_records = 0
+        self._unsynced = 0
+        super().__init__(path, logger)
+
+    def set(self, key, shard_id):
+        """Add or update a mapping and journal it."""
+        self._index_set(key, shard_id)
+        self._append([["set", key, shard_id]])
+
+    def set_many(self, items):
+        """Add or update many mappings and journal them in one write."""
+        records = []
+        for key, shard_id in items:
+            self._index_set(key, shard_id)
+            records.append(["set", key, shard_id])
+        self._append(records)
+
+    def delete(self, key):
+        """Remove a mapping and journal it."""
+        if not self._index_delete(key):
+            return False
+        self._append([["del", key]])
+        return True
+
+    def delete_many(self, keys):
+        """Remove many mappings and journal them in one write."""
+        records = [["del", key] for key in keys if self._index_delete(key)]
+        self._append(records)
+
+    def load(self):
+        """
+        Load the snapshot, then replay the journal on top of it.
+
+        A torn record at the end of the journal, left by a crash mid-write,
+        is dropped and the journal is truncated to its last whole record.
+        Only the final line can be torn, either unterminated or unparsable;
+        a bad record before it means the journal is corrupt.
+
+        Raises:
+            StrategyError: If a record before the final line cannot be parsed.
+        """
+        with self.journal_lock:
+            self._close_journal()
+            super().load()
+            self._journal_records = 0
+            valid_length = 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "rb") as file:
+                    lines = file.readlines()
+                for number, line in enumerate(lines, 1):
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("Record is not newline-terminated")
+                        record = json.loads(line)
+                    except ValueError as e:
+                        if number < len(lines):
+                            raise StrategyError("Directory journal is corrupt", context={
+                                "path": self.journal_path, "line": number, "error": str(e)
+                            })
+                        self.logger.warning("Dropping torn journal record", path=self.journal_path)
+                        break
+                    if record[0] == "set":
+                        self._index_set(record[1], record[2])
+                    else:
+                        self._index_delete(record[1])
+                    valid_length += len(line)
+                    self._journal_records += 1
+                if valid_length != os.path.getsize(self.journal_path):
+                    os.truncate(self.journal_path, valid_length)
+            self._journal = open(self.journal_path, "a")
+            self._unsynced = 0
+
+    def save(self):
+        """Flush and fsync the journal, making every appended record durable."""
+        with self.journal_lock:
+            if self._journal is None:
+                return
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._unsynced = 0
+
+    def compact(self):
+        """
+        Fold the journal into a fresh snapshot and truncate it.
+
+        The snapshot is replaced atomically before the journal is emptied, so
+        a crash in between only replays records the snapshot already holds.
+        It is written as [key, shard_id] pairs, so integer keys keep their
+        type exactly as they do through journal replay.
+        """
+        with self.journal_lock:
+            self._write_snapshot([[key, shard_id] for key, shard_id in self.directory.items()])
+            self._journal.close()
+            self._journal = open(self.journal_path, "w")
+            os.fsync(self._journal.fileno())
+            self.logger.info("Compacted directory journal", path=self.journal_path, records=self._journal_records)
+            self._journal_records = 0
+            self._unsynced = 0
+
+    def close(self):
+        """Fsync and close the journal."""
+        with self.journal_lock:
+            self.save()
+            self._close_journal()
+
+    def _append(self, records):
+        """
+        Append records to the journal, fsyncing or compacting when due.
+
+        Args:
+            records (list): Journal records to append.
+        """
+        if not records:
+            return
+        with self.journal_lock:
+            self._journal.write("".join(json.dumps(record) + "\n" for record in records))
+            self._journal.flush()
+            self._journal_records += len(records)
+            self._unsynced += len(records)
+            if self._journal_records >= self.compact_threshold:
+                self.compact()
+            elif self._unsynced >= self.fsync_interval:
+                self._persist()
+
+    def _close_journal(self):
+        """Close the journal file handle, if open."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+class SQLiteDirectoryStore(BaseDirectoryStore):
+    """
+    Directory store backed by an indexed SQLite database in WAL mode.
+
+    Mappings are upserted per key, looked up lazily by primary key, and
+    batched writes run in a single transaction, so neither startup nor a
+    mapping change touches the whole directory. Inside ``deferred()`` all
+    writes share one transaction that is committed on exit.
+
+    Attributes:
+        path (str): Path to the SQLite database file.
+    """
+
+    # Keep IN lists well under SQLite's bound-parameter limit.
+    LOOKUP_CHUNK_SIZE = 500
+
+    def __init__(self, path, logger=None):
+        """
+        Initialize the SQLite store, creating the schema if needed.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            logger (Logger, optional): Logger instance for logging operations.
+        """
+        super().__init__(logger)
+        self.path = path
+        self.lock = threading.RLock()
+        directory_name = os.path.dirname(path)
+        if directory_name:
+            os.makedirs(directory_name, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # The key column has no declared type so integer and string keys keep their type.
+        self.connection.execute("CREATE TABLE IF NOT EXISTS directory (key PRIMARY KEY, shard_id TEXT NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS directory_shard_idx ON directory (shard_id)")
+        self.connection.commit()
+
+    def get(self, key):
+        """Look up a key by primary key."""
+        with self.lock:
+            row = self.connection.execute("SELECT shard_id FROM directory WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, keys):
+        """Look up several keys with chunked IN queries."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self.lock:
+            for i in range(0, len(keys), self.LOOKUP_CHUNK_SIZE):
+                chunk = keys[i:i + self.LOOKUP_CHUNK_SIZE]
+                placeholders = ", ".join(["?"] * len(chunk))
+                found.update(self.connection.execute(
+                    f"SELECT key, shard_id FROM directory WHERE key IN ({placeholders})", chunk
+                ))
+        return found
+
+    def set(self, key, shard_id):
+        """Upsert a single mapping."""
+        self.set_many([(key, shard_id)])
+
+    def set_many(self, items):
+        """Upsert many mappings in one transaction."""
+        self._write(
+            "INSERT INTO directory (key, shard_id) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET shard_id = excluded.shard_id",
+            items
+        )
+
+    def delete(self, key):
+        """Delete a single mapping."""
+        cursor = self._write("DELETE FROM directory WHERE key = ?", [(key,)])
+        return cursor.rowcount > 0
+
+    def delete_many(self, keys):
+        """Delete many mappings in one transaction."""
+        self._write("DELETE FROM directory WHERE key = ?", ((key,) for key in keys))
+
+    def keys_for_shard(self, shard_id):
+        """List a shard's keys through the shard_id index."""
+        with self.lock:
+            rows = self.connection.execute("SELECT key FROM directory WHERE shard_id = ?", (shard_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def has_shard(self, shard_id):
+        """Probe the shard_id index for any key mapped to a shard."""
+        with self.lock:
+            row = self.connection.execute("SELECT 1 FROM directory WHERE shard_id = ? LIMIT 1", (shard_id,)).fetchone()
+        return row is not None
+
+    def shard_counts(self):
+        """Count keys per shard through the shard_id index."""
+        with self.lock:
+            return dict(self.connection.execute("SELECT shard_id, COUNT(*) FROM directory GROUP BY shard_id"))
+
+    def to_dict(self):
+        """Read every mapping into a dictionary."""
+        with self.lock:
+            return dict(self.connection.execute("SELECT key, shard_id FROM directory"))
+
+    def count(self):
+        """
+        Return the number of mappings.
+
+        Returns:
+            int: Number of mapped keys.
+        """
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM directory").fetchone()[0]
+
+    def import_json(self, json_path):
+        """
+        Import mappings from a JSON directory file in one transaction.
+
+        Args:
+            json_path (str): Path to a snapshot written by JsonDirectoryStore or JournalDirectoryStore.
+
+        Returns:
+            int: Number of mappings imported.
+        """
+        with open(json_path, "r") as file:
+            mappings = _mappings_from_json(json.load(file))
+        self.set_many(mappings.items())
+        self.logger.info("Imported directory from JSON", path=json_path, mappings=len(mappings))
+        return len(mappings)
+
+    def save(self):
+        """Commit any writes made while persistence was deferred."""
+        with self.lock:
+            self.connection.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self.connection.close()
+
+    def _write(self, statement, rows):
+        """
+        Run a write statement for many rows inside one transaction.
+
+        Each write runs under its own savepoint, so a failed write is undone
+        without discarding earlier writes still pending in a ``deferred()``
+        block.
+
+        Args:
+            statement (str): SQL statement.
+            rows (iterable): Parameter tuples.
+
+        Returns:
+            sqlite3.Cursor: The executed cursor.
+
+        Raises:
+            StrategyError: If the write fails; only this write is rolled back.
+        """
+        with self.lock:
+            try:
+                if not self.connection.in_transaction:
+                    self.connection.execute("BEGIN")
+                self.connection.execute("SAVEPOINT directory_write")
+                try:
+                    cursor = self.connection.executemany(statement, rows)
+                except sqlite3.Error:
+                    self.connection.execute("ROLLBACK TO directory_write")
+                    raise
+                finally:
+                    self.connection.execute("RELEASE directory_write")
+            except sqlite3.Error as e:
+                if not self._defer_depth:
+                    self.connection.rollback()
+                raise StrategyError("Directory store write failed", context={"path": self.path, "error": str(e)})
+            self._persist()
+            return cursor
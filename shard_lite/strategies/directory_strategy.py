@@ -1,32 +1,92 @@
 from shard_lite.strategies.base_strategy import BaseStrategy
+from shard_lite.strategies.directory_store import JsonDirectoryStore, JournalDirectoryStore, SQLiteDirectoryStore
 from shard_lite.exceptions.shard_exceptions import StrategyError
 from collections import OrderedDict
-import json
+from contextlib import contextmanager
 import os
 
 class DirectoryStrategy(BaseStrategy):
     """
     Directory-based sharding strategy for explicitly mapping keys to shards.
 
+    The mappings live in a pluggable store selected by the ``directory_backend``
+    config key: ``"json"`` (default, whole-file JSON at ``directory_path``),
+    ``"journal"`` (JSON snapshot plus an append-only journal) or ``"sqlite"``
+    (indexed WAL database at ``directory_db_path``).
+
     Attributes:
-        directory (dict): Key-to-shard mapping.
+        store (BaseDirectoryStore): Persistence backend for the mappings.
         cache (OrderedDict): LRU cache for frequently accessed mappings.
     """
 
-    def __init__(self, config, directory=None, cache_size=100):
+    STORE_TYPES = {
+        'json': JsonDirectoryStore,
+        'journal': JournalDirectoryStore,
+        'sqlite': SQLiteDirectoryStore
+    }
+
+    def __init__(self, config, directory=None, cache_size=100, store=None):
         """
         Initialize the DirectoryStrategy.
 
         Args:
             config (Config): Configuration instance for the strategy.
-            directory (dict, optional): Initial key-to-shard mapping.
+            directory (dict, optional): Initial key-to-shard mapping, used when the store is empty.
             cache_size (int): Maximum size of the LRU cache.
+            store (BaseDirectoryStore, optional): Persistence backend; built from config if omitted.
         """
         super().__init__(config)
-        self.directory = directory or {}
         self.cache = OrderedDict()
         self.cache_size = cache_size
-        self._load_directory()
+        self.store = store or self._create_store()
+        if directory and not self.store.to_dict():
+            self.store.set_many(directory.items())
+
+    @property
+    def directory(self):
+        """
+        Key-to-shard mapping as a dictionary.
+
+        Returns:
+            dict: The live directory for in-memory stores, a snapshot otherwise.
+        """
+        return self.store.to_dict()
+
+    def _create_store(self):
+        """
+        Build the directory store configured by ``directory_backend``.
+
+        The journal backend uses ``directory_path`` as its snapshot and
+        replays the journal beside it. A new SQLite store is seeded from the
+        JSON directory at ``directory_path`` when that file exists.
+
+        Returns:
+            BaseDirectoryStore: The directory store.
+
+        Raises:
+            StrategyError: If the backend is unknown.
+        """
+        backend = self.config.get("directory_backend", "json")
+        store_class = self.STORE_TYPES.get(backend)
+        if not store_class:
+            raise StrategyError("Unknown directory backend", context={"backend": backend})
+        json_path = self.config.get("directory_path", "./directory.json")
+        if store_class is JsonDirectoryStore:
+            return JsonDirectoryStore(json_path, self.logger)
+        if store_class is JournalDirectoryStore:
+            return JournalDirectoryStore(
+                json_path,
+                self.logger,
+                journal_path=self.config.get("directory_journal_path"),
+                fsync_interval=self.config.get("journal_fsync_interval", 64),
+                compact_threshold=self.config.get("journal_compact_threshold", 10000)
+            )
+
+        db_path = self.config.get("directory_db_path", os.path.splitext(json_path)[0] + ".db")
+        store = SQLiteDirectoryStore(db_path, self.logger)
+        if os.path.exists(json_path) and not store.count():
+            store.import_json(json_path)
+        return store
 
     def get_shard_for_key(self, key):
         """
@@ -45,12 +105,39 @@ class DirectoryStrategy(BaseStrategy):
         if key in self.cache:
             self.cache.move_to_end(key)
             return self.cache[key]
-        if key in self.directory:
-            shard_id = self.directory[key]
+        shard_id = self.store.get(key)
+        if shard_id is not None:
             self._update_cache(key, shard_id)
             return shard_id
         raise StrategyError("Key not found in directory", context={"key": key})
 
+    def get_shards_for_keys(self, keys):
+        """
+        Look up many keys at once, grouping them by mapped shard.
+
+        Bulk lookups go straight to the directory and leave the LRU cache
+        untouched so a large load does not evict the hot working set.
+
+        Args:
+            keys (Sequence): Keys to locate.
+
+        Returns:
+            dict: Mapping of shard IDs to the positions (indexes into keys) they own.
+
+        Raises:
+            StrategyError: If any key is invalid or not found in the directory.
+        """
+        for key in keys:
+            self.validate_key(key)
+        found = self.store.get_many(keys)
+        groups = {}
+        for position, key in enumerate(keys):
+            shard_id = found.get(key)
+            if shard_id is None:
+                raise StrategyError("Key not found in directory", context={"key": key})
+            groups.setdefault(shard_id, []).append(position)
+        return groups
+
     def get_shards_for_query(self, criteria):
         """
         Find all shards for a query.
@@ -87,7 +174,7 @@ class DirectoryStrategy(BaseStrategy):
         Args:
             shard_id (str): Unique identifier for the shard.
         """
-        if shard_id in self.directory.values():
+        if self.store.has_shard(shard_id):
             raise StrategyError("Shard already exists in directory", context={"shard_id": shard_id})
         self._log_strategy_operation("Added shard to directory", shard_id=shard_id)
 
@@ -98,9 +185,10 @@ class DirectoryStrategy(BaseStrategy):
         Args:
             shard_id (str): Unique identifier for the shard.
         """
-        keys_to_remove = [key for key, shard in self.directory.items() if shard == shard_id]
+        keys_to_remove = self.store.keys_for_shard(shard_id)
+        self.store.delete_many(keys_to_remove)
         for key in keys_to_remove:
-            self.remove_mapping(key)
+            self.cache.pop(key, None)
         self._log_strategy_operation("Removed shard from directory", shard_id=shard_id)
 
     def add_mapping(self, key, shard_id):
@@ -112,9 +200,8 @@ class DirectoryStrategy(BaseStrategy):
             shard_id (str): The shard ID to map the key to.
         """
         self.validate_key(key)
-        self.directory[key] = shard_id
+        self.store.set(key, shard_id)
         self._update_cache(key, shard_id)
-        self._save_directory()
 
     def remove_mapping(self, key):
         """
@@ -123,10 +210,55 @@ class DirectoryStrategy(BaseStrategy):
         Args:
             key: The key to remove.
         """
-        if key in self.directory:
-            del self.directory[key]
+        if self.store.delete(key):
             self.cache.pop(key, None)
-            self._save_directory()
+
+    def add_mappings(self, mappings):
+        """
+        Add or update many key-to-shard mappings with a single persist.
+
+        All keys are validated before anything is written. Cached entries
+        for the keys are refreshed so the LRU cache never serves stale shards.
+
+        Args:
+            mappings (dict or iterable): Mapping, or iterable of (key, shard_id) pairs.
+        """
+        items = list(mappings.items() if isinstance(mappings, dict) else mappings)
+        for key, _ in items:
+            self.validate_key(key)
+        self.store.set_many(items)
+        for key, shard_id in items:
+            if key in self.cache:
+                self.cache[key] = shard_id
+        self._log_strategy_operation("Added mappings", count=len(items))
+
+    def remove_mappings(self, keys):
+        """
+        Remove many key-to-shard mappings with a single persist.
+
+        Args:
+            keys (iterable): Keys to remove.
+        """
+        keys = list(keys)
+        self.store.delete_many(keys)
+        for key in keys:
+            self.cache.pop(key, None)
+        self._log_strategy_operation("Removed mappings", count=len(keys))
+
+    @contextmanager
+    def deferred_persistence(self):
+        """
+        Defer directory persistence across many mapping calls.
+
+        Mapping changes made inside the block take effect immediately but are
+        written to storage once, when the outermost block exits::
+
+            with strategy.deferred_persistence():
+                for key, shard_id in feed:
+                    strategy.add_mapping(key, shard_id)
+        """
+        with self.store.deferred():
+            yield self
 
     def get_mappings_for_shard(self, shard_id):
         """
@@ -138,7 +270,36 @@ class DirectoryStrategy(BaseStrategy):
         Returns:
             list: List of keys mapped to the shard.
         """
-        return [key for key, shard in self.directory.items() if shard == shard_id]
+        return self.store.keys_for_shard(shard_id)
+
+    def get_shard_key_counts(self):
+        """
+        Get the number of keys mapped to each shard.
+
+        Returns:
+            dict: Mapping of shard IDs to key counts.
+        """
+        return self.store.shard_counts()
+
+    def get_load_report(self):
+        """
+        Summarize how evenly keys are spread across shards.
+
+        Returns:
+            dict: Per-shard counts, total keys, mean keys per shard, the
+            busiest shard and its skew (busiest count / mean).
+        """
+        counts = self.get_shard_key_counts()
+        total = sum(counts.values())
+        mean = total / len(counts) if counts else 0
+        busiest = max(counts, key=counts.get) if counts else None
+        return {
+            "counts": counts,
+            "total": total,
+            "mean": mean,
+            "busiest_shard": busiest,
+            "skew": counts[busiest] / mean if busiest is not None and mean else 0,
+        }
 
     def _update_cache(self, key, shard_id):
         """
@@ -157,18 +318,14 @@ class DirectoryStrategy(BaseStrategy):
         """
         Load the directory from persistent storage.
         """
-        directory_path = self.config.get("directory_path", "./directory.json")
-        if os.path.exists(directory_path):
-            with open(directory_path, "r") as file:
-                self.directory = json.load(file)
+        self.store.load()
+        self.cache.clear()
 
     def _save_directory(self):
         """
         Save the directory to persistent storage.
         """
-        directory_path = self.config.get("directory_path", "./directory.json")
-        with open(directory_path, "w") as file:
-            json.dump(self.directory, file)
+        self.store.save()
 
     def import_mappings(self, mappings_dict):
         """
@@ -177,6 +334,5 @@ class DirectoryStrategy(BaseStrategy):
         Args:
             mappings_dict (dict): Dictionary of key-to-shard mappings.
         """
-        self.directory.update(mappings_dict)
+        self.store.set_many(mappings_dict.items())
         self.cache.clear()
-        self._save_directory()
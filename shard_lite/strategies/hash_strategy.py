@@ -1,7 +1,13 @@
 import hashlib
+from bisect import bisect_left
 from shard_lite.strategies.base_strategy import BaseStrategy
 from shard_lite.exceptions.shard_exceptions import StrategyError
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; bulk routing falls back to bisect.
+    np = None
+
 class HashStrategy(BaseStrategy):
     """
     Hash-based sharding strategy for distributing data across shards.
@@ -9,6 +15,8 @@ class HashStrategy(BaseStrategy):
     Attributes:
         hash_function (callable): Hash function to use (default: MD5).
         hash_ring (dict): Mapping of hash values to shard IDs.
+        ring_tokens (list): Sorted hash values of the ring, kept in step with hash_ring.
+        ring_shards (list): Shard IDs aligned with ring_tokens.
     """
 
     def __init__(self, config, hash_function=None):
@@ -20,15 +28,80 @@ class HashStrategy(BaseStrategy):
             hash_function (callable, optional): Custom hash function (default: MD5).
         """
         super().__init__(config)
+        self._default_hash = hash_function is None
         self.hash_function = hash_function or (lambda key: hashlib.md5(str(key).encode()).hexdigest())
         self.hash_ring = {}
+        self.ring_tokens = []
+        self.ring_shards = []
+        self._shards = []
+        self._created = []
+        self._virtual_nodes = 1
+        self._ring_arrays = None
         self._initialize_hash_ring()
 
     def _initialize_hash_ring(self):
         """Initialize the hash ring with active shards."""
-        for shard_id in self.get_all_shards():
+        for shard_id in self.config.get("active_shards", []):
             self.add_shard(shard_id)
 
+    def _insert_token(self, token, shard_id):
+        """
+        Place a token on the ring, keeping the sorted token array in step.
+
+        Args:
+            token (int): Hash value of the ring position.
+            shard_id (str): Shard owning the position.
+        """
+        index = bisect_left(self.ring_tokens, token)
+        if index < len(self.ring_tokens) and self.ring_tokens[index] == token:
+            self.ring_shards[index] = shard_id
+        else:
+            self.ring_tokens.insert(index, token)
+            self.ring_shards.insert(index, shard_id)
+        self.hash_ring[token] = shard_id
+        self._ring_arrays = None
+
+    def _remove_token(self, token, shard_id):
+        """
+        Drop a shard's token from the ring and the sorted token array.
+
+        Args:
+            token (int): Hash value of the ring position.
+            shard_id (str): Shard expected to own the position.
+        """
+        index = bisect_left(self.ring_tokens, token)
+        if index < len(self.ring_tokens) and self.ring_tokens[index] == token and self.ring_shards[index] == shard_id:
+            del self.ring_tokens[index]
+            del self.ring_shards[index]
+            del self.hash_ring[token]
+            self._ring_arrays = None
+
+    def _rebuild_ring(self, ring):
+        """
+        Replace the whole ring in one pass.
+
+        Args:
+            ring (dict): Mapping of hash values to shard IDs.
+        """
+        self.hash_ring = dict(ring)
+        self.ring_tokens = sorted(self.hash_ring)
+        self.ring_shards = [self.hash_ring[token] for token in self.ring_tokens]
+        self._ring_arrays = None
+
+    def _shard_tokens(self, shard_id):
+        """
+        Compute the ring positions owned by a shard.
+
+        Args:
+            shard_id (str): Unique identifier for the shard.
+
+        Returns:
+            list: Hash values for the shard's (virtual) nodes.
+        """
+        if self._virtual_nodes == 1:
+            return [self._hash_key(shard_id)]
+        return [self._hash_key(f"{shard_id}:{i}") for i in range(self._virtual_nodes)]
+
     def _hash_key(self, key):
         """
         Apply the hash function to a key.
@@ -58,12 +131,16 @@ class HashStrategy(BaseStrategy):
 
         Returns:
             str: Shard ID.
+
+        Raises:
+            StrategyError: If the hash ring is empty.
         """
-        sorted_shards = sorted(self.hash_ring.keys())
-        for shard_hash in sorted_shards:
-            if hash_value <= shard_hash:
-                return self.hash_ring[shard_hash]
-        return self.hash_ring[sorted_shards[0]]  # Wrap around to the first shard
+        if not self.ring_tokens:
+            raise StrategyError("Hash ring is empty", context={"hash_value": hash_value})
+        index = bisect_left(self.ring_tokens, hash_value)
+        if index == len(self.ring_tokens):
+            index = 0  # Wrap around to the first shard
+        return self.ring_shards[index]
 
     def get_shard_for_key(self, key):
         """
@@ -78,18 +155,126 @@ class HashStrategy(BaseStrategy):
         hash_value = self._hash_key(key)
         return self._get_shard_id_from_hash(hash_value)
 
+    def get_shards_for_keys(self, keys):
+        """
+        Route many keys at once, grouping them by owning shard.
+
+        With the default MD5 hash the digests are used directly instead of
+        round-tripping through hex, and ring positions are found with NumPy
+        searchsorted when it is installed.
+
+        Args:
+            keys (Sequence): Keys to locate.
+
+        Returns:
+            dict: Mapping of shard IDs to the positions (indexes into keys) they own.
+
+        Raises:
+            StrategyError: If any key is invalid or the ring is empty.
+        """
+        if not self.ring_tokens:
+            raise StrategyError("Hash ring is empty", context={"keys": len(keys)})
+        for key in keys:
+            self.validate_key(key)
+
+        if self._default_hash:
+            digests = [hashlib.md5(str(key).encode()).digest() for key in keys]
+            if np is not None and digests:
+                return self._route_digests(digests)
+            hash_values = [int.from_bytes(digest, "big") for digest in digests]
+        else:
+            hash_values = [self._hash_key(key) for key in keys]
+
+        tokens = self.ring_tokens
+        shards = self.ring_shards
+        wrap = len(tokens)
+        groups = {}
+        for position, hash_value in enumerate(hash_values):
+            index = bisect_left(tokens, hash_value)
+            groups.setdefault(shards[index if index < wrap else 0], []).append(position)
+        return groups
+
+    def _route_digests(self, digests):
+        """
+        Vectorized ring lookup for MD5 digests.
+
+        Tokens are compared on their high 64 bits; the rare keys whose high
+        bits collide with a token are resolved exactly with bisect.
+
+        Args:
+            digests (list): Raw 16-byte MD5 digests, one per key.
+
+        Returns:
+            dict: Mapping of shard IDs to key positions.
+        """
+        token_high, token_owner, owner_ids = self._get_ring_arrays()
+        key_high = np.frombuffer(b"".join(digests), dtype=">u8")[::2].astype(np.uint64)
+        index = np.searchsorted(token_high, key_high, side="left")
+        collisions = np.nonzero(index != np.searchsorted(token_high, key_high, side="right"))[0]
+        for position in collisions.tolist():
+            index[position] = bisect_left(self.ring_tokens, int.from_bytes(digests[position], "big"))
+        index[index == len(token_high)] = 0  # Wrap around to the first token
+
+        owners = token_owner[index]
+        order = np.argsort(owners, kind="stable")
+        counts = np.bincount(owners, minlength=len(owner_ids))
+        groups = {}
+        for owner, chunk in zip(owner_ids, np.split(order, np.cumsum(counts)[:-1])):
+            if len(chunk):
+                groups[owner] = chunk.tolist()
+        return groups
+
+    def _get_ring_arrays(self):
+        """
+        Build (or reuse) NumPy views of the ring for bulk routing.
+
+        Returns:
+            tuple: High 64 bits of each token, owner ordinal per token, and the
+            shard IDs indexed by ordinal.
+        """
+        if self._ring_arrays is None:
+            owner_ids = list(dict.fromkeys(self.ring_shards))
+            ordinals = {shard_id: i for i, shard_id in enumerate(owner_ids)}
+            token_high = np.array([token >> 64 for token in self.ring_tokens], dtype=np.uint64)
+            token_owner = np.array([ordinals[shard_id] for shard_id in self.ring_shards], dtype=np.intp)
+            self._ring_arrays = (token_high, token_owner, owner_ids)
+        return self._ring_arrays
+
+    def get_all_shards(self):
+        """
+        Return the shards currently on the hash ring.
+
+        Returns:
+            list: List of active shard IDs.
+        """
+        return list(self._shards)
+
     def get_shards_for_query(self, criteria):
         """
         Find all shards needed for a query.
 
+        Equality (``{"id": 42}``) and IN-list (``{"id": [1, 2, 3]}``) predicates
+        on the sharding key (``shard_key`` config, default ``"id"``) are routed
+        to the owning shard(s) only; any other criteria fan out to every shard,
+        as do key values that cannot be routed (e.g. ``None``, ``0`` or floats).
+
         Args:
             criteria: Query criteria to determine relevant shards.
 
         Returns:
             list: List of shard IDs.
         """
-        # For simplicity, assume all shards are needed for complex queries.
-        return self.get_all_shards()
+        shard_key = self.config.get("shard_key", "id")
+        if not isinstance(criteria, dict) or shard_key not in criteria:
+            return self.get_all_shards()
+        value = criteria[shard_key]
+        try:
+            if isinstance(value, (list, tuple, set, frozenset)):
+                return list(self.get_shards_for_keys(list(value)))
+            return [self.get_shard_for_key(value)]
+        except StrategyError:
+            # Pruning is only an optimization; let the query itself decide what matches.
+            return self.get_all_shards()
 
     def create_shard(self, shard_id):
         """
@@ -100,6 +285,8 @@ class HashStrategy(BaseStrategy):
         """
         # Placeholder for actual shard creation logic.
         self.add_shard(shard_id)
+        if shard_id not in self._created:
+            self._created.append(shard_id)
 
     def add_shard(self, shard_id):
         """
@@ -108,8 +295,10 @@ class HashStrategy(BaseStrategy):
         Args:
             shard_id (str): Unique identifier for the shard.
         """
-        shard_hash = self._hash_key(shard_id)
-        self.hash_ring[shard_hash] = shard_id
+        for token in self._shard_tokens(shard_id):
+            self._insert_token(token, shard_id)
+        if shard_id not in self._shards:
+            self._shards.append(shard_id)
         self._log_strategy_operation("Added shard to hash ring", shard_id=shard_id)
 
     def remove_shard(self, shard_id):
@@ -119,32 +308,70 @@ class HashStrategy(BaseStrategy):
         Args:
             shard_id (str): Unique identifier for the shard.
         """
-        shard_hash = self._hash_key(shard_id)
-        if shard_hash in self.hash_ring:
-            del self.hash_ring[shard_hash]
-            self._log_strategy_operation("Removed shard from hash ring", shard_id=shard_id)
+        if shard_id not in self._shards:
+            return
+        self._shards.remove(shard_id)
+        if shard_id in self._created:
+            self._created.remove(shard_id)
+        for token in self._shard_tokens(shard_id):
+            self._remove_token(token, shard_id)
+        self._log_strategy_operation("Removed shard from hash ring", shard_id=shard_id)
+
+    def get_state(self):
+        """
+        Return the ring's shards, virtual node count, tokens and the shards created at runtime.
+
+        Returns:
+            dict: JSON-serializable ring state.
+        """
+        return {
+            "shards": list(self._shards),
+            "virtual_nodes": self._virtual_nodes,
+            "tokens": [[token, shard_id] for token, shard_id in zip(self.ring_tokens, self.ring_shards)],
+            "created": list(self._created),
+        }
+
+    def load_state(self, state):
+        """
+        Rebuild the ring from persisted state.
+
+        Only shards that are still in ``active_shards`` or were created at
+        runtime are restored; other persisted shards are dropped from the
+        ring with a warning. Configured shards missing from the state are
+        added back afterwards.
+
+        Args:
+            state (dict): Ring state from get_state.
+
+        Returns:
+            list: Persisted shards that were dropped.
+        """
+        configured = list(self._shards)
+        self._created = [shard_id for shard_id in state.get("created", []) if shard_id in state["shards"]]
+        known = set(configured) | set(self._created)
+        dropped = [shard_id for shard_id in state["shards"] if shard_id not in known]
+        if dropped:
+            self.logger.warning("Dropping persisted shards that are no longer configured", shards=dropped)
+        self._shards = [shard_id for shard_id in state["shards"] if shard_id in known]
+        self._virtual_nodes = state.get("virtual_nodes", self._virtual_nodes)
+        self._rebuild_ring({token: shard_id for token, shard_id in state["tokens"] if shard_id in known})
+        for shard_id in configured:
+            if shard_id not in self._shards:
+                self.add_shard(shard_id)
+        return dropped
 
     def rebalance_shards(self):
         """
         Redistribute data for even distribution across shards.
         """
-        old_ring = dict(self.hash_ring)
-        self.hash_ring.clear()
-        
-        # Calculate target distribution
-        total_shards = len(self.get_all_shards())
-        target_per_shard = (1 << 160) // total_shards  # Using 160-bit hash space
-        
         # Redistribute hash ranges
+        self._virtual_nodes = self.config.get("virtual_nodes", 100)
+        ring = {}
         for shard_id in self.get_all_shards():
-            for i in range(self.config.get("virtual_nodes", 100)):
-                hash_key = f"{shard_id}:{i}"
-                hash_value = self._hash_key(hash_key)
-                self.hash_ring[hash_value] = shard_id
-        
+            for token in self._shard_tokens(shard_id):
+                ring[token] = shard_id
+        self._rebuild_ring(ring)
+
         # Log changes in distribution
-        changes = {
-            shard: len([k for k, v in self.hash_ring.items() if v == shard])
-            for shard in self.get_all_shards()
-        }
+        changes = {shard: self.ring_shards.count(shard) for shard in self.get_all_shards()}
         self._log_strategy_operation("Rebalanced shards", distribution=changes)
@@ -1,12 +1,28 @@
+from bisect import bisect_left, bisect_right
+from numbers import Real
 from shard_lite.strategies.base_strategy import BaseStrategy
 from shard_lite.exceptions.shard_exceptions import StrategyError
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; bulk routing falls back to bisect.
+    np = None
+
+
+def _all_numeric(values):
+    """Return True if every value is a plain real number."""
+    return all(isinstance(value, Real) and not isinstance(value, bool) for value in values)
+
+
 class RangeStrategy(BaseStrategy):
     """
     Range-based sharding strategy for distributing data across shards.
 
     Attributes:
         ranges (dict): Mapping of ranges to shard IDs.
+        range_starts (list): Sorted range start boundaries, rebuilt whenever ranges change.
+        range_ends (list): Range end boundaries aligned with range_starts.
+        range_shards (list): Shard IDs aligned with range_starts.
     """
 
     def __init__(self, config, ranges=None):
@@ -20,6 +36,7 @@ class RangeStrategy(BaseStrategy):
         super().__init__(config)
         self.ranges = ranges or {}
         self._validate_ranges()
+        self._rebuild_index()
 
     def _validate_ranges(self):
         """
@@ -33,6 +50,18 @@ class RangeStrategy(BaseStrategy):
             if sorted_ranges[i][1] > sorted_ranges[i + 1][0]:
                 raise StrategyError("Overlapping ranges detected", context={"ranges": self.ranges})
 
+    def _rebuild_index(self):
+        """
+        Rebuild the sorted boundary arrays used for binary-search lookups.
+
+        Ranges never overlap, so sorting by start also sorts the ends.
+        """
+        sorted_ranges = sorted(self.ranges)
+        self.range_starts = [range_[0] for range_ in sorted_ranges]
+        self.range_ends = [range_[1] for range_ in sorted_ranges]
+        self.range_shards = [self.ranges[range_] for range_ in sorted_ranges]
+        self._starts_array = None
+
     def _get_range_for_value(self, value):
         """
         Find the range containing a value.
@@ -46,9 +75,9 @@ class RangeStrategy(BaseStrategy):
         Raises:
             StrategyError: If no range contains the value.
         """
-        for range_start, range_end in self.ranges:
-            if range_start <= value < range_end:
-                return (range_start, range_end)
+        index = bisect_right(self.range_starts, value) - 1
+        if index >= 0 and value < self.range_ends[index]:
+            return (self.range_starts[index], self.range_ends[index])
         raise StrategyError("Value does not fall within any range", context={"value": value})
 
     def get_shard_for_key(self, key):
@@ -65,6 +94,40 @@ class RangeStrategy(BaseStrategy):
         range_ = self._get_range_for_value(key)
         return self.ranges[range_]
 
+    def get_shards_for_keys(self, keys):
+        """
+        Route many keys at once, grouping them by owning shard.
+
+        Each key is placed with a binary search over the boundary index
+        (NumPy searchsorted for numeric keys when available).
+
+        Args:
+            keys (Sequence): Keys to locate.
+
+        Returns:
+            dict: Mapping of shard IDs to the positions (indexes into keys) they own.
+
+        Raises:
+            StrategyError: If any key is invalid or falls outside every range.
+        """
+        for key in keys:
+            self.validate_key(key)
+        starts = self.range_starts
+
+        if np is not None and keys and _all_numeric(starts) and _all_numeric(keys):
+            if self._starts_array is None:
+                self._starts_array = np.asarray(starts)
+            indexes = (np.searchsorted(self._starts_array, np.asarray(keys), side="right") - 1).tolist()
+        else:
+            indexes = [bisect_right(starts, key) - 1 for key in keys]
+
+        groups = {}
+        for position, (key, index) in enumerate(zip(keys, indexes)):
+            if index < 0 or not key < self.range_ends[index]:
+                raise StrategyError("Value does not fall within any range", context={"value": key})
+            groups.setdefault(self.range_shards[index], []).append(position)
+        return groups
+
     def get_shards_for_query(self, criteria):
         """
         Determine shards for range queries.
@@ -76,12 +139,11 @@ class RangeStrategy(BaseStrategy):
             list: List of shard IDs.
         """
         # For simplicity, assume criteria is a range (start, end).
+        # Overlapping ranges are those ending after start and starting before end.
         start, end = criteria
-        shards = set()
-        for range_start, range_end in self.ranges:
-            if not (end <= range_start or start >= range_end):  # Overlapping ranges
-                shards.add(self.ranges[(range_start, range_end)])
-        return list(shards)
+        first = bisect_right(self.range_ends, start)
+        last = bisect_left(self.range_starts, end)
+        return list(dict.fromkeys(self.range_shards[first:last]))
 
     def create_shard(self, shard_id):
         """
@@ -106,6 +168,7 @@ class RangeStrategy(BaseStrategy):
             raise StrategyError("Range already exists", context={"range": (range_start, range_end)})
         self.ranges[(range_start, range_end)] = shard_id
         self._validate_ranges()
+        self._rebuild_index()
         self._log_strategy_operation("Added shard with range", shard_id=shard_id, range=(range_start, range_end))
 
     def remove_shard(self, shard_id):
@@ -118,8 +181,37 @@ class RangeStrategy(BaseStrategy):
         ranges_to_remove = [r for r, s in self.ranges.items() if s == shard_id]
         for range_ in ranges_to_remove:
             del self.ranges[range_]
+        self._rebuild_index()
         self._log_strategy_operation("Removed shard", shard_id=shard_id)
 
+    def get_state(self):
+        """
+        Return the range table.
+
+        Returns:
+            dict: JSON-serializable list of [start, end, shard_id] ranges.
+        """
+        return {"ranges": [[start, end, shard_id] for (start, end), shard_id in self.ranges.items()]}
+
+    def load_state(self, state):
+        """
+        Restore persisted ranges, keeping any configured range they lack.
+
+        Args:
+            state (dict): Range state from get_state.
+
+        Returns:
+            list: Always empty; every persisted range is restored.
+
+        Raises:
+            StrategyError: If the combined ranges overlap.
+        """
+        restored = {(start, end): shard_id for start, end, shard_id in state["ranges"]}
+        self.ranges = {**restored, **self.ranges}
+        self._validate_ranges()
+        self._rebuild_index()
+        return []
+
     def add_range(self, start, end, shard_id):
         """
         Define a new range for a shard.
@@ -144,6 +236,7 @@ class RangeStrategy(BaseStrategy):
         if split_point <= range_[0] or split_point >= range_[1]:
             raise StrategyError("Split point is outside the range", context={"split_point": split_point})
         old_shard_id = self.ranges.pop(range_)
+        self._rebuild_index()
         self.add_shard(old_shard_id, range_[0], split_point)
         self.add_shard(new_shard_id, split_point, range_[1])
 
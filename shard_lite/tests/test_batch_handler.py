@@ -2,6 +2,8 @@ import pytest
 from shard_lite.handlers.batch_handler import BatchHandler
 from shard_lite.strategies.base_strategy import BaseStrategy
 from shard_lite.core.connection_pool import ConnectionPool
+from shard_lite.strategies.hash_strategy import HashStrategy
+from shard_lite.utils.config import Config
 from shard_lite.exceptions.shard_exceptions import ShardingError
 
 class DummyQueryRouter(BaseStrategy):
@@ -27,6 +29,24 @@ def batch_handler():
     connection_pool = ConnectionPool(None)
     return BatchHandler(query_router, connection_pool)
 
+@pytest.fixture
+def sharded_batch_handler(tmp_path):
+    config = Config(active_shards=["shard_1", "shard_2"], shard_base_path=str(tmp_path))
+    connection_pool = ConnectionPool(config)
+    for shard_id in ["shard_1", "shard_2"]:
+        connection = connection_pool.get_connection(shard_id)
+        connection.execute("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT, score INTEGER)")
+        connection_pool.release_connection(connection, shard_id)
+    yield BatchHandler(HashStrategy(config), connection_pool)
+    connection_pool.close_all()
+
+def _count_rows(handler, shard_id):
+    connection = handler.connection_pool.get_connection(shard_id)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    finally:
+        handler.connection_pool.release_connection(connection, shard_id)
+
 def test_insert_batch(batch_handler):
     # Test inserting multiple records in batch
     data = [{"id": i, "name": f"test_{i}"} for i in range(10)]
@@ -55,3 +75,39 @@ def test_chunk_data(batch_handler):
     chunks = list(batch_handler._chunk_data(data, 10))
     assert len(chunks) == 10
     assert all(len(chunk) == 10 for chunk in chunks)
+
+def test_insert_batch_groups_by_shard(sharded_batch_handler):
+    # Test bulk insert writes each shard's rows, including mixed column sets
+    data = [{"id": i, "name": f"test_{i}"} for i in range(1, 51)]
+    data += [{"id": i, "name": f"test_{i}", "score": i} for i in range(51, 61)]
+    sharded_batch_handler.insert_batch(data, batch_size=7)
+    assert _count_rows(sharded_batch_handler, "shard_1") + _count_rows(sharded_batch_handler, "shard_2") == 60
+
+def test_insert_batch_rolls_back_shard_on_error(sharded_batch_handler):
+    # Test a failing row rolls back its whole shard transaction
+    strategy = sharded_batch_handler.query_router
+    shard_id = strategy.get_shard_for_key(1)
+    same_shard = [i for i in range(2, 200) if strategy.get_shard_for_key(i) == shard_id][:3]
+    data = [{"id": 1, "name": "a"}] + [{"id": i, "name": "b"} for i in same_shard] + [{"id": 1, "name": "dup"}]
+    with pytest.raises(ShardingError):
+        sharded_batch_handler.insert_batch(data)
+    assert _count_rows(sharded_batch_handler, shard_id) == 0
+
+def test_update_batch_reports_version_conflicts(sharded_batch_handler):
+    # Test versioned pairs report conflicts per row instead of failing the batch
+    for shard_id in ["shard_1", "shard_2"]:
+        with sharded_batch_handler.connection_pool.connection(shard_id) as connection:
+            connection.execute("ALTER TABLE records ADD COLUMN version INTEGER DEFAULT 0")
+    sharded_batch_handler.insert_batch([{"id": i, "name": "a"} for i in range(1, 5)])
+    results = sharded_batch_handler.update_batch([
+        ({"id": 1}, {"name": "b"}, 0),
+        ({"id": 2}, {"name": "b"}, 3),
+        ({"id": 3}, {"name": "b"}),
+        ({"id": 99}, {"name": "b"}, 0),
+    ])
+    assert results == [
+        {"updated": 1, "conflict": False},
+        {"updated": 0, "conflict": True},
+        {"updated": 1, "conflict": False},
+        {"updated": 0, "conflict": False},
+    ]
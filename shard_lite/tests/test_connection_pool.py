@@ -1,7 +1,9 @@
+import sqlite3
+import time
 import pytest
 from shard_lite.core.connection_pool import ConnectionPool
 from shard_lite.utils.config import Config
-from shard_lite.exceptions.shard_exceptions import ConnectionTimeoutError
+from shard_lite.exceptions.shard_exceptions import ConnectionTimeoutError, ConfigurationError
 
 @pytest.fixture
 def connection_pool():
@@ -18,7 +20,7 @@ def test_release_connection(connection_pool):
     # Test releasing a connection back to the pool
     connection = connection_pool.get_connection("shard_1")
     connection_pool.release_connection(connection, "shard_1")
-    assert connection_pool.get_pool_status()["shard_1"] == 3
+    assert connection_pool.get_pool_status()["shard_1"] == 1
 
 def test_connection_timeout(connection_pool):
     # Test connection timeout when pool is exhausted
@@ -40,3 +42,145 @@ def test_close_all(connection_pool):
     connection_pool.get_connection("shard_2")
     connection_pool.close_all()
     assert connection_pool.get_pool_status() == {}
+
+def test_lazy_growth(connection_pool):
+    # Test connections are opened on demand and reused after release
+    assert connection_pool.get_pool_stats() == {}
+    first = connection_pool.get_connection("shard_1")
+    second = connection_pool.get_connection("shard_1")
+    assert connection_pool.get_pool_stats()["shard_1"]["open"] == 2
+    connection_pool.release_connection(first, "shard_1")
+    assert connection_pool.get_connection("shard_1") is first
+    stats = connection_pool.get_pool_stats()["shard_1"]
+    assert (stats["open"], stats["in_use"]) == (2, 2)
+    connection_pool.release_connection(first, "shard_1")
+    connection_pool.release_connection(second, "shard_1")
+    connection_pool.close_all()
+
+def test_idle_reaping_keeps_min_size():
+    # Test idle connections beyond min_pool_size are closed after idle_timeout
+    pool = ConnectionPool(Config(pool_size=3, min_pool_size=1, idle_timeout=0.05, sweep_interval=0, shard_base_path="./test_shards"))
+    connections = [pool.get_connection("shard_1") for _ in range(3)]
+    for connection in connections:
+        pool.release_connection(connection, "shard_1")
+    time.sleep(0.1)
+    assert pool.reap_idle_connections() == 2
+    assert pool.get_pool_stats()["shard_1"]["open"] == 1
+    pool.close_all()
+
+def test_max_lifetime_recycles():
+    # Test connections past max_lifetime are replaced on checkout
+    pool = ConnectionPool(Config(pool_size=1, max_lifetime=0.05, shard_base_path="./test_shards"))
+    connection = pool.get_connection("shard_1")
+    pool.release_connection(connection, "shard_1")
+    time.sleep(0.1)
+    replacement = pool.get_connection("shard_1")
+    assert replacement is not connection
+    assert pool.get_pool_stats()["shard_1"]["open"] == 1
+    pool.release_connection(replacement, "shard_1")
+    pool.close_all()
+
+def test_validation_policy(monkeypatch):
+    # Test the idle policy skips SELECT 1 on warm checkouts and always validates
+    pool = ConnectionPool(Config(pool_size=1, validation_policy="idle", validation_idle_time=60, shard_base_path="./test_shards"))
+    checks = []
+    monkeypatch.setattr(pool, "_validate_connection", lambda connection: checks.append(1) or True)
+    for _ in range(3):
+        pool.release_connection(pool.get_connection("shard_1"), "shard_1")
+    assert checks == []
+    pool.validation_policy = "always"
+    pool.release_connection(pool.get_connection("shard_1"), "shard_1")
+    assert checks == [1]
+    pool.close_all()
+    with pytest.raises(ConfigurationError):
+        ConnectionPool(Config(validation_policy="sometimes"))
+
+def test_failed_connection_is_discarded(connection_pool):
+    # Test a connection that breaks inside the context manager is not reused
+    with pytest.raises(sqlite3.Error):
+        with connection_pool.connection("shard_1") as connection:
+            connection.close()
+            connection.execute("SELECT 1")
+    assert connection_pool.get_pool_stats()["shard_1"]["open"] == 0
+    with connection_pool.connection("shard_1") as healthy:
+        healthy.execute("SELECT 1")
+    assert connection_pool.get_pool_status()["shard_1"] == 1
+
+def test_background_sweep():
+    # Test the sweep thread reaps idle connections and stops on close_all
+    pool = ConnectionPool(Config(pool_size=2, idle_timeout=0.01, sweep_interval=0.02, shard_base_path="./test_shards"))
+    pool.release_connection(pool.get_connection("shard_1"), "shard_1")
+    time.sleep(0.2)
+    assert pool.get_pool_stats()["shard_1"]["open"] == 0
+    pool.close_all()
+    assert not pool._sweeper.is_alive()
+
+def test_background_sweep_default(tmp_path):
+    # Test the sweep runs by default at half the idle timeout and can be disabled
+    pool = ConnectionPool(Config(idle_timeout=0.04, shard_base_path=str(tmp_path)))
+    assert pool.sweep_interval == 0.02
+    pool.release_connection(pool.get_connection("shard_1"), "shard_1")
+    time.sleep(0.2)
+    assert pool.get_pool_stats()["shard_1"]["open"] == 0
+    pool.close_all()
+    disabled = ConnectionPool(Config(sweep_interval=0, shard_base_path=str(tmp_path)))
+    assert disabled._sweeper is None
+    disabled.close_all()
+
+def test_pragma_profiles(tmp_path):
+    # Test profiles, per-shard overrides and explicit pragmas reach new connections
+    config = Config(
+        shard_base_path=str(tmp_path),
+        pragma_profile="balanced",
+        shard_pragma_profiles={"shard_2": "bulk_load"},
+        pragmas={"cache_size": -2000}
+    )
+    pool = ConnectionPool(config)
+    first = pool.get_connection("shard_1")
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert first.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert first.execute("PRAGMA cache_size").fetchone()[0] == -2000
+    second = pool.get_connection("shard_2")
+    assert second.execute("PRAGMA synchronous").fetchone()[0] == 0
+    pool.release_connection(first, "shard_1")
+    pool.release_connection(second, "shard_2")
+    pool.close_all()
+    with pytest.raises(ConfigurationError):
+        ConnectionPool(Config(pragma_profile="fastest")).get_shard_pragmas("shard_1")
+    with pytest.raises(ConfigurationError):
+        ConnectionPool(Config(pragmas={"cache_size": "1; DROP TABLE records"})).get_shard_pragmas("shard_1")
+
+def test_read_write_split(tmp_path):
+    # Test one serialized writer and query-only readers per shard
+    pool = ConnectionPool(Config(
+        connection_timeout=1, pool_size=3, read_write_split=True,
+        pragma_profile="balanced", shard_base_path=str(tmp_path)
+    ))
+    writer = pool.get_connection("shard_1")
+    writer.execute("CREATE TABLE records (id INTEGER PRIMARY KEY)")
+    writer.execute("INSERT INTO records VALUES (1)")
+    writer.commit()
+    with pytest.raises(ConnectionTimeoutError):
+        pool.get_connection("shard_1")
+    readers = [pool.get_connection("shard_1", readonly=True) for _ in range(3)]
+    assert readers[0].execute("SELECT COUNT(*) FROM records").fetchone()[0] == 1
+    with pytest.raises(sqlite3.OperationalError):
+        readers[1].execute("INSERT INTO records VALUES (2)")
+    stats = pool.get_pool_stats()["shard_1"]
+    assert (stats["max_size"], stats["in_use"], stats["readers"]["in_use"]) == (1, 1, 3)
+    for reader in readers:
+        pool.release_connection(reader, "shard_1")
+    pool.release_connection(writer, "shard_1")
+    assert pool.get_pool_status()["shard_1"] == 4
+    pool.close_all()
+    assert pool.get_pool_status() == {}
+
+def test_statement_cache_size(tmp_path, monkeypatch):
+    # Test connections are opened with the configured statement cache size
+    calls = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: calls.append(kwargs) or connect(*args, **kwargs))
+    pool = ConnectionPool(Config(shard_base_path=str(tmp_path), statement_cache_size=512))
+    pool.release_connection(pool.get_connection("shard_1"), "shard_1")
+    assert calls[0]["cached_statements"] == 512
+    pool.close_all()
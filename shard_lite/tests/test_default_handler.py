@@ -2,7 +2,10 @@ import pytest
 from shard_lite.handlers.default_handler import DefaultHandler
 from shard_lite.strategies.base_strategy import BaseStrategy
 from shard_lite.core.connection_pool import ConnectionPool
-from shard_lite.exceptions.shard_exceptions import QueryExecutionError, ShardingError
+from shard_lite.core.query_router import QueryRouter
+from shard_lite.strategies.hash_strategy import HashStrategy
+from shard_lite.utils.config import Config
+from shard_lite.exceptions.shard_exceptions import QueryExecutionError, ShardingError, VersionConflictError
 
 class DummyQueryRouter(BaseStrategy):
     """Dummy implementation of BaseStrategy for testing purposes."""
@@ -27,6 +30,19 @@ def default_handler():
     connection_pool = ConnectionPool(None)
     return DefaultHandler(query_router, connection_pool)
 
+@pytest.fixture
+def sqlite_handler(tmp_path):
+    config = Config(active_shards=["shard_1", "shard_2"], shard_base_path=str(tmp_path))
+    connection_pool = ConnectionPool(config)
+    for shard_id in ["shard_1", "shard_2"]:
+        connection = connection_pool.get_connection(shard_id)
+        connection.execute("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)")
+        connection_pool.release_connection(connection, shard_id)
+    query_router = QueryRouter(connection_pool, HashStrategy(config))
+    yield DefaultHandler(query_router, connection_pool)
+    query_router.close()
+    connection_pool.close_all()
+
 def test_insert(default_handler):
     # Test inserting valid data
     default_handler.insert({"id": 1, "name": "test"})
@@ -63,3 +79,106 @@ def test_delete(default_handler):
     # Test deleting with invalid criteria
     with pytest.raises(ShardingError):
         default_handler.delete(None)
+
+def test_iter_select_streams_all_shards(sqlite_handler):
+    # Test streaming every row across shards in chunks
+    sqlite_handler.insert([{"id": i, "name": f"test_{i}"} for i in range(1, 26)])
+    rows = sqlite_handler.iter_select({}, chunk_size=4)
+    assert sorted(row[0] for row in rows) == list(range(1, 26))
+    chunks = list(sqlite_handler.iter_select({}, chunk_size=4, chunks=True))
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == 25
+
+def test_iter_select_releases_connection_on_close(sqlite_handler):
+    # Test closing the generator mid-shard hands the connection back
+    sqlite_handler.insert([{"id": i, "name": "x"} for i in range(1, 11)])
+    pool = sqlite_handler.connection_pool
+    rows = sqlite_handler.iter_select({"name": "x"}, chunk_size=1)
+    next(rows)
+    assert sum(stats["in_use"] for stats in pool.get_pool_stats().values()) == 1
+    rows.close()
+    assert sum(stats["in_use"] for stats in pool.get_pool_stats().values()) == 0
+
+def test_select_top_n(sqlite_handler):
+    # Test top-N selection across shards
+    sqlite_handler.insert([{"id": i, "name": f"test_{i:02d}"} for i in range(1, 31)])
+    rows = sqlite_handler.select_top_n({}, "name", 3)
+    assert [row[1] for row in rows] == ["test_01", "test_02", "test_03"]
+
+def test_point_and_in_list_queries(sqlite_handler):
+    # Test shard-key equality and IN predicates select, update and delete correctly
+    sqlite_handler.insert([{"id": i, "name": "x"} for i in range(1, 11)])
+    assert [row[0] for row in sqlite_handler.select({"id": 4})] == [4]
+    assert sorted(row[0] for row in sqlite_handler.select({"id": [2, 5, 9]})) == [2, 5, 9]
+    sqlite_handler.update({"id": [2, 5]}, {"name": "y"})
+    assert sorted(row[0] for row in sqlite_handler.select({"name": "y"})) == [2, 5]
+    sqlite_handler.delete({"id": (2, 5)})
+    assert sqlite_handler.select({"name": "y"}) == []
+
+def test_read_write_split_routing(tmp_path):
+    # Test handler reads use the read-only pool and writes use the writer
+    config = Config(
+        active_shards=["shard_1", "shard_2"], shard_base_path=str(tmp_path),
+        read_write_split=True, pragma_profile="balanced"
+    )
+    connection_pool = ConnectionPool(config)
+    query_router = QueryRouter(connection_pool, HashStrategy(config))
+    query_router.execute_query("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)", [])
+    handler = DefaultHandler(query_router, connection_pool)
+    handler.insert([{"id": i, "name": "x"} for i in range(1, 11)])
+    assert len(handler.select({"name": "x"})) == 10
+    stats = connection_pool.get_pool_stats()
+    assert all(stats[shard_id]["readers"]["open"] >= 1 for shard_id in ["shard_1", "shard_2"])
+    assert all(stats[shard_id]["open"] == 1 for shard_id in ["shard_1", "shard_2"])
+    query_router.close()
+    connection_pool.close_all()
+
+def test_query_templates_are_memoized(sqlite_handler):
+    # Test builders reuse the SQL text for a stable query shape
+    first, params = sqlite_handler._build_insert_query({"id": 1, "name": "a"})
+    second, _ = sqlite_handler._build_insert_query({"id": 2, "name": "b"})
+    assert first is second and params == [1, "a"]
+    query, params = sqlite_handler._build_update_query({"id": [1, 2]}, {"name": "c"})
+    assert query == "UPDATE records SET name = ? WHERE id IN (?, ?)"
+    assert params == ["c", 1, 2]
+    assert sqlite_handler._build_select_query({"id": [1, 2, 3]})[0].endswith("IN (?, ?, ?)")
+    assert sqlite_handler._build_select_query({})[0] == "SELECT * FROM records"
+    assert sqlite_handler._build_delete_query({"id": 1}) == ("DELETE FROM records WHERE id = ?", [1])
+
+def test_query_template_cache_is_bounded(sqlite_handler, monkeypatch):
+    # Test shapes past the cache bound are still built, just not stored
+    monkeypatch.setattr(sqlite_handler, "TEMPLATE_CACHE_SIZE", 2)
+    for size in range(1, 6):
+        query, _ = sqlite_handler._build_select_query({"id": list(range(size))})
+        assert query.count("?") == size
+    assert len(sqlite_handler._templates) == 2
+
+def test_versioned_update_and_delete(sqlite_handler):
+    # Test expected_version makes writes conditional and bumps the version
+    sqlite_handler.query_router.execute_query("ALTER TABLE records ADD COLUMN version INTEGER DEFAULT 0", [])
+    sqlite_handler.insert({"id": 1, "name": "a"})
+    assert sqlite_handler.update({"id": 1}, {"name": "b"}, expected_version=0) == 1
+    assert sqlite_handler.select({"id": 1}) == [(1, "b", 1)]
+    with pytest.raises(VersionConflictError):
+        sqlite_handler.update({"id": 1}, {"name": "c"}, expected_version=0)
+    with pytest.raises(ShardingError):
+        sqlite_handler.update({"id": 1}, {"version": 5}, expected_version=1)
+    with pytest.raises(VersionConflictError):
+        sqlite_handler.delete({"id": 1}, expected_version=0)
+    assert sqlite_handler.delete({"id": 1}, expected_version=1) == 1
+    assert sqlite_handler.select({"id": 1}) == []
+    assert sqlite_handler.update({"id": 1}, {"name": "d"}, expected_version=1) == 0
+    assert sqlite_handler.delete({"id": 1}, expected_version=1) == 0
+
+def test_plan_statements(sqlite_handler):
+    # Test planning builds routed statements without touching the shards
+    shard_id, query, params = sqlite_handler.plan_insert({"id": 7, "name": "a"})
+    assert shard_id == sqlite_handler.query_router.get_shard_for_key(7)
+    assert (query, params) == ("INSERT INTO records (id, name) VALUES (?, ?)", [7, "a"])
+    with pytest.raises(ShardingError):
+        sqlite_handler.plan_insert({"name": "no key"})
+    assert sqlite_handler.plan_update({"id": 7}, {"name": "b"}) == [
+        (shard_id, "UPDATE records SET name = ? WHERE id = ?", ["b", 7])
+    ]
+    assert len(sqlite_handler.plan_delete({"name": "b"})) == 2
+    assert sqlite_handler.select({}) == []
@@ -0,0 +1,150 @@
+import json
+import pytest
+from shard_lite.strategies.directory_store import JsonDirectoryStore, JournalDirectoryStore, SQLiteDirectoryStore
+from shard_lite.exceptions.shard_exceptions import StrategyError
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SQLiteDirectoryStore(str(tmp_path / "directory.db"))
+    yield store
+    store.close()
+
+def test_sqlite_store_upserts_and_lookups(sqlite_store):
+    # Test per-key upserts and point lookups, keeping key types apart
+    sqlite_store.set("key1", "shard_1")
+    sqlite_store.set("key1", "shard_2")
+    sqlite_store.set(7, "shard_3")
+    assert sqlite_store.get("key1") == "shard_2"
+    assert sqlite_store.get(7) == "shard_3"
+    assert sqlite_store.get("7") is None
+    assert sqlite_store.count() == 2
+
+def test_sqlite_store_batched_writes(sqlite_store):
+    # Test batched writes, bulk lookups and shard membership queries
+    sqlite_store.set_many((f"key{i}", f"shard_{i % 3}") for i in range(2000))
+    found = sqlite_store.get_many([f"key{i}" for i in range(0, 2000, 2)] + ["missing"])
+    assert len(found) == 1000
+    assert sqlite_store.has_shard("shard_1")
+    assert len(sqlite_store.keys_for_shard("shard_1")) == 667
+    sqlite_store.delete_many(sqlite_store.keys_for_shard("shard_1"))
+    assert not sqlite_store.has_shard("shard_1")
+    assert sqlite_store.delete("key0")
+    assert not sqlite_store.delete("key0")
+
+def test_sqlite_store_uses_wal(sqlite_store):
+    # Test the store runs in WAL mode
+    assert sqlite_store.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_sqlite_store_imports_json(tmp_path, sqlite_store):
+    # Test importing an existing JSON directory
+    json_path = tmp_path / "directory.json"
+    json_path.write_text(json.dumps({"a": "shard_1", "b": "shard_2"}))
+    assert sqlite_store.import_json(str(json_path)) == 2
+    assert sqlite_store.to_dict() == {"a": "shard_1", "b": "shard_2"}
+
+def test_json_store_round_trip(tmp_path):
+    # Test the JSON store persists and reloads mappings
+    path = str(tmp_path / "directory.json")
+    store = JsonDirectoryStore(path)
+    store.set_many([("a", "shard_1"), ("b", "shard_2")])
+    store.delete("b")
+    assert JsonDirectoryStore(path).to_dict() == {"a": "shard_1"}
+
+def test_json_store_reverse_index(tmp_path):
+    # Test the reverse index follows adds, moves and removals
+    store = JsonDirectoryStore(str(tmp_path / "directory.json"))
+    store.set_many([("a", "shard_1"), ("b", "shard_1"), ("c", "shard_2")])
+    store.set("b", "shard_2")
+    assert set(store.keys_for_shard("shard_2")) == {"b", "c"}
+    assert store.shard_counts() == {"shard_1": 1, "shard_2": 2}
+    store.delete("a")
+    assert not store.has_shard("shard_1")
+    assert JsonDirectoryStore(store.path).shard_counts() == {"shard_2": 2}
+
+def test_sqlite_store_shard_counts(sqlite_store):
+    # Test per-shard counts from the indexed table
+    sqlite_store.set_many([("a", "shard_1"), ("b", "shard_1"), ("c", "shard_2")])
+    assert sqlite_store.shard_counts() == {"shard_1": 2, "shard_2": 1}
+
+def test_journal_store_replays_journal(tmp_path):
+    # Test changes are journaled and replayed without a snapshot rewrite
+    path = str(tmp_path / "directory.json")
+    store = JournalDirectoryStore(path, fsync_interval=10)
+    store.set_many([("a", "shard_1"), ("b", "shard_2"), ("c", "shard_2")])
+    store.set("a", "shard_3")
+    store.delete("b")
+    store.close()
+    assert not (tmp_path / "directory.json").exists()
+    reopened = JournalDirectoryStore(path)
+    assert reopened.to_dict() == {"a": "shard_3", "c": "shard_2"}
+    assert reopened.shard_counts() == {"shard_3": 1, "shard_2": 1}
+    reopened.close()
+
+def test_journal_store_drops_torn_tail(tmp_path):
+    # Test a partial final record is ignored and truncated on load
+    path = str(tmp_path / "directory.json")
+    store = JournalDirectoryStore(path)
+    store.set("a", "shard_1")
+    store.close()
+    with open(store.journal_path, "a") as file:
+        file.write('["set", "b", "sha')
+    reopened = JournalDirectoryStore(path)
+    assert reopened.to_dict() == {"a": "shard_1"}
+    reopened.set("c", "shard_2")
+    reopened.close()
+    assert JournalDirectoryStore(path).to_dict() == {"a": "shard_1", "c": "shard_2"}
+
+def test_journal_store_treats_unterminated_tail_as_torn(tmp_path):
+    # Test a final record missing its newline is not merged with later appends
+    path = str(tmp_path / "directory.json")
+    store = JournalDirectoryStore(path)
+    store.set("a", "shard_1")
+    store.set("b", "shard_2")
+    store.close()
+    with open(store.journal_path, "rb+") as file:
+        file.truncate(len(file.read().rstrip(b"\n")))
+    reopened = JournalDirectoryStore(path)
+    assert reopened.to_dict() == {"a": "shard_1"}
+    reopened.set("c", "shard_1")
+    reopened.set("d", "shard_2")
+    reopened.close()
+    assert JournalDirectoryStore(path).to_dict() == {"a": "shard_1", "c": "shard_1", "d": "shard_2"}
+
+def test_journal_store_rejects_corrupt_record(tmp_path):
+    # Test a bad record before the final line raises instead of dropping the rest
+    path = str(tmp_path / "directory.json")
+    store = JournalDirectoryStore(path)
+    store.set("a", "shard_1")
+    store.close()
+    with open(store.journal_path, "a") as file:
+        file.write('["set", "b"\n["set", "c", "shard_2"]\n')
+    with pytest.raises(StrategyError):
+        JournalDirectoryStore(path)
+
+def test_journal_store_compacts(tmp_path):
+    # Test the journal is folded into the snapshot at the threshold
+    path = str(tmp_path / "directory.json")
+    store = JournalDirectoryStore(path, compact_threshold=100)
+    for i in range(150):
+        store.set(f"key{i}", "shard_1")
+    with open(path) as file:
+        assert len(json.load(file)) == 100
+    with open(store.journal_path) as file:
+        assert len(file.readlines()) == 50
+    store.close()
+    assert len(JournalDirectoryStore(path).to_dict()) == 150
+
+def test_journal_store_keeps_key_types_across_compaction(tmp_path):
+    # Test integer keys resolve the same before and after a compaction
+    path = str(tmp_path / "directory.json")
+    store = JournalDirectoryStore(path)
+    store.set_many([(42, "shard_1"), ("42", "shard_2")])
+    store.compact()
+    store.close()
+    reopened = JournalDirectoryStore(path)
+    assert reopened.get(42) == "shard_1" and reopened.get("42") == "shard_2"
+    reopened.close()
+    sqlite_store = SQLiteDirectoryStore(str(tmp_path / "directory.db"))
+    sqlite_store.import_json(path)
+    assert sqlite_store.get(42) == "shard_1"
+    sqlite_store.close()
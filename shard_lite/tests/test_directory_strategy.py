@@ -44,3 +44,101 @@ def test_lru_cache(directory_strategy):
     directory_strategy.add_mapping("key3", "shard_3")  # Add a new key
     assert "key1" in directory_strategy.cache
     assert "key2" in directory_strategy.cache
+
+def test_get_shards_for_keys(directory_strategy):
+    # Test bulk lookups group keys by mapped shard without touching the cache
+    directory_strategy.import_mappings({"key1": "shard_1", "key2": "shard_2", "key3": "shard_1"})
+    assert directory_strategy.get_shards_for_keys(["key1", "key2", "key3"]) == {"shard_1": [0, 2], "shard_2": [1]}
+    assert len(directory_strategy.cache) == 0
+    with pytest.raises(StrategyError):
+        directory_strategy.get_shards_for_keys(["key1", "missing"])
+
+def test_sqlite_backend_imports_json_directory(tmp_path):
+    # Test the SQLite backend seeds itself from an existing JSON directory
+    json_path = tmp_path / "directory.json"
+    json_path.write_text('{"key1": "shard_1"}')
+    config = Config(directory_path=str(json_path), directory_backend="sqlite")
+    strategy = DirectoryStrategy(config)
+    assert strategy.get_shard_for_key("key1") == "shard_1"
+    strategy.add_mapping("key2", "shard_2")
+    strategy.store.close()
+    reopened = DirectoryStrategy(config)
+    assert reopened.get_shards_for_keys(["key1", "key2"]) == {"shard_1": [0], "shard_2": [1]}
+    reopened.store.close()
+
+def test_load_report(tmp_path):
+    # Test per-shard counts and skew reporting
+    strategy = DirectoryStrategy(Config(directory_path=str(tmp_path / "directory.json")))
+    strategy.import_mappings({"a": "shard_1", "b": "shard_1", "c": "shard_1", "d": "shard_2"})
+    report = strategy.get_load_report()
+    assert report["counts"] == {"shard_1": 3, "shard_2": 1}
+    assert report["busiest_shard"] == "shard_1"
+    assert report["skew"] == 1.5
+    strategy.remove_shard("shard_1")
+    assert strategy.get_shard_key_counts() == {"shard_2": 1}
+    assert "a" not in strategy.cache
+
+def test_bulk_mappings_persist_once(tmp_path, monkeypatch):
+    # Test add_mappings/remove_mappings write the directory a single time
+    strategy = DirectoryStrategy(Config(directory_path=str(tmp_path / "directory.json")))
+    strategy.add_mapping("key0", "shard_0")
+    strategy.get_shard_for_key("key0")
+    saves = []
+    monkeypatch.setattr(strategy.store, "save", lambda: saves.append(1))
+    strategy.add_mappings({f"key{i}": "shard_1" for i in range(1000)})
+    assert strategy.cache["key0"] == "shard_1"
+    strategy.remove_mappings([f"key{i}" for i in range(500)])
+    assert saves == [1, 1]
+    assert strategy.get_shard_key_counts() == {"shard_1": 500}
+    with pytest.raises(StrategyError):
+        strategy.add_mappings([("ok", "shard_1"), (None, "shard_1")])
+    assert "ok" not in strategy.directory
+
+def test_deferred_persistence(tmp_path):
+    # Test the context manager defers the atomic write until exit
+    path = tmp_path / "directory.json"
+    strategy = DirectoryStrategy(Config(directory_path=str(path)))
+    with strategy.deferred_persistence():
+        for i in range(100):
+            strategy.add_mapping(f"key{i}", "shard_1")
+        with strategy.deferred_persistence():
+            strategy.remove_mapping("key0")
+        assert not path.exists()
+    assert DirectoryStrategy(Config(directory_path=str(path))).get_shard_key_counts() == {"shard_1": 99}
+    assert not (tmp_path / "directory.json.tmp").exists()
+
+def test_deferred_persistence_sqlite(tmp_path):
+    # Test deferred writes share one SQLite transaction
+    config = Config(directory_path=str(tmp_path / "directory.json"), directory_backend="sqlite")
+    strategy = DirectoryStrategy(config)
+    with strategy.deferred_persistence():
+        strategy.add_mappings([(f"key{i}", "shard_1") for i in range(10)])
+        strategy.add_mapping("extra", "shard_2")
+        assert strategy.store.connection.in_transaction
+    assert not strategy.store.connection.in_transaction
+    assert strategy.get_shard_key_counts() == {"shard_1": 10, "shard_2": 1}
+    strategy.store.close()
+
+def test_deferred_persistence_sqlite_failed_write(tmp_path):
+    # Test a failed write inside a deferred block keeps the earlier writes the cache holds
+    config = Config(directory_path=str(tmp_path / "directory.json"), directory_backend="sqlite")
+    strategy = DirectoryStrategy(config)
+    with pytest.raises(StrategyError):
+        with strategy.deferred_persistence():
+            strategy.add_mapping("a", "shard_1")
+            assert strategy.get_shard_for_key("a") == "shard_1"
+            strategy.add_mapping("b", None)
+    assert not strategy.store.connection.in_transaction
+    strategy.store.close()
+    reopened = DirectoryStrategy(config)
+    assert reopened.store.to_dict() == {"a": "shard_1"}
+    reopened.store.close()
+
+def test_journal_backend(tmp_path):
+    # Test the journal backend persists mappings across restarts
+    config = Config(directory_path=str(tmp_path / "directory.json"), directory_backend="journal")
+    strategy = DirectoryStrategy(config)
+    strategy.add_mappings({f"key{i}": "shard_1" for i in range(10)})
+    strategy.remove_mapping("key0")
+    strategy.store.close()
+    assert DirectoryStrategy(config).get_shard_key_counts() == {"shard_1": 9}
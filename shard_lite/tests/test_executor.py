@@ -0,0 +1,49 @@
+import threading
+import time
+import pytest
+from shard_lite.core.executor import ShardExecutor
+
+@pytest.fixture
+def executor():
+    executor = ShardExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+def test_run_all_preserves_order(executor):
+    # Test results come back in submission order
+    assert executor.run_all([lambda i=i: i * i for i in range(10)]) == [i * i for i in range(10)]
+
+def test_run_all_propagates_errors(executor):
+    # Test worker exceptions reach the caller
+    def fail():
+        raise ValueError("boom")
+    with pytest.raises(ValueError):
+        executor.run_all([lambda: 1, fail])
+
+def test_nested_run_all_does_not_deadlock(executor):
+    # Test fan-out from inside a worker runs inline instead of waiting on the pool
+    def outer():
+        return sum(executor.run_all([lambda: 1, lambda: 2, lambda: 3]))
+    assert executor.run_all([outer, outer, outer]) == [6, 6, 6]
+
+def test_stats_track_active_and_queued(executor):
+    # Test queue depth and active worker counters
+    release = threading.Event()
+    futures = [executor.submit(release.wait) for _ in range(3)]
+    deadline = time.monotonic() + 5
+    while executor.get_stats()["active"] < 2 and time.monotonic() < deadline:
+        release.wait(0.001)
+    stats = executor.get_stats()
+    assert stats["active"] == 2
+    assert stats["queue_depth"] == 1
+    release.set()
+    for future in futures:
+        future.result()
+    assert executor.get_stats()["completed"] == 3
+    assert executor.get_stats()["threads"] == 2
+
+def test_shutdown_rejects_new_work(executor):
+    # Test the executor refuses work after shutdown
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
@@ -32,3 +32,61 @@ def test_rebalance_shards(hash_strategy):
     hash_strategy.rebalance_shards()
     # Add assertions as rebalance logic is implemented
     pass
+
+def test_ring_tokens_stay_sorted(hash_strategy):
+    # Test that the token array tracks the ring through membership changes
+    hash_strategy.add_shard("shard_4")
+    assert hash_strategy.ring_tokens == sorted(hash_strategy.hash_ring)
+    hash_strategy.rebalance_shards()
+    assert len(hash_strategy.ring_tokens) == 4 * 100
+    hash_strategy.remove_shard("shard_2")
+    assert hash_strategy.ring_tokens == sorted(hash_strategy.hash_ring)
+    assert "shard_2" not in hash_strategy.ring_shards
+
+def test_lookup_matches_ring_walk(hash_strategy):
+    # Test that bisect lookup picks the first token at or after the key's hash
+    hash_strategy.rebalance_shards()
+    tokens = sorted(hash_strategy.hash_ring)
+    for key in range(1, 200):
+        hash_value = hash_strategy._hash_key(key)
+        owner = next((t for t in tokens if hash_value <= t), tokens[0])
+        assert hash_strategy.get_shard_for_key(key) == hash_strategy.hash_ring[owner]
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_get_shards_for_keys(hash_strategy, monkeypatch, use_numpy):
+    # Test bulk routing agrees with per-key routing, with and without NumPy
+    import shard_lite.strategies.hash_strategy as hash_module
+    if not use_numpy:
+        monkeypatch.setattr(hash_module, "np", None)
+    elif hash_module.np is None:
+        pytest.skip("NumPy not installed")
+    hash_strategy.rebalance_shards()
+    keys = list(range(1, 500)) + ["user_a", "user_b"]
+    groups = hash_strategy.get_shards_for_keys(keys)
+    assert sorted(p for positions in groups.values() for p in positions) == list(range(len(keys)))
+    for shard_id, positions in groups.items():
+        assert all(hash_strategy.get_shard_for_key(keys[p]) == shard_id for p in positions)
+
+def test_get_shards_for_keys_invalid_key(hash_strategy):
+    # Test bulk routing rejects invalid keys
+    with pytest.raises(StrategyError):
+        hash_strategy.get_shards_for_keys(["ok", None])
+
+def test_get_shards_for_query_prunes_on_shard_key(hash_strategy):
+    # Test equality and IN predicates on the shard key route to owners only
+    owner = hash_strategy.get_shard_for_key(42)
+    assert hash_strategy.get_shards_for_query({"id": 42}) == [owner]
+    assert hash_strategy.get_shards_for_query({"id": 42, "name": "x"}) == [owner]
+    keys = [1, 2, 3, 4, 5, 6]
+    assert set(hash_strategy.get_shards_for_query({"id": keys})) == {hash_strategy.get_shard_for_key(k) for k in keys}
+    assert hash_strategy.get_shards_for_query({"id": []}) == []
+
+def test_get_shards_for_query_broadcasts_without_key(hash_strategy):
+    # Test criteria without the shard key fan out to every shard
+    assert hash_strategy.get_shards_for_query({"name": "x"}) == ["shard_1", "shard_2", "shard_3"]
+
+def test_get_shards_for_query_broadcasts_unroutable_keys(hash_strategy):
+    # Test key values the router rejects fan out instead of raising
+    all_shards = ["shard_1", "shard_2", "shard_3"]
+    for value in [0, 5.0, None, [1, None]]:
+        assert hash_strategy.get_shards_for_query({"id": value}) == all_shards
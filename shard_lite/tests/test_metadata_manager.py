@@ -0,0 +1,124 @@
+import sqlite3
+import pytest
+from shard_lite.core.metadata_manager import MetadataManager, SCHEMA_VERSION
+from shard_lite.core.shard_manager import ShardManager
+from shard_lite.utils.config import Config
+from shard_lite.exceptions.shard_exceptions import ConfigurationError
+
+@pytest.fixture
+def config(tmp_path):
+    return Config(shard_base_path=str(tmp_path))
+
+@pytest.fixture
+def metadata_manager(config):
+    manager = MetadataManager(config)
+    yield manager
+    manager.close()
+
+def test_catalog_persists_across_restarts(config, metadata_manager):
+    # Test shards, metadata and strategy state survive reopening the catalog
+    metadata_manager.register_shard("shard_1", "/data/shard_1.db")
+    metadata_manager.register_shard("shard_2", "/data/shard_2.db")
+    metadata_manager.store_metadata("owner", {"team": "storage"})
+    metadata_manager.save_strategy_state("hash", {"tokens": [[2 ** 100, "shard_1"]]})
+    metadata_manager.close()
+
+    reopened = MetadataManager(config)
+    assert reopened.list_shards() == ["shard_1", "shard_2"]
+    assert reopened.get_shard_info("shard_2")["location"] == "/data/shard_2.db"
+    assert reopened.get_metadata("owner") == {"team": "storage"}
+    assert reopened.get_strategy_state("hash") == {"tokens": [[2 ** 100, "shard_1"]]}
+    assert reopened.unregister_shard("shard_1") is True
+    assert reopened.get_shard_info("shard_1") is None
+    reopened.close()
+
+def test_schema_version(config, metadata_manager):
+    # Test the catalog records its schema version and rejects newer ones
+    with sqlite3.connect(metadata_manager.path) as connection:
+        assert connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    metadata_manager.close()
+    with pytest.raises(ConfigurationError):
+        MetadataManager(config)
+
+def test_refresh_stats(tmp_path, metadata_manager):
+    # Test stats are collected from shard files and served from the cache
+    path = str(tmp_path / "shard_1.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)")
+        connection.executemany("INSERT INTO records VALUES (?, ?)", [(i, "x") for i in range(25)])
+    metadata_manager.register_shard("shard_1", path)
+    metadata_manager.register_shard("shard_2", str(tmp_path / "missing.db"))
+    assert metadata_manager.get_shard_info("shard_1")["stats"] is None
+
+    refreshed = metadata_manager.refresh_stats()
+    assert list(refreshed) == ["shard_1"]
+    stats = metadata_manager.get_stats("shard_1")
+    assert stats["row_count"] == 25
+    assert stats["page_count"] * stats["page_size"] == stats["file_size"]
+    assert metadata_manager.get_shard_info("shard_1")["stats"] == stats
+    assert metadata_manager.get_stats("shard_2") is None
+
+def test_refresh_stats_escapes_paths(tmp_path, metadata_manager):
+    # Test shard locations with URI metacharacters are opened correctly
+    path = str(tmp_path / "odd?name#100%.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE records (id INTEGER PRIMARY KEY)")
+        connection.execute("INSERT INTO records VALUES (1)")
+    metadata_manager.register_shard("shard_1", path)
+    metadata_manager.refresh_stats()
+    assert metadata_manager.get_stats("shard_1")["row_count"] == 1
+
+def test_background_stats_refresh(tmp_path):
+    # Test stats_refresh_interval keeps stats current without explicit calls
+    path = str(tmp_path / "shard_1.db")
+    sqlite3.connect(path).close()
+    manager = MetadataManager(Config(shard_base_path=str(tmp_path), stats_refresh_interval=0.05))
+    manager.register_shard("shard_1", path)
+    for _ in range(100):
+        if manager.get_stats("shard_1") is not None:
+            break
+        manager._refresh_stop.wait(0.05)
+    assert manager.get_stats("shard_1")["row_count"] is None
+    manager.close()
+
+def test_shard_manager_restores_created_shards(tmp_path):
+    # Test shards created at runtime are routed to again after a restart
+    config = Config(active_shards=["shard_1"], shard_base_path=str(tmp_path))
+    manager = ShardManager(config)
+    assert manager.list_shards() == ["shard_1"]
+    manager.create_shard("shard_2")
+    routes = {key: manager.strategy.get_shard_for_key(key) for key in range(1, 50)}
+    manager.close()
+
+    restarted = ShardManager(config)
+    assert restarted.list_shards() == ["shard_1", "shard_2"]
+    assert restarted.strategy.get_all_shards() == ["shard_1", "shard_2"]
+    assert {key: restarted.strategy.get_shard_for_key(key) for key in routes} == routes
+    restarted.close()
+
+def test_shard_manager_drops_unconfigured_shards(tmp_path):
+    # Test a shard removed from active_shards is not restored from the persisted ring
+    manager = ShardManager(Config(active_shards=["shard_1", "shard_2", "shard_3"], shard_base_path=str(tmp_path)))
+    manager.create_shard("shard_4")
+    manager.close()
+
+    config = Config(active_shards=["shard_1", "shard_2"], shard_base_path=str(tmp_path))
+    restarted = ShardManager(config)
+    assert restarted.strategy.get_all_shards() == ["shard_1", "shard_2", "shard_4"]
+    assert "shard_3" not in restarted.list_shards()
+    assert all(restarted.strategy.get_shard_for_key(key) != "shard_3" for key in range(1, 200))
+    restarted.close()
+    reopened = ShardManager(config)
+    assert "shard_3" not in reopened.metadata_manager.get_strategy_state("hash")["shards"]
+    reopened.close()
+
+def test_stats_refresh_runs_by_default(config):
+    # Test the background refresh is on by default and can be disabled
+    manager = MetadataManager(config)
+    assert manager.stats_refresh_interval == 300 and manager._refresher.is_alive()
+    manager.close()
+    assert not manager._refresher.is_alive()
+    disabled = MetadataManager(Config(shard_base_path=config.get("shard_base_path"), stats_refresh_interval=0))
+    assert disabled._refresher is None
+    disabled.close()
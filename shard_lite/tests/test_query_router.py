@@ -1,7 +1,10 @@
 import pytest
 from shard_lite.core.query_router import QueryRouter
 from shard_lite.core.connection_pool import ConnectionPool
+from shard_lite.core.executor import ShardExecutor
 from shard_lite.strategies.base_strategy import BaseStrategy
+from shard_lite.strategies.hash_strategy import HashStrategy
+from shard_lite.utils.config import Config
 from shard_lite.exceptions.shard_exceptions import ShardingError
 
 class DummyStrategy(BaseStrategy):
@@ -27,6 +30,24 @@ def query_router():
     strategy = DummyStrategy(None)  # Mocked Strategy
     return QueryRouter(connection_pool, strategy)
 
+@pytest.fixture
+def sqlite_router(tmp_path):
+    config = Config(active_shards=["shard_1", "shard_2", "shard_3"], shard_base_path=str(tmp_path))
+    connection_pool = ConnectionPool(config)
+    router = QueryRouter(connection_pool, HashStrategy(config))
+    for n, shard_id in enumerate(["shard_1", "shard_2", "shard_3"]):
+        connection = connection_pool.get_connection(shard_id)
+        connection.execute("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT, ts INTEGER)")
+        connection.executemany(
+            "INSERT INTO records (id, name, ts) VALUES (?, ?, ?)",
+            [(n * 100 + i, f"row_{i}", i * 3 + n) for i in range(20)]
+        )
+        connection.commit()
+        connection_pool.release_connection(connection, shard_id)
+    yield router
+    router.close()
+    connection_pool.close_all()
+
 def test_execute_query(query_router):
     # Test executing a query on specific shards
     results = query_router.execute_query("SELECT * FROM test_table", [])
@@ -50,3 +71,88 @@ def test_aggregate_results(query_router):
     # Test aggregating results from multiple shards
     results = query_router._aggregate_results([[1, 2], [3, 4]])
     assert results == [1, 2, 3, 4]
+
+def test_execute_merged_streams_in_order(sqlite_router):
+    # Test k-way merge of pre-sorted shard cursors
+    rows = sqlite_router.execute_merged("SELECT id, ts FROM records ORDER BY ts", [], sort_key="ts", batch_size=4)
+    assert not isinstance(rows, list)
+    timestamps = [row[1] for row in rows]
+    assert timestamps == sorted(timestamps)
+    assert len(timestamps) == 60
+
+def test_execute_merged_descending_and_dedup(sqlite_router):
+    # Test reverse merge with duplicates removed across shards
+    rows = list(sqlite_router.execute_merged(
+        "SELECT name FROM records ORDER BY name DESC", [], sort_key=0, reverse=True, dedup=True
+    ))
+    assert rows == sorted({(f"row_{i}",) for i in range(20)}, reverse=True)
+
+def test_execute_merged_releases_connections_on_close(sqlite_router):
+    # Test closing a partially consumed stream returns every connection
+    pool = sqlite_router.connection_pool
+    rows = sqlite_router.execute_merged("SELECT id, ts FROM records ORDER BY ts", [], sort_key=1, batch_size=2)
+    next(rows)
+    assert pool.get_pool_stats()["shard_1"]["in_use"] == 1
+    rows.close()
+    assert all(stats["in_use"] == 0 for stats in pool.get_pool_stats().values())
+
+def test_execute_aggregate(sqlite_router):
+    # Test global aggregates merged from per-shard partials
+    result = sqlite_router.execute_aggregate({
+        "rows": ("count", "*"),
+        "total": ("sum", "ts"),
+        "low": ("min", "ts"),
+        "high": ("max", "ts"),
+        "mean": ("avg", "ts"),
+    })
+    assert result == {"rows": 60, "total": 1770, "low": 0, "high": 59, "mean": 29.5}
+
+def test_execute_aggregate_group_by(sqlite_router):
+    # Test GROUP BY partials are merged per group across shards
+    results = sqlite_router.execute_aggregate({"rows": ("count", "*"), "high": ("max", "ts")}, group_by=["name"])
+    assert len(results) == 20
+    assert results[0] == {"name": "row_0", "rows": 3, "high": 2}
+    assert all(result["rows"] == 3 for result in results)
+
+def test_execute_aggregate_rejects_unknown_function(sqlite_router):
+    # Test unsupported aggregate functions are rejected before any shard is queried
+    with pytest.raises(ShardingError):
+        sqlite_router.execute_aggregate({"x": ("median", "ts")})
+
+def test_execute_top_n(sqlite_router):
+    # Test ORDER BY/LIMIT pushdown returns the global top rows
+    rows = sqlite_router.execute_top_n("SELECT id, ts FROM records WHERE ts >= ?", [10], "ts", 5, descending=True)
+    assert [row[1] for row in rows] == [59, 58, 57, 56, 55]
+    pool = sqlite_router.connection_pool
+    assert all(stats["in_use"] == 0 for stats in pool.get_pool_stats().values())
+
+def test_execute_top_n_rejects_bad_limit(sqlite_router):
+    # Test the limit must be a positive integer
+    with pytest.raises(ShardingError):
+        sqlite_router.execute_top_n("SELECT * FROM records", [], "ts", 0)
+
+def test_merge_orders_nulls_first(sqlite_router):
+    # Test NULLs in the sort column merge like SQLite orders them
+    pool = sqlite_router.connection_pool
+    for shard_id in ["shard_1", "shard_2"]:
+        with pool.connection(shard_id) as connection:
+            connection.execute("UPDATE records SET ts = NULL WHERE id % 100 < 2")
+            connection.commit()
+    rows = sqlite_router.execute_top_n("SELECT id, ts FROM records", [], "ts", 6)
+    assert [row[1] for row in rows] == [None, None, None, None, 2, 5]
+    rows = sqlite_router.execute_top_n("SELECT id, ts FROM records", [], "ts", 63, descending=True)
+    assert [row[1] for row in rows[-5:]] == [2, None, None, None, None]
+
+def test_close_shuts_down_private_executor_only(tmp_path):
+    # Test close() stops an executor the router created but not a shared one
+    config = Config(active_shards=["shard_1"], shard_base_path=str(tmp_path))
+    connection_pool = ConnectionPool(config)
+    router = QueryRouter(connection_pool, HashStrategy(config))
+    router.close()
+    with pytest.raises(RuntimeError):
+        router.executor.submit(lambda: None)
+    shared = ShardExecutor(2)
+    QueryRouter(connection_pool, HashStrategy(config), executor=shared).close()
+    assert shared.submit(lambda: 1).result() == 1
+    shared.shutdown()
+    connection_pool.close_all()
@@ -36,3 +36,38 @@ def test_merge_ranges(range_strategy):
     range_strategy.merge_ranges((10, 20), (20, 30), "shard_4")
     assert range_strategy.get_shard_for_key(25) == "shard_4"
     assert range_strategy.get_shard_for_key(15) == "shard_4"
+
+def test_get_shards_for_keys(range_strategy):
+    # Test bulk routing groups keys by range owner
+    groups = range_strategy.get_shards_for_keys([5, 15, 1, 19])
+    assert groups == {"shard_1": [0, 2], "shard_2": [1, 3]}
+    with pytest.raises(StrategyError):
+        range_strategy.get_shards_for_keys([5, 25])
+
+def test_get_shards_for_query_uses_interval_index(range_strategy):
+    # Test overlapping-range lookup on the boundary index
+    range_strategy.add_shard("shard_3", 20, 30)
+    assert range_strategy.get_shards_for_query((5, 15)) == ["shard_1", "shard_2"]
+    assert range_strategy.get_shards_for_query((10, 20)) == ["shard_2"]
+    assert range_strategy.get_shards_for_query((25, 100)) == ["shard_3"]
+    assert range_strategy.get_shards_for_query((30, 40)) == []
+
+def test_boundary_index_tracks_changes():
+    # Test the index over many ranges through add, remove and merge
+    strategy = RangeStrategy(Config(), {(i * 10, i * 10 + 10): f"shard_{i}" for i in range(1000)})
+    assert strategy.get_shard_for_key(5555) == "shard_555"
+    strategy.remove_shard("shard_555")
+    with pytest.raises(StrategyError):
+        strategy.get_shard_for_key(5555)
+    strategy.merge_ranges((5560, 5570), (5570, 5580), "merged")
+    assert strategy.get_shard_for_key(5575) == "merged"
+    assert strategy.range_starts == sorted(start for start, _ in strategy.ranges)
+
+def test_state_round_trip(range_strategy):
+    # Test persisted ranges are restored alongside configured ones
+    range_strategy.add_shard("shard_3", 20, 30)
+    restored = RangeStrategy(Config(), {(30, 40): "shard_4"})
+    restored.load_state(range_strategy.get_state())
+    assert restored.get_shard_for_key(25) == "shard_3"
+    assert restored.get_shard_for_key(35) == "shard_4"
+    assert restored.range_starts == [0, 10, 20, 30]
@@ -1,6 +1,7 @@
 import pytest
 from shard_lite.core.shard_manager import ShardManager
-from shard_lite.exceptions.shard_exceptions import ShardingError
+from shard_lite.utils.config import Config
+from shard_lite.exceptions.shard_exceptions import ShardingError, QueryError
 
 @pytest.fixture
 def shard_manager():
@@ -52,3 +53,19 @@ def test_cleanup(shard_manager):
     # Test resource cleanup
     shard_manager.close()
     # Additional assertions could be added here
+
+def test_shared_executor(shard_manager):
+    # Test the router and handlers share one long-lived executor
+    assert shard_manager.query_router.executor is shard_manager.executor
+    assert shard_manager.get_handler('batch').executor is shard_manager.executor
+    assert shard_manager.get_executor_stats()["max_workers"] == shard_manager.connection_pool.pool_size
+    shard_manager.close()
+    with pytest.raises(RuntimeError):
+        shard_manager.executor.submit(lambda: None)
+
+def test_limit_requires_order_by(tmp_path):
+    # Test a limited select without order_by is rejected up front
+    shard_manager = ShardManager(Config(active_shards=["shard_1"], shard_base_path=str(tmp_path)))
+    with pytest.raises(QueryError):
+        shard_manager.select({}, limit=5)
+    shard_manager.close()
@@ -0,0 +1,314 @@
+import json
+import sqlite3
+import threading
+import pytest
+from shard_lite.core.connection_pool import ConnectionPool
+from shard_lite.core.shard_manager import ShardManager
+from shard_lite.core import transaction_manager as transaction_module
+from shard_lite.core.transaction_manager import TransactionManager, CoordinatorLog, MARKER_TABLE
+from shard_lite.utils.config import Config
+from shard_lite.exceptions.shard_exceptions import (
+    ShardingError,
+    TransactionError,
+    TransactionAbortedError,
+    CrossShardTransactionError
+)
+
+INSERT = "INSERT INTO records (id, name) VALUES (?, ?)"
+
+@pytest.fixture
+def manager(tmp_path):
+    pool = ConnectionPool(Config(shard_base_path=str(tmp_path)))
+    for shard_id in ["shard_1", "shard_2"]:
+        with pool.connection(shard_id) as connection:
+            connection.execute("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)")
+    transaction_manager = TransactionManager(pool)
+    yield transaction_manager
+    transaction_manager.close()
+    pool.close_all()
+
+def rows(manager, shard_id):
+    with manager.connection_pool.connection(shard_id) as connection:
+        return connection.execute("SELECT id FROM records ORDER BY id").fetchall()
+
+def log_records(manager):
+    with open(manager.log.path) as file:
+        return [json.loads(line) for line in file]
+
+def test_single_shard_skips_coordinator(manager):
+    # Test a shard-local transaction commits without logging
+    with manager.transaction() as transaction_id:
+        manager.execute(transaction_id, "shard_1", INSERT, [1, "a"])
+        manager.execute(transaction_id, "shard_1", INSERT, [2, "b"])
+    assert rows(manager, "shard_1") == [(1,), (2,)]
+    assert log_records(manager) == []
+    assert manager.transactions == {}
+
+def test_two_phase_commit(manager):
+    # Test a multi-shard transaction logs its decision and writes markers
+    with manager.transaction() as transaction_id:
+        manager.enlist_shards(transaction_id, ["shard_1", "shard_2"])
+        manager.execute(transaction_id, "shard_1", INSERT, [1, "a"])
+        manager.execute(transaction_id, "shard_2", INSERT, [2, "b"])
+    assert rows(manager, "shard_1") == [(1,)] and rows(manager, "shard_2") == [(2,)]
+    assert [record["type"] for record in log_records(manager)] == ["prepare", "commit", "end"]
+    assert log_records(manager)[0]["shards"]["shard_2"] == [[INSERT, [2, "b"]]]
+    with manager.connection_pool.connection("shard_2") as connection:
+        assert connection.execute(f"SELECT txn_id FROM {MARKER_TABLE}").fetchone()[0] == transaction_id
+    assert all(stats["in_use"] == 0 for stats in manager.connection_pool.get_pool_stats().values())
+
+def test_finished_markers_are_pruned(manager):
+    # Test markers of ended transactions are deleted by the next prepare on the shard
+    transaction_ids = []
+    for i in range(3):
+        with manager.transaction() as transaction_id:
+            manager.execute(transaction_id, "shard_1", INSERT, [i, "a"])
+            manager.execute(transaction_id, "shard_2", INSERT, [i, "b"])
+        transaction_ids.append(transaction_id)
+    with manager.connection_pool.connection("shard_1") as connection:
+        assert connection.execute(f"SELECT txn_id FROM {MARKER_TABLE}").fetchall() == [(transaction_ids[-1],)]
+
+def test_rollback_discards_all_shards(manager):
+    # Test a failing statement rolls back every enlisted shard
+    with pytest.raises(TransactionError):
+        with manager.transaction() as transaction_id:
+            manager.execute(transaction_id, "shard_1", INSERT, [1, "a"])
+            manager.execute(transaction_id, "shard_2", INSERT, [2, "b"])
+            manager.execute(transaction_id, "shard_2", INSERT, [2, "duplicate"])
+    assert rows(manager, "shard_1") == [] and rows(manager, "shard_2") == []
+    with pytest.raises(TransactionError):
+        manager.execute(transaction_id, "shard_1", INSERT, [3, "c"])
+
+def fail_after_decision(manager):
+    # Commit a two-shard transaction whose second shard fails after the commit point
+    transaction_id = manager.begin_transaction()
+    manager.execute(transaction_id, "shard_1", INSERT, [1, "a"])
+    manager.execute(transaction_id, "shard_2", INSERT, [2, "b"])
+
+    class FailingCommit:
+        def __init__(self, connection):
+            self.connection = connection
+        def __getattr__(self, name):
+            return getattr(self.connection, name)
+        def commit(self):
+            raise sqlite3.OperationalError("disk I/O error")
+
+    transaction = manager.transactions[transaction_id]
+    real_connection = transaction.connections["shard_2"]
+    transaction.connections["shard_2"] = FailingCommit(real_connection)
+    with pytest.raises(CrossShardTransactionError):
+        manager.commit_transaction(transaction_id)
+    return transaction_id
+
+def test_prepare_failure_is_ended_in_log(manager, monkeypatch):
+    # Test an aborted transaction leaves nothing in the log after a checkpoint
+    def fail_marker(connection):
+        raise sqlite3.OperationalError("disk I/O error")
+    monkeypatch.setattr(manager, "_ensure_marker_table", fail_marker)
+    with pytest.raises(TransactionAbortedError):
+        with manager.transaction() as transaction_id:
+            manager.execute(transaction_id, "shard_1", INSERT, [1, "a"])
+            manager.execute(transaction_id, "shard_2", INSERT, [2, "b"])
+    assert manager.log.unfinished() == {}
+    manager.log.checkpoint()
+    assert log_records(manager) == []
+    assert rows(manager, "shard_1") == [] and rows(manager, "shard_2") == []
+
+def test_commit_failure_after_decision_is_in_doubt(manager):
+    # Test a shard failing after the commit point raises and leaves no end record
+    fail_after_decision(manager)
+    assert [record["type"] for record in log_records(manager)] == ["prepare", "commit"]
+    assert rows(manager, "shard_1") == [(1,)]
+    assert rows(manager, "shard_2") == []
+
+def test_recovery_recommits_in_doubt_transaction(manager):
+    # Test recovery replays the transaction only on the shard missing its marker
+    transaction_id = fail_after_decision(manager)
+    restarted = TransactionManager(manager.connection_pool)
+    assert restarted.recover() == {"recommitted": 1, "aborted": 0, "unresolved": []}
+    assert rows(manager, "shard_1") == [(1,)] and rows(manager, "shard_2") == [(2,)]
+    assert log_records(restarted) == []
+    assert restarted.recover() == {"recommitted": 0, "aborted": 0, "unresolved": []}
+    restarted.log.close()
+
+def test_recovery_aborts_undecided_transaction(manager):
+    # Test a transaction without a commit decision is aborted, not replayed
+    manager.log.append({"type": "prepare", "txn": "txn_lost", "shards": {"shard_1": [[INSERT, [9, "x"]]]}})
+    manager.log.close()
+    restarted = TransactionManager(manager.connection_pool)
+    assert restarted.recover() == {"recommitted": 0, "aborted": 1, "unresolved": []}
+    assert rows(manager, "shard_1") == []
+    restarted.log.close()
+
+def test_recovery_continues_past_failed_redo(manager):
+    # Test one transaction failing to re-commit does not block the others
+    manager.log.append({"type": "prepare", "txn": "txn_bad", "shards": {"shard_1": [["INSERT INTO missing VALUES (1)", []]]}})
+    manager.log.append({"type": "commit", "txn": "txn_bad"})
+    manager.log.append({"type": "prepare", "txn": "txn_good", "shards": {"shard_2": [[INSERT, [5, "e"]]]}})
+    manager.log.append({"type": "commit", "txn": "txn_good"})
+    assert manager.recover() == {"recommitted": 1, "aborted": 0, "unresolved": ["txn_bad"]}
+    assert rows(manager, "shard_2") == [(5,)]
+    assert list(manager.log.unfinished()) == ["txn_bad"]
+
+def test_savepoint_rolls_back_nested_work(manager):
+    # Test a failed savepoint undoes only its own statements and redo records
+    with manager.transaction() as transaction_id:
+        manager.execute(transaction_id, "shard_1", INSERT, [1, "a"])
+        with pytest.raises(TransactionError):
+            with manager.savepoint(transaction_id, ["shard_1", "shard_2"]):
+                manager.execute(transaction_id, "shard_1", INSERT, [2, "b"])
+                manager.execute(transaction_id, "shard_2", INSERT, [3, "c"])
+                manager.execute(transaction_id, "shard_2", INSERT, [3, "duplicate"])
+        with manager.savepoint(transaction_id):
+            manager.execute(transaction_id, "shard_2", INSERT, [4, "d"])
+        statements = manager.transactions[transaction_id].statements
+        assert statements == {"shard_1": [(INSERT, [1, "a"])], "shard_2": [(INSERT, [4, "d"])]}
+    assert rows(manager, "shard_1") == [(1,)] and rows(manager, "shard_2") == [(4,)]
+
+def test_execute_batch_coalesces_statements(manager, monkeypatch):
+    # Test consecutive same-SQL statements on a shard go through one executemany
+    calls = []
+    real_execute_many = manager.execute_many
+    def execute_many(transaction_id, shard_id, query, params_list):
+        calls.append((shard_id, len(params_list)))
+        real_execute_many(transaction_id, shard_id, query, params_list)
+    monkeypatch.setattr(manager, "execute_many", execute_many)
+    with manager.transaction() as transaction_id:
+        manager.execute_batch(transaction_id, [
+            ("shard_1" if i % 2 else "shard_2", INSERT, [i, "x"]) for i in range(10)
+        ] + [("shard_1", "UPDATE records SET name = ? WHERE id = ?", ["y", 1])])
+    assert calls == [("shard_2", 5), ("shard_1", 5)]
+    assert len(rows(manager, "shard_1")) == 5 and len(rows(manager, "shard_2")) == 5
+    assert [record["type"] for record in log_records(manager)] == ["prepare", "commit", "end"]
+
+def test_blob_parameters_across_shards(manager):
+    # Test BLOB parameters are logged losslessly and replayed by recovery
+    blob = bytes(range(256))
+    with manager.connection_pool.connection("shard_1") as connection:
+        connection.execute("ALTER TABLE records ADD COLUMN payload BLOB")
+    with manager.transaction() as transaction_id:
+        manager.execute(transaction_id, "shard_1", "INSERT INTO records (id, payload) VALUES (?, ?)", [1, blob])
+        manager.execute(transaction_id, "shard_2", INSERT, [2, "b"])
+    with manager.connection_pool.connection("shard_1") as connection:
+        assert connection.execute("SELECT payload FROM records").fetchone()[0] == blob
+    for shard_id in ["shard_1", "shard_2"]:
+        with manager.connection_pool.connection(shard_id) as connection:
+            connection.execute("DELETE FROM records")
+            connection.commit()
+    prepare = log_records(manager)[0]
+    manager.log.append({"type": "prepare", "txn": "txn_blob", "shards": prepare["shards"]})
+    manager.log.append({"type": "commit", "txn": "txn_blob"})
+    assert manager.recover()["recommitted"] == 1
+    with manager.connection_pool.connection("shard_1") as connection:
+        assert connection.execute("SELECT payload FROM records").fetchone()[0] == blob
+
+def test_coordinator_log_checkpoints(tmp_path):
+    # Test finished transactions are dropped so the log only holds the tail
+    log = CoordinatorLog(str(tmp_path / "coordinator.log"), checkpoint_interval=10)
+    for i in range(50):
+        log.append({"type": "prepare", "txn": f"t{i}", "shards": {}})
+        log.append({"type": "commit", "txn": f"t{i}"}, sync=True)
+        if i != 7:
+            log.append({"type": "end", "txn": f"t{i}"})
+    with open(log.path) as file:
+        assert len(file.readlines()) < 12
+    log.close()
+    assert list(CoordinatorLog(log.path).unfinished()) == ["t7"]
+
+def test_coordinator_log_torn_and_corrupt_records(tmp_path):
+    # Test only an unterminated final record is dropped; earlier damage raises
+    path = str(tmp_path / "coordinator.log")
+    with open(path, "w") as file:
+        file.write('{"type":"commit","txn":"t1"}\n{"type":"commit","txn":"t2"}')
+    log = CoordinatorLog(path)
+    assert list(log.unfinished()) == ["t1"]
+    log.append({"type": "commit", "txn": "t3"})
+    log.close()
+    assert list(CoordinatorLog(path).unfinished()) == ["t1", "t3"]
+    with open(path, "w") as file:
+        file.write('{"type":"commit","txn":"t1"}\n{"type":"com\n{"type":"commit","txn":"t2"}\n')
+    with pytest.raises(TransactionError):
+        CoordinatorLog(path)
+
+def test_coordinator_log_group_fsync(tmp_path, monkeypatch):
+    # Test concurrent synced appends share fsyncs
+    log = CoordinatorLog(str(tmp_path / "coordinator.log"))
+    fsyncs = []
+    real_fsync = transaction_module.os.fsync
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        threading.Event().wait(0.01)
+        real_fsync(fd)
+    monkeypatch.setattr(transaction_module.os, "fsync", slow_fsync)
+    def worker(n):
+        for i in range(10):
+            log.append({"type": "commit", "txn": f"{n}_{i}"}, sync=True)
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fsyncs) < 80
+    assert len(log.unfinished()) == 80
+    log.close()
+
+def test_coordinator_log_appends_during_fsync(tmp_path, monkeypatch):
+    # Test an fsync in progress does not block other appends
+    log = CoordinatorLog(str(tmp_path / "coordinator.log"))
+    started, release = threading.Event(), threading.Event()
+    real_fsync = transaction_module.os.fsync
+    def blocking_fsync(fd):
+        started.set()
+        release.wait(5)
+        real_fsync(fd)
+    monkeypatch.setattr(transaction_module.os, "fsync", blocking_fsync)
+    syncer = threading.Thread(target=log.append, args=({"type": "commit", "txn": "t1"},), kwargs={"sync": True})
+    syncer.start()
+    assert started.wait(5)
+    appender = threading.Thread(target=log.append, args=({"type": "commit", "txn": "t2"},))
+    appender.start()
+    appender.join(1)
+    finished = not appender.is_alive()
+    release.set()
+    syncer.join()
+    appender.join()
+    assert finished
+    assert list(log.unfinished()) == ["t1", "t2"]
+    log.close()
+
+def test_shard_manager_execute_transaction(tmp_path):
+    # Test execute_transaction is atomic across shards
+    manager = ShardManager(Config(active_shards=["shard_1", "shard_2"], shard_base_path=str(tmp_path)))
+    manager.query_router.execute_query("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)", [])
+    manager.execute_transaction([
+        {"type": "insert", "params": {"data": [{"id": i, "name": "x"} for i in range(1, 11)]}},
+        {"type": "update", "params": {"criteria": {"id": 1}, "data": {"name": "y"}}},
+    ])
+    assert len(manager.select({"name": "x"})) == 9
+    with pytest.raises(ShardingError):
+        manager.execute_transaction([
+            {"type": "insert", "params": {"data": {"id": 20, "name": "z"}}},
+            {"type": "insert", "params": {"data": {"id": 1, "name": "duplicate"}}},
+        ])
+    assert manager.select({"id": 20}) == []
+    manager.close()
+
+def test_shard_manager_savepoint_operations(tmp_path):
+    # Test a failing savepoint group is reported while the rest of the transaction commits
+    manager = ShardManager(Config(active_shards=["shard_1", "shard_2"], shard_base_path=str(tmp_path)))
+    manager.query_router.execute_query("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)", [])
+    failures = manager.execute_transaction([
+        {"type": "insert", "params": {"data": [{"id": i, "name": "x"} for i in range(1, 6)]}},
+        {"type": "savepoint", "operations": [
+            {"type": "insert", "params": {"data": {"id": 10, "name": "y"}}},
+            {"type": "insert", "params": {"data": {"id": 1, "name": "duplicate"}}},
+        ]},
+        {"type": "savepoint", "operations": [
+            {"type": "update", "params": {"criteria": {"id": 2}, "data": {"name": "z"}}},
+        ]},
+    ])
+    assert [failure["operation"] for failure in failures] == [1]
+    assert len(manager.select({"name": "x"})) == 4
+    assert manager.select({"id": 10}) == []
+    assert len(manager.select({"name": "z"})) == 1
+    manager.close()
@@ -0,0 +1,73 @@
+import pytest
+from concurrent.futures import wait
+from shard_lite.core.connection_pool import ConnectionPool
+from shard_lite.core.shard_manager import ShardManager
+from shard_lite.core.write_buffer import WriteBuffer
+from shard_lite.utils.config import Config
+from shard_lite.exceptions.shard_exceptions import ShardingError, QueryExecutionError
+
+INSERT = "INSERT INTO records (id, name) VALUES (?, ?)"
+
+@pytest.fixture
+def connection_pool(tmp_path):
+    pool = ConnectionPool(Config(shard_base_path=str(tmp_path)))
+    for shard_id in ["shard_1", "shard_2"]:
+        with pool.connection(shard_id) as connection:
+            connection.execute("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)")
+    yield pool
+    pool.close_all()
+
+def count_rows(pool, shard_id):
+    with pool.connection(shard_id) as connection:
+        return connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+def test_group_commit_on_size(connection_pool):
+    # Test a full batch is committed in one transaction
+    buffer = WriteBuffer(connection_pool, max_batch=50, max_delay=60)
+    futures = [buffer.submit("shard_1", INSERT, [i, "x"]) for i in range(50)]
+    wait(futures, timeout=5)
+    assert all(future.result() is None for future in futures)
+    assert buffer.get_stats() == {"pending": 0, "batches": 1, "writes": 50}
+    assert count_rows(connection_pool, "shard_1") == 50
+    buffer.close()
+
+def test_flush_on_deadline(connection_pool):
+    # Test a partial batch is flushed once max_delay passes
+    buffer = WriteBuffer(connection_pool, max_batch=1000, max_delay=0.01)
+    futures = [buffer.submit(f"shard_{i % 2 + 1}", INSERT, [i, "x"]) for i in range(10)]
+    wait(futures, timeout=5)
+    assert count_rows(connection_pool, "shard_1") + count_rows(connection_pool, "shard_2") == 10
+    buffer.close()
+
+def test_failed_write_only_fails_its_future(connection_pool):
+    # Test a failing batch is retried write by write
+    buffer = WriteBuffer(connection_pool, max_batch=1000, max_delay=60)
+    futures = [buffer.submit("shard_1", INSERT, [i % 3, "x"]) for i in range(4)]
+    buffer.flush()
+    assert [future.exception() is None for future in futures] == [True, True, True, False]
+    assert isinstance(futures[3].exception(), QueryExecutionError)
+    assert count_rows(connection_pool, "shard_1") == 3
+    buffer.close()
+
+def test_close_flushes_and_rejects(connection_pool):
+    # Test closing commits queued writes and refuses new ones
+    buffer = WriteBuffer(connection_pool, max_batch=1000, max_delay=60)
+    future = buffer.submit("shard_2", INSERT, [1, "x"])
+    cancelled = buffer.submit("shard_2", INSERT, [2, "x"])
+    assert cancelled.cancel()
+    buffer.close()
+    assert future.done() and count_rows(connection_pool, "shard_2") == 1
+    with pytest.raises(ShardingError):
+        buffer.submit("shard_2", INSERT, [3, "x"])
+
+def test_shard_manager_insert_buffered(tmp_path):
+    # Test buffered inserts through the manager are routed and committed
+    manager = ShardManager(Config(active_shards=["shard_1", "shard_2"], shard_base_path=str(tmp_path)))
+    manager.query_router.execute_query("CREATE TABLE records (id INTEGER PRIMARY KEY, name TEXT)", [])
+    futures = manager.insert_buffered([{"id": i, "name": "x"} for i in range(1, 21)])
+    manager.flush_writes()
+    wait(futures, timeout=5)
+    assert len(manager.select({"name": "x"})) == 20
+    with pytest.raises(ShardingError):
+        manager.insert_buffered({"name": "missing id"})
+    manager.close()
@@ -0,0 +1,47 @@
+"""Helpers shared by the handlers and the query router to build SQL from criteria."""
+
+from typing import Any, Dict
+
+
+def criteria_shape(criteria: Dict[str, Any]) -> tuple:
+    """
+    Split criteria into a hashable shape and its parameters.
+
+    Scalar values become equality predicates; list, tuple and set values
+    become IN-list predicates.
+
+    Args:
+        criteria (Dict[str, Any]): Query criteria.
+
+    Returns:
+        tuple: Shape of (column, IN-list length or None) pairs, and parameters.
+    """
+    shape = []
+    params = []
+    for key, value in criteria.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            shape.append((key, len(value)))
+            params.extend(value)
+        else:
+            shape.append((key, None))
+            params.append(value)
+    return tuple(shape), params
+
+
+def where_template(shape: tuple) -> str:
+    """
+    Render a WHERE clause body for a criteria shape.
+
+    Args:
+        shape (tuple): Shape from criteria_shape.
+
+    Returns:
+        str: Clause string (without the WHERE keyword).
+    """
+    conditions = []
+    for key, size in shape:
+        if size is None:
+            conditions.append(f"{key} = ?")
+        else:
+            conditions.append(f"{key} IN ({', '.join(['?'] * size)})")
+    return " AND ".join(conditions)